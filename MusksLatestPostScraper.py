@@ -14,8 +14,11 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
-from bs4 import BeautifulSoup
 import traceback
+from urllib.parse import urlsplit
+
+from post_extract import ScrapedPost, latest_x_post, latest_x_post_details
+from x_session import AUTH_COOKIE, XSessionStore
 
 # Reconfigure standard output to use UTF-8 encoding
 try:
@@ -24,26 +27,40 @@ except AttributeError:
     # For systems that don't support reconfigure
     pass
 
+MUSK_PROFILE_URL = "https://twitter.com/elonmusk"
+
+# Set DEBUG_MUSK=true to run Chrome visibly and save screenshots and page dumps
+DEBUG_MODE = os.environ.get("DEBUG_MUSK", "false").lower() == "true"
+DEBUG_DIR = "debug_screenshots"
+
+def save_debug_html(page_source, path):
+    """Write page HTML to path, in debug mode only."""
+    if not DEBUG_MODE or not path:
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(page_source)
+    print(f"Saved page HTML to {path}")
+
 def load_credentials():
     """Load login credentials from a JSON file."""
     with open("xcreds.json", "r") as file:
         return json.load(file)
 
 def take_screenshot(driver, name):
-    """Take a screenshot for debugging purposes"""
+    """Take a screenshot for debugging purposes (debug mode only)"""
+    if not DEBUG_MODE:
+        return
     try:
         screenshot = driver.get_screenshot_as_base64()
         print(f"\n--- SCREENSHOT: {name} ---")
         print(f"Base64 screenshot saved ({len(screenshot)} bytes)")
         
         # Also save to file if possible
-        debug_dir = "debug_screenshots"
-        if not os.path.exists(debug_dir):
-            os.makedirs(debug_dir)
+        os.makedirs(DEBUG_DIR, exist_ok=True)
         
-        with open(f"{debug_dir}/{name}.png", "wb") as f:
+        with open(f"{DEBUG_DIR}/{name}.png", "wb") as f:
             f.write(base64.b64decode(screenshot))
-        print(f"Screenshot saved to {debug_dir}/{name}.png")
+        print(f"Screenshot saved to {DEBUG_DIR}/{name}.png")
     except Exception as e:
         print(f"Failed to take screenshot: {e}")
 
@@ -80,9 +97,7 @@ def try_standard_login(driver, wait, username, password, x_username):
     print("Checking for login elements...")
     try:
         page_source = driver.page_source
-        with open("debug_login_page.html", "w", encoding="utf-8") as f:
-            f.write(page_source)
-        print("Saved login page HTML to debug_login_page.html")
+        save_debug_html(page_source, "debug_login_page.html")
         
         # Check if login elements exist
         has_username = "username" in page_source.lower() or "email" in page_source.lower()
@@ -258,8 +273,7 @@ def download_x_page(output_file, username, password, x_username):
     chrome_options = Options()
     
     # Check if in debug mode
-    debug_mode = os.environ.get("DEBUG_MUSK", "false").lower() == "true"
-    if not debug_mode:
+    if not DEBUG_MODE:
         chrome_options.add_argument("--headless=new")
     
     chrome_options.add_argument("--disable-gpu")
@@ -286,11 +300,6 @@ def download_x_page(output_file, username, password, x_username):
     
     chrome_options.add_argument(f"--user-agent={user_agent}")
     
-    # Create debug directories
-    debug_dir = "debug_screenshots"
-    if not os.path.exists(debug_dir):
-        os.makedirs(debug_dir)
-    
     # Get ChromeDriver path
     chromedriver_path = None
     if platform.system() == "Windows":
@@ -323,29 +332,16 @@ def download_x_page(output_file, username, password, x_username):
             print(f"Error loading example.com: {e}")
             raise
         
-        print("Attempting login...")
-        if not try_multiple_login_approaches(driver, username, password, x_username):
-            raise Exception("All login approaches failed")
-        
-        print("Navigating to Elon Musk's profile...")
-        driver.get("https://twitter.com/elonmusk")
-        take_screenshot(driver, "musk_profile")
-        time.sleep(5)
-        
-        wait = WebDriverWait(driver, 30)
-        
-        print("Waiting for posts to load...")
+        # Restores the saved session when there is one; logs in only if it has expired
         try:
-            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "article")))
+            open_profile(driver, username, password, x_username)
             print("Articles found!")
             take_screenshot(driver, "found_articles")
         except Exception as e:
             print(f"Error waiting for articles: {e}")
             
             # Save page for debugging
-            with open("debug_no_articles.html", "w", encoding="utf-8") as f:
-                f.write(driver.page_source)
-            print("Saved page HTML to debug_no_articles.html")
+            save_debug_html(driver.page_source, "debug_no_articles.html")
             raise
         
         print("Scrolling to load more content...")
@@ -358,13 +354,11 @@ def download_x_page(output_file, username, password, x_username):
         except Exception as e:
             print(f"Error during scroll: {e}")
         
-        print("Saving page content...")
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write(driver.page_source)
-        print(f"HTML saved to: {output_file}")
+        page_source = driver.page_source
+        save_debug_html(page_source, output_file)
         
         print("Extracting most recent post...")
-        post = extract_posts(driver.page_source)
+        post = extract_posts(page_source)
         
         if post:
             print("\nElon Musk's Most Recent Post:")
@@ -384,36 +378,76 @@ def download_x_page(output_file, username, password, x_username):
         if 'driver' in locals():
             driver.quit()
 
+def load_profile_page(driver, timeout=30):
+    """Open Musk's profile and return the rendered HTML, or None if no posts appear."""
+    print("Navigating to Elon Musk's profile...")
+    driver.get(MUSK_PROFILE_URL)
+    try:
+        WebDriverWait(driver, timeout).until(EC.presence_of_element_located((By.CSS_SELECTOR, "article")))
+    except Exception as e:
+        print(f"No articles within {timeout}s: {e}")
+        return None
+    try:
+        driver.execute_script("window.scrollBy(0, 500);")
+        time.sleep(1)
+    except Exception as e:
+        print(f"Error during scroll: {e}")
+    return driver.page_source
+
+def has_auth_cookie(driver):
+    """True if driver is on X and already holds a login cookie."""
+    host = urlsplit(driver.current_url).netloc
+    if not host.endswith(("x.com", "twitter.com")):
+        return False
+    return driver.get_cookie(AUTH_COOKIE) is not None
+
+def open_profile(driver, username, password, x_username, session_store=None):
+    """
+    Load Musk's profile and return its HTML, logging in only when needed.
+    A browser without a login cookie first gets the saved session restored;
+    the profile load then serves as the check that the session still works.
+    Only if no posts show up does the full login flow run, after which the
+    new session is saved for next time.
+    """
+    session_store = session_store or XSessionStore()
+    restored = not has_auth_cookie(driver) and session_store.restore(driver)
+    page_source = load_profile_page(driver, timeout=10)
+    if page_source is not None:
+        return page_source
+
+    print("Saved X session has expired, logging in..." if restored else "Session not logged in, attempting login...")
+    if not try_multiple_login_approaches(driver, username, password, x_username):
+        raise Exception("All login approaches failed")
+    if has_auth_cookie(driver):
+        session_store.save(driver)
+    page_source = load_profile_page(driver)
+    if page_source is None:
+        raise Exception("No posts found on Elon Musk's profile")
+    return page_source
+
+def scrape_latest_post(driver, credentials):
+    """
+    Latest Musk post as a ScrapedPost (None if none was found), using a running
+    driver and credentials in the xcreds.json format.
+    """
+    page_source = open_profile(
+        driver, credentials["username"], credentials["password"], credentials["x_username"]
+    )
+    post_text, posted_at = latest_x_post_details(page_source)
+    if not post_text:
+        print("No valid posts found in HTML")
+        return None
+    print(f"Found valid post: {post_text[:50]}...")
+    return ScrapedPost('musk', post_text, posted_at, method='browser')
+
 def extract_posts(html_content):
-    """Extract Musk's posts from HTML content"""
-    soup = BeautifulSoup(html_content, 'html.parser')
-    articles = soup.find_all('article')
-    
-    print(f"Found {len(articles)} articles")
-    
-    for article in articles:
-        pinned = article.find('div', {'data-testid': 'socialContext'})
-        if pinned and 'Pinned' in pinned.text:
-            print("Skipping pinned post")
-            continue
-            
-        text_div = article.find('div', {'data-testid': 'tweetText'})
-        if text_div:
-            post_text = ' '.join([span.text for span in text_div.find_all('span')])
-            if post_text.strip():
-                print(f"Found valid post: {post_text[:50]}...")
-                return post_text.strip()
-        else:
-            # Try alternate method
-            text_spans = article.select('span[data-testid="tweetText"] span')
-            if text_spans:
-                post_text = ' '.join([span.text for span in text_spans])
-                if post_text.strip():
-                    print(f"Found valid post (alt method): {post_text[:50]}...")
-                    return post_text.strip()
-    
-    print("No valid posts found in HTML")
-    return None
+    """Extract Musk's most recent non-pinned post from HTML content"""
+    post_text = latest_x_post(html_content)
+    if post_text:
+        print(f"Found valid post: {post_text[:50]}...")
+    else:
+        print("No valid posts found in HTML")
+    return post_text
 
 def main():
     """Main script flow with enhanced error reporting"""
@@ -13,15 +13,32 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.action_chains import ActionChains
 
-from bs4 import BeautifulSoup
+from post_extract import ScrapedPost, latest_truth_post
 
 # Reconfigure standard output to use UTF-8 encoding
-sys.stdout.reconfigure(encoding='utf-8')
-
-def download_truthsocial_page(output_file):
+try:
+    sys.stdout.reconfigure(encoding='utf-8')
+except AttributeError:
+    # Imported by the bot, whose stdout may be redirected to a widget
+    pass
+
+TRUTH_PROFILE_URL = "https://truthsocial.com/@realDonaldTrump"
+
+# Set DEBUG_TRUMP=true to also save the rendered page to disk
+DEBUG_MODE = os.environ.get("DEBUG_TRUMP", "false").lower() == "true"
+
+def save_debug_html(page_source, output_file):
+    """Write the rendered page to output_file, in debug mode only."""
+    if not DEBUG_MODE or not output_file:
+        return
+    with open(output_file, "w", encoding="utf-8") as f:
+        f.write(page_source)
+    print(f"HTML saved to: {output_file}")
+
+def download_truthsocial_page(output_file=None):
     """
     Downloads the fully rendered HTML of Donald Trump's Truth Social page,
-    using Chrome in headless mode on Linux.
+    using Chrome in headless mode on Linux, and returns it.
     """
     chrome_options = Options()
     chrome_options.add_argument("--headless=new")
@@ -37,181 +54,97 @@ def download_truthsocial_page(output_file):
     
     chrome_service = Service('/usr/bin/chromedriver')
     
+    driver = None
     try:
         driver = webdriver.Chrome(service=chrome_service, options=chrome_options)
         driver.set_page_load_timeout(30)  # Set page load timeout
-        
-        print("Navigating to Trump's Truth Social page...")
-        driver.get("https://truthsocial.com/@realDonaldTrump")
-
-        # Wait for any element that indicates the page has loaded
-        wait = WebDriverWait(driver, 30)
-        print("Waiting for page to load...")
-        
-        # Wait explicitly for status posts to appear
-        try:
-            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "[data-testid='status']")))
-            print("Posts found on page!")
-        except Exception as e:
-            print(f"Warning: Timed out waiting for posts: {e}")
-        
-        # Let the page render completely
+
+        page_source = load_profile_page(driver)
+        save_debug_html(page_source, output_file)
+
+        print("Download complete!")
+        return page_source
+
+    except Exception as e:
+        print(f"Error during page download: {e}")
+        raise
+    finally:
+        if driver is not None:
+            driver.quit()
+
+def load_profile_page(driver, warm=False):
+    """
+    Load Trump's profile in driver and return the rendered HTML.
+    A warm (pooled) browser already has the app cached, so it skips the
+    fixed settle delays and scrolls once instead of three times.
+    """
+    print("Navigating to Trump's Truth Social page...")
+    driver.get(TRUTH_PROFILE_URL)
+
+    # Wait for any element that indicates the page has loaded
+    wait = WebDriverWait(driver, 30)
+    print("Waiting for page to load...")
+
+    # Wait explicitly for status posts to appear
+    try:
+        wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "[data-testid='status']")))
+        print("Posts found on page!")
+    except Exception as e:
+        print(f"Warning: Timed out waiting for posts: {e}")
+
+    # Let the page render completely
+    if not warm:
         time.sleep(4)
-        
-        # More aggressive scrolling to ensure more posts are loaded
-        print("Scrolling to load content...")
-        try:
-            # Scroll down multiple times to load more content
-            driver.execute_script("window.scrollBy(0, 500);")
-            time.sleep(1)
-            driver.execute_script("window.scrollBy(0, 500);")
-            time.sleep(1)
+
+    # More aggressive scrolling to ensure more posts are loaded
+    print("Scrolling to load content...")
+    try:
+        # Scroll down multiple times to load more content
+        for _ in range(1 if warm else 3):
             driver.execute_script("window.scrollBy(0, 500);")
             time.sleep(1)
-            # Don't scroll back to top, we want to capture posts that are now loaded
-        except Exception as e:
-            print(f"Scroll error: {e}")
+        # Don't scroll back to top, we want to capture posts that are now loaded
+    except Exception as e:
+        print(f"Scroll error: {e}")
 
-        # Final wait to ensure everything is loaded
+    # Final wait to ensure everything is loaded
+    if not warm:
         time.sleep(3)
 
-        print("Retrieving page source...")
-        page_source = driver.page_source
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write(page_source)
+    print("Retrieving page source...")
+    return driver.page_source
 
-        print(f"Download complete! HTML saved to: {output_file}")
+def fetch_latest_post(driver, output_file=None):
+    """Scrape the latest post with an already running (pooled) driver."""
+    page_source = load_profile_page(driver, warm=True)
+    save_debug_html(page_source, output_file)
+    return parse_latest_post(page_source)
 
-    except Exception as e:
-        print(f"Error during page download: {e}")
-        raise
-    finally:
-        driver.quit()
+def scrape_latest_post(driver):
+    """Latest Trump post as a ScrapedPost (None if no text post was found), using a running driver."""
+    post_content, post_time = fetch_latest_post(driver)
+    if not post_content:
+        return None
+    return ScrapedPost('trump', post_content, post_time, method='browser')
 
 def get_latest_post(html_file):
     """
-    Reads the local HTML file and finds Trump's latest text post.
+    Reads a saved HTML file and finds Trump's latest text post.
     """
     with open(html_file, 'r', encoding='utf-8') as file:
-        content = file.read()
+        return parse_latest_post(file.read())
 
-    soup = BeautifulSoup(content, 'html.parser')
-    
-    print("Looking for Trump's posts...")
-    
-    # First attempt: Use aria-label containing Trump's name
-    print("Method 1: Looking for posts with Trump's name in aria-label...")
-    status_divs = soup.find_all('div', class_='status cursor-pointer focusable')
-    print(f"Found {len(status_divs)} status divs")
-    
-    valid_posts = []
-    
-    for div in status_divs:
-        # Check if it has Trump's name
-        aria_label = div.get('aria-label', '')
-        if 'Donald J. Trump' not in aria_label:
-            continue
-            
-        # Find the content paragraph - might be nested deeply
-        content_p = div.find('p', {'data-markup': 'true'})
-        if not content_p:
-            print(f"No content paragraph found for a Trump post")
-            continue
-            
-        # Get text content
-        post_text = content_p.get_text(strip=True)
-        
-        # Skip empty posts or just URLs
-        if not post_text or (post_text.startswith('http') and ' ' not in post_text):
-            print(f"Skipping post: appears to be just a URL or empty")
-            continue
-            
-        # Find timestamp
-        time_element = div.find('time')
-        if not time_element:
-            print(f"No timestamp found for a Trump post")
-            continue
-            
-        post_time = time_element.get('title')
-        timestamp = time_element.get('datetime')
-        
-        # Check data-index of parent containers
-        parent_with_index = None
-        for parent in div.parents:
-            if parent.has_attr('data-index'):
-                parent_with_index = parent
-                break
-                
-        index = 999
-        if parent_with_index:
-            try:
-                index = int(parent_with_index.get('data-index', '999'))
-                print(f"Found post with data-index={index}")
-            except ValueError:
-                pass
-                
-        print(f"Found valid Trump post: {post_text[:50]}...")
-        valid_posts.append((post_text, post_time, timestamp, index))
-    
-    # If we found valid posts, return the one with lowest index (most recent)
-    if valid_posts:
-        # Sort by index (ascending)
-        sorted_posts = sorted(valid_posts, key=lambda x: x[3])
-        print(f"Found {len(valid_posts)} valid posts, returning most recent (index {sorted_posts[0][3]})")
-        return sorted_posts[0][0], sorted_posts[0][1]
-    
-    # If no posts found, try other methods
-    print("No posts found with primary method, trying alternative approaches...")
-    
-    # Method 2: Find all paragraphs with data-markup and work backward
-    print("Method 2: Looking for post content paragraphs...")
-    content_ps = soup.find_all('p', {'data-markup': 'true'})
-    print(f"Found {len(content_ps)} content paragraphs")
-    
-    valid_posts = []
-    
-    for p in content_ps:
-        post_text = p.get_text(strip=True)
-        
-        # Skip empty posts or just URLs
-        if not post_text or (post_text.startswith('http') and ' ' not in post_text):
-            continue
-            
-        # Find the closest status div upward
-        status_div = None
-        for parent in p.parents:
-            if parent.name == 'div' and 'status' in parent.get('class', []):
-                status_div = parent
-                break
-                
-        if not status_div:
-            continue
-            
-        # Check if it has Trump's name
-        aria_label = status_div.get('aria-label', '')
-        if 'Donald J. Trump' not in aria_label and 'realDonaldTrump' not in aria_label:
-            continue
-            
-        # Find timestamp
-        time_element = status_div.find('time')
-        if not time_element:
-            continue
-            
-        post_time = time_element.get('title')
-        timestamp = time_element.get('datetime')
-        
-        print(f"Found valid Trump post via method 2: {post_text[:50]}...")
-        valid_posts.append((post_text, post_time, timestamp))
-    
-    # Sort by timestamp (most recent first)
-    if valid_posts:
-        # Sort by timestamp (most recent first)
-        sorted_posts = sorted(valid_posts, key=lambda x: x[2] if x[2] else "", reverse=True)
-        print(f"Found {len(valid_posts)} valid posts via alternative method, returning most recent")
-        return sorted_posts[0][0], sorted_posts[0][1]
-    
-    print("No posts found after trying all methods")
-    return None, None
+def parse_latest_post(content):
+    """
+    Finds Trump's latest text post in rendered page HTML.
+    Returns (post_text, post_time), or (None, None) if there is none.
+    """
+    post_text, post_time = latest_truth_post(content)
+    if post_text:
+        print(f"Found latest Trump post: {post_text[:50]}...")
+    else:
+        print("No posts found after trying all methods")
+    return post_text, post_time
 
 if __name__ == "__main__":
     """
@@ -221,10 +154,14 @@ if __name__ == "__main__":
     output_file = os.path.expanduser("~/trumphtml.html")
 
     # Download the page
-    download_truthsocial_page(output_file)
+    try:
+        page_source = download_truthsocial_page(output_file)
+    except Exception as e:
+        print(f"Failed to download the Truth Social page, no post to report: {e}")
+        sys.exit(1)
 
-    # Scrape the downloaded HTML
-    post_content, post_time = get_latest_post(output_file)
+    # Scrape the rendered HTML in memory
+    post_content, post_time = parse_latest_post(page_source)
 
     # Print result
     if post_content and post_time:
@@ -10,6 +10,8 @@ from colorama import init, Fore, Style
 import os
 import json
 import concurrent.futures
+from outbound_queue import LANE_CONTROL, LANE_INTERACTIVE
+from mail_relay import MailRelay
 
 
 # Initialize colorama for Linux
@@ -226,12 +228,21 @@ class BBSBotCLI:
         
         # Initialize state
         self.stop_event = asyncio.Event()
+
+        # Let the bot's own coroutine helpers run on our loop
+        self.bot.loop = self.loop
+
+        # Reading, parsing and sending run as separate tasks joined by these queues
+        self.inbound_queue = asyncio.Queue()  # Raw BBS data waiting to be parsed
+        # A single parser thread keeps line order and the bot's partial-line buffer intact
+        self.parse_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="parser")
         
         # Override the bot's send_full_message method
         self.bot.send_full_message = self.sync_send_full_message
         self.bot.send_private_message = self.sync_send_private_message
         self.bot.send_page_response = self.sync_send_page_response
         self.bot.send_direct_message = self.sync_send_direct_message
+        self.bot.append_terminal_text = self.append_terminal_text
 
         self.reconnect_attempts = 0
         self.max_reconnect_attempts = 999
@@ -253,6 +264,12 @@ class BBSBotCLI:
 
         # Add this flag instead
         self.email_checking_started = False
+        # The CLI's own relay, posting through this client's connection; started at the MajorLink banner
+        self.mail_relay = MailRelay(self.bot.load_email_credentials, self.relay_email)
+
+    def append_terminal_text(self, text, default_tag="normal"):
+        """BBS output is already printed by read_bbs_output, so there is no terminal widget to update."""
+        pass
 
     def setup_logging(self):
         """Configure logging with platform-independent paths"""
@@ -283,6 +300,10 @@ class BBSBotCLI:
             
             if not self.bot.writer.is_closing():
                 self.bot.connected = True
+                # The bot's paced outbound writer owns the connection's writer from here on
+                self.bot.start_outbound()
+                self.bot.scrapers.start_polling(interval=self.bot.post_poll_interval,
+                                                on_new_post=self.bot.announce_new_post)
                 self.logger.info(f"Connected to {self.host}:{self.port}")
                 # Start keep-alive when connection is established
                 self.start_keep_alive()
@@ -301,11 +322,7 @@ class BBSBotCLI:
         """Send an <ENTER> keystroke every 10 seconds to keep the connection alive."""
         while not self.keep_alive_stop_event.is_set():
             if self.bot.connected and self.bot.writer:
-                try:
-                    self.bot.writer.write("\r\n")
-                    await self.bot.writer.drain()
-                except Exception as e:
-                    self.logger.error(f"Error in keep-alive: {e}")
+                self.bot.queue_outbound("\r\n", LANE_CONTROL)
             await asyncio.sleep(10)
 
     def start_keep_alive(self):
@@ -329,18 +346,26 @@ class BBSBotCLI:
         print(f"{Fore.GREEN}Connected to {self.host}:{self.port}{Style.RESET_ALL}")
 
         # Start background tasks and track them
-        self.tasks = [
+        session_tasks = [
             asyncio.create_task(self.handle_user_input()),
             asyncio.create_task(self.read_bbs_output())
         ]
+        # The parser waits on its queue, so it is stopped once the session ends
+        pipeline_tasks = [
+            asyncio.create_task(self.parse_bbs_output())
+        ]
+        self.tasks = session_tasks + pipeline_tasks
         
         try:
-            await asyncio.gather(*self.tasks)
+            await asyncio.gather(*session_tasks)
         except asyncio.CancelledError:
             pass
         except Exception as e:
             print(f"{Fore.RED}Error in main loop: {e}{Style.RESET_ALL}")
             self.logger.exception("Error in main loop")
+        finally:
+            for task in pipeline_tasks:
+                task.cancel()
 
     async def handle_user_input(self):
         """Handle user input from command line"""
@@ -369,9 +394,9 @@ class BBSBotCLI:
                     return
                 
                 # Create a fake message format that the bot's trigger system expects
-                fake_message = f"From CLI: {command}"
-                # Use the bot's process_data_chunk method
-                self.bot.process_data_chunk(fake_message)
+                fake_message = f"From CLI: {command}\n"
+                # Hand it to the parser task like any other BBS line
+                self.inbound_queue.put_nowait(fake_message)
             else:
                 # Direct message sending
                 await self.send_message(command)
@@ -379,8 +404,8 @@ class BBSBotCLI:
             print(f"{Fore.RED}Error processing command: {e}{Style.RESET_ALL}")
             self.logger.exception("Command processing error")
 
-    async def send_message(self, message):
-        """Send a message to the BBS"""
+    async def send_message(self, message, lane=LANE_INTERACTIVE):
+        """Queue a message for the BBS on the bot's paced outbound writer"""
         try:
             if not self.bot.connected:
                 print(f"{Fore.RED}Not connected to BBS{Style.RESET_ALL}")
@@ -388,8 +413,7 @@ class BBSBotCLI:
             
             # Add proper line ending
             full_message = f"{message}\r\n"
-            self.bot.writer.write(full_message)
-            await self.bot.writer.drain()
+            self.bot.queue_outbound(full_message, lane)
         except Exception as e:
             print(f"{Fore.RED}Error sending message: {e}{Style.RESET_ALL}")
 
@@ -420,12 +444,12 @@ class BBSBotCLI:
                 # Check for cleanup message or MAIN channel message
                 if "finish up and log off." in data_str.lower():
                     print(f"{Fore.YELLOW}Cleanup maintenance detected!{Style.RESET_ALL}")
-                    await self.send_message("=x")
+                    await self.send_message("=x", LANE_CONTROL)
                     await self.handle_cleanup_maintenance()
                     continue
                 elif "You are in the MAIN channel." in data_str:
                     print(f"{Fore.YELLOW}MAIN channel detected - rejoining majorlink{Style.RESET_ALL}")
-                    await self.send_message("join majorlink")
+                    await self.send_message("join majorlink", LANE_CONTROL)
                     continue
                 # Modified MajorLink channel detection to avoid repeated messages
                 elif (not majorlink_banner_seen and 
@@ -445,12 +469,8 @@ class BBSBotCLI:
                 print(f"{Fore.CYAN}{data_str}{Style.RESET_ALL}", end='')
                 sys.stdout.flush()
                 
-                try:
-                    # Let the bot process the data - it will use our overridden send methods
-                    self.bot.process_data_chunk(data_str)
-                except Exception as e:
-                    self.logger.error(f"Error processing data: {e}")
-                    self.logger.exception("Full traceback:")
+                # Parsing happens in parse_bbs_output so reads never wait on it
+                self.inbound_queue.put_nowait(data_str)
 
             except Exception as e:
                 print(f"{Fore.RED}Error reading from BBS: {e}{Style.RESET_ALL}")
@@ -459,6 +479,17 @@ class BBSBotCLI:
 
         self.bot.connected = False
 
+    async def parse_bbs_output(self):
+        """Feed received BBS data to the bot's parser without blocking the event loop."""
+        while not self.stop_event.is_set():
+            data = await self.inbound_queue.get()
+            try:
+                # Let the bot process the data - it will use our overridden send methods
+                await self.loop.run_in_executor(self.parse_executor, self.bot.process_data_chunk, data)
+            except Exception as e:
+                self.logger.error(f"Error processing data: {e}")
+                self.logger.exception("Full traceback:")
+
     async def handle_cleanup_maintenance(self):
         """Handle cleanup maintenance by disconnecting, waiting, and reconnecting."""
         print(f"{Fore.YELLOW}Cleanup maintenance detected. Waiting 5 minutes...{Style.RESET_ALL}")
@@ -514,37 +545,37 @@ class BBSBotCLI:
             await asyncio.sleep(5)
             
             # Send initial ENTER
-            await self.send_message("\r\n")
+            await self.send_message("\r\n", LANE_CONTROL)
             await asyncio.sleep(5)
             
             # Load and send username
             username = self.load_username()
-            await self.send_message(username)
+            await self.send_message(username, LANE_CONTROL)
             await asyncio.sleep(5)
             
             # Load and send password
             password = self.load_password()
-            await self.send_message(password)
+            await self.send_message(password, LANE_CONTROL)
             await asyncio.sleep(1)
             
             # Send ENTER after password
-            await self.send_message("q")
+            await self.send_message("q", LANE_CONTROL)
             await asyncio.sleep(1)
 
             # Send ENTER after password command
-            await self.send_message("\r\n")
+            await self.send_message("\r\n", LANE_CONTROL)
             await asyncio.sleep(1)
 
             # Send ENTER after enter command
-            await self.send_message("\r\n")
+            await self.send_message("\r\n", LANE_CONTROL)
             await asyncio.sleep(1)
             
             # Send teleconference command
-            await self.send_message("/go tele")
+            await self.send_message("/go tele", LANE_CONTROL)
             await asyncio.sleep(2)  # Wait 2 seconds
             
             # Send join command
-            await self.send_message("join majorlink")
+            await self.send_message("join majorlink", LANE_CONTROL)
             
             # Start the join timer after 60 seconds
             self.loop.call_later(60, lambda: asyncio.create_task(self.start_join_timer()))
@@ -560,7 +591,7 @@ class BBSBotCLI:
     async def start_join_timer(self):
         """Start timer to send 'join majorlink' every 60 seconds"""
         if self.bot.connected and self.bot.writer:
-            await self.send_message("join majorlink\r\n")
+            await self.send_message("join majorlink\r\n", LANE_CONTROL)
             self.join_timer = self.loop.call_later(60, lambda: asyncio.create_task(self.start_join_timer()))
 
             
@@ -595,192 +626,108 @@ class BBSBotCLI:
             print(f"{Fore.RED}Error loading password: {e}{Style.RESET_ALL}")
         return ""
 
-    async def send_full_message(self, message):
-        """Send a full message to the BBS with improved handling for special characters"""
+    def queue_full_message(self, message):
+        """Queue a full message for the BBS with improved handling for special characters"""
         if not message or not self.bot.connected:
             return
 
-        try:
-            # Clean message of problematic characters that might trigger BBS commands
-            message = message.replace('?', '').replace('=', '')
-            
-            # Better detection for Trump posts
-            is_trump_post = (
-                "DJT Posted on:" in message or 
-                "Donald J. Trump" in message or 
-                "DJT" in message or 
-                message.startswith("Latest Post:") or
-                "Posted on:" in message
-            )
-            
-            # Use smaller chunk size to prevent truncation
-            max_chunk_size = 240  # Further reduced to ensure no truncation
-            
-            # Split the message with overlap to prevent word loss
-            words = message.split()
-            chunks = []
-            current_chunk = []
-            current_length = 0
-            
-            for word in words:
-                # If adding this word would exceed the max length, create a new chunk
-                if current_length + len(word) + 1 > max_chunk_size:
-                    chunks.append(' '.join(current_chunk))
-                    
-                    # Add the last two words to the next chunk to create overlap
-                    if len(current_chunk) >= 2:
-                        current_chunk = current_chunk[-2:]
-                        current_length = sum(len(w) for w in current_chunk) + len(current_chunk) - 1
-                    else:
-                        current_chunk = []
-                        current_length = 0
-                    
-                    # Add the current word
-                    current_chunk.append(word)
-                    current_length += len(word) + 1
-                else:
-                    current_chunk.append(word)
-                    current_length += len(word) + 1
-            
-            # Add the last chunk if it's not empty
-            if current_chunk:
+        # Clean message of problematic characters that might trigger BBS commands
+        message = message.replace('?', '').replace('=', '')
+
+        # Use smaller chunk size to prevent truncation
+        max_chunk_size = 240  # Further reduced to ensure no truncation
+
+        # Split the message with overlap to prevent word loss
+        words = message.split()
+        chunks = []
+        current_chunk = []
+        current_length = 0
+
+        for word in words:
+            # If adding this word would exceed the max length, create a new chunk
+            if current_length + len(word) + 1 > max_chunk_size:
                 chunks.append(' '.join(current_chunk))
-            
-            # Send each chunk with appropriate delay
-            for chunk in chunks:
-                if chunk.strip():  # Only send non-empty chunks
-                    full_message = f"{chunk}\r\n"
-                    self.bot.writer.write(full_message)
-                    await self.bot.writer.drain()
-                    print(f"{Fore.YELLOW}-> {chunk}{Style.RESET_ALL}")
-                    
-                    # Use slightly longer delay between chunks
-                    await asyncio.sleep(1.0)  # Increased to 1.0 second
-        except Exception as e:
-            print(f"{Fore.RED}Error sending message: {e}{Style.RESET_ALL}")
+
+                # Add the last two words to the next chunk to create overlap
+                if len(current_chunk) >= 2:
+                    current_chunk = current_chunk[-2:]
+                    current_length = sum(len(w) for w in current_chunk) + len(current_chunk) - 1
+                else:
+                    current_chunk = []
+                    current_length = 0
+
+                # Add the current word
+                current_chunk.append(word)
+                current_length += len(word) + 1
+            else:
+                current_chunk.append(word)
+                current_length += len(word) + 1
+
+        # Add the last chunk if it's not empty
+        if current_chunk:
+            chunks.append(' '.join(current_chunk))
+
+        # Queue all chunks in one handoff; the outbound writer paces them (long dumps as bulk)
+        chunks = [chunk for chunk in chunks if chunk.strip()]  # Only send non-empty chunks
+        self.bot.queue_outbound_lines([chunk + "\r\n" for chunk in chunks])
+        for chunk in chunks:
+            print(f"{Fore.YELLOW}-> {chunk}{Style.RESET_ALL}")
 
     def sync_send_full_message(self, message):
-        """Synchronous wrapper for send_full_message that the bot can call"""
+        """Queue a public message for the writer task and return immediately"""
         if not message:
             return
-            
-        async def wrapped_send():
+
+        try:
             # Handle both string and list messages
             if isinstance(message, list):
                 # If message is a list, send each item separately
                 for item in message:
-                    await self.send_full_message(item)
+                    self.queue_full_message(item)
             elif hasattr(message, '__await__'):  # If it's already a coroutine
-                await message
+                asyncio.run_coroutine_threadsafe(message, self.loop)
             else:
-                await self.send_full_message(message)
-
-        try:
-            # Check if this is likely a Trump post or other long content
-            is_long_message = (
-                isinstance(message, str) and (
-                    "DJT Posted on:" in message or 
-                    "Donald J. Trump" in message or 
-                    "DJT" in message or 
-                    message.startswith("Latest Post:") or
-                    "Posted on:" in message or
-                    len(message) > 500  # General length check
-                )
-            )
-            
-            # Use a longer timeout for Trump posts
-            timeout = 15 if is_long_message else 5
-            
-            # Start the task without waiting for it to complete
-            future = asyncio.run_coroutine_threadsafe(wrapped_send(), self.loop)
-            
-            try:
-                # Wait with appropriate timeout
-                future.result(timeout=timeout)
-            except concurrent.futures.TimeoutError:
-                # For Trump posts, this is expected and not an error
-                if is_long_message:
-                    self.logger.info("Long message processing continues in background")
-                    print(f"{Fore.YELLOW}Long message continues sending in background{Style.RESET_ALL}")
-                else:
-                    # For other messages, log as an error
-                    self.logger.warning("Message send timed out, but may complete in background")
-                    print(f"{Fore.YELLOW}Message send timeout - continuing in background{Style.RESET_ALL}")
+                self.queue_full_message(message)
         except Exception as e:
             print(f"{Fore.RED}Error in sync_send_full_message: {e}{Style.RESET_ALL}")
             self.logger.exception("Error in sync_send_full_message")
 
     def sync_send_private_message(self, username, message):
-        """Synchronous wrapper for sending private (whispered) messages"""
+        """Queue private (whispered) messages for the writer task"""
         if not message or not username:
             return
 
-        async def wrapped_send():
+        try:
             messages_to_send = message if isinstance(message, list) else [message]
-
             for msg in messages_to_send:
                 chunks = self.bot.chunk_message(str(msg), 250)
-                for chunk in chunks:
-                    try:
-                        full_message = f"Whisper to {username} {chunk}"
-                        await self.send_message(full_message + "\r\n")
-                        await asyncio.sleep(0.1)  # Reduced to 0.1 seconds
-                        self.logger.info(f"Sent chunk to {username}: {chunk}")
-                    except Exception as e:
-                        self.logger.error(f"Error sending chunk to {username}: {e}")
-                        raise
-
-        try:
-            self.logger.info(f"Starting message send to {username}")
-            future = asyncio.run_coroutine_threadsafe(wrapped_send(), self.loop)
-
-            try:
-                future.result(timeout=5.0)  # Reduced timeout to 5 seconds
-                self.logger.info(f"Successfully sent message to {username}")
-            except concurrent.futures.TimeoutError:
-                self.logger.error(f"Timeout sending message to {username}")
-                print(f"{Fore.RED}Message send timeout - check connection{Style.RESET_ALL}")
-            except Exception as e:
-                self.logger.error(f"Error in message send: {e}")
-                print(f"{Fore.RED}Failed to send message: {e}{Style.RESET_ALL}")
+                self.bot.queue_outbound_lines([f"Whisper to {username} {chunk}\r\n" for chunk in chunks],
+                                              recipient=username)
+                self.logger.info(f"Queued {len(chunks)} chunks to {username}")
         except Exception as e:
             self.logger.error(f"Critical error in sync_send_private_message: {e}")
             print(f"{Fore.RED}Critical error sending message: {e}{Style.RESET_ALL}")
 
     def sync_send_page_response(self, username, module_or_channel, message):
-        """Synchronous wrapper for sending page responses"""
+        """Queue page responses for the writer task"""
         if not message:
             return
-            
-        async def wrapped_send():
-            chunks = self.bot.chunk_message(message, 250)
-            for chunk in chunks:
-                full_message = f"/P {username} {chunk}"
-                await self.send_message(full_message + "\r\n")
-                await asyncio.sleep(0.1)
 
         try:
-            future = asyncio.run_coroutine_threadsafe(wrapped_send(), self.loop)
-            future.result(timeout=3)
+            chunks = self.bot.chunk_message(message, 250)
+            self.bot.queue_outbound_lines([f"/P {username} {chunk}\r\n" for chunk in chunks], recipient=username)
         except Exception as e:
             print(f"{Fore.RED}Error in sync_send_page_response: {e}{Style.RESET_ALL}")
             self.logger.exception("Error in sync_send_page_response")
 
     def sync_send_direct_message(self, username, message):
-        """Synchronous wrapper for sending direct messages"""
+        """Queue direct messages for the writer task"""
         if not message:
             return
-            
-        async def wrapped_send():
-            chunks = self.bot.chunk_message(message, 250)
-            for chunk in chunks:
-                full_message = f">{username} {chunk}"
-                await self.send_message(full_message + "\r\n")
-                await asyncio.sleep(0.1)
 
         try:
-            future = asyncio.run_coroutine_threadsafe(wrapped_send(), self.loop)
-            future.result(timeout=3)
+            chunks = self.bot.chunk_message(message, 250)
+            self.bot.queue_outbound_lines([f">{username} {chunk}\r\n" for chunk in chunks], recipient=username)
         except Exception as e:
             print(f"{Fore.RED}Error in sync_send_direct_message: {e}{Style.RESET_ALL}")
             self.logger.exception("Error in sync_send_direct_message")
@@ -792,6 +739,7 @@ class BBSBotCLI:
             self.stop_join_timer()
             # Stop keep-alive before disconnecting
             self.stop_keep_alive()
+            self.bot.scrapers.stop_polling()
 
             # Reset email checking flag on true disconnection
             self.email_checking_started = False
@@ -799,9 +747,11 @@ class BBSBotCLI:
             try:
                 # Send a graceful quit message if needed
                 try:
-                    await self.send_message("quit")
+                    await self.send_message("quit", LANE_CONTROL)
                 except:
                     pass
+                # Let queued lines (including the quit) go out before the writer closes
+                await self.bot.stop_outbound()
 
                 # Close the writer
                 if self.bot.writer:
@@ -883,6 +833,16 @@ class BBSBotCLI:
             import traceback
             traceback.print_exc()
         finally:
+            # Release the worker threads behind the parser and the bot's commands
+            self.parse_executor.shutdown(wait=False, cancel_futures=True)
+            self.bot.dispatcher.shutdown()
+            self.mail_relay.stop()
+            self.bot.close_stores()
+            try:
+                self.loop.run_until_complete(self.bot.http.aclose())
+            except Exception as e:
+                self.logger.error(f"Error closing HTTP client: {e}")
+
             # Rest of the cleanup code remains the same
             # Cancel any pending tasks
             pending = asyncio.all_tasks(self.loop)
@@ -931,148 +891,31 @@ class BBSBotCLI:
 
 
     def initialize_email_checking(self):
-        """Initialize the email checking functionality."""
+        """Start the IMAP IDLE mail relay (does nothing if it is already running)."""
         try:
-            # Check if we already have a scheduled task
-            if hasattr(self, 'email_check_task') and self.email_check_task:
-                print("Email checking already scheduled - not duplicating")
-                return
-                
-            print("Email checking will start in 10 seconds")
-            # Schedule the first check
-            self.email_check_task = self.loop.call_later(10, self.check_emails)
+            self.mail_relay.start()
             self.email_checking_started = True
         except Exception as e:
             print(f"Failed to initialize email checking: {e}")
 
-    def check_emails(self):
-        """Check for incoming emails and schedule next check."""
+    def relay_email(self, sender, body):
+        """
+        MailRelay callback (runs on the relay thread): post an email to the BBS chat.
+        Returns False while disconnected or reconnecting so the message stays unread and is retried.
+        """
+        if not (self.bot.writer and self.bot.connected) or self.reconnect_attempts > 0:
+            return False
+        formatted_message = f"Incoming message via eMail: {body}"
+        print(f"Processing email from {sender}: {formatted_message}")
+        # Always send regardless of no_spam mode
+        future = asyncio.run_coroutine_threadsafe(self.send_message(formatted_message), self.loop)
         try:
-            print("Checking incoming emails...")
-            
-            # Clear existing task reference to prevent duplicates
-            if hasattr(self, 'email_check_task'):
-                self.email_check_task = None
-            
-            # Enhanced connection check - don't check emails during reconnection attempts
-            if not self.bot.connected or hasattr(self, 'reconnect_attempts') and self.reconnect_attempts > 0:
-                print("Not connected to BBS or currently reconnecting, will check mail later")
-                self.email_check_task = self.loop.call_later(30, self.check_emails)
-                return
-                    
-            credentials = self.bot.load_email_credentials()
-            email_address = credentials.get("sender_email")
-            password = credentials.get("sender_password")
-            
-            if not email_address or not password:
-                print("Missing email credentials")
-                self.email_check_task = self.loop.call_later(30, self.check_emails)
-                return
-                    
-            print(f"Connecting to email {email_address}")
-            
-            # Manual IMAP implementation
-            import imaplib
-            import email
-            from email.utils import parseaddr
-            
-            mail = imaplib.IMAP4_SSL('imap.gmail.com')
-            mail.login(email_address, password)
-            print("Email login successful!")
-            
-            mail.select('inbox')
-            print("Selected inbox")
-            
-            # One more connection check before proceeding with potentially resource-intensive operations
-            if not self.bot.connected:
-                print("Connection lost during email check, aborting")
-                mail.logout()
-                self.email_check_task = self.loop.call_later(30, self.check_emails)
-                return
-            
-            # Search for unread emails with subject 'BBS'
-            status, messages = mail.search(None, '(UNSEEN SUBJECT "BBS")')
-            print(f"Email search status: {status}")
-            
-            message_nums = messages[0].split()
-            if message_nums:
-                print(f"Found {len(message_nums)} new BBS emails")
-                
-                # Process each email
-                for num in message_nums:
-                    # Check connection state before processing each email
-                    if not self.bot.connected:
-                        print("Connection lost while processing emails, marking remaining as unread")
-                        mail.logout()
-                        self.email_check_task = self.loop.call_later(30, self.check_emails)
-                        return
-                        
-                    status, data = mail.fetch(num, '(RFC822)')
-                    if status != 'OK':
-                        print(f"Error fetching message {num}: {status}")
-                        continue
-                        
-                    email_msg = email.message_from_bytes(data[0][1])
-                    sender = parseaddr(email_msg['From'])[1]
-                    
-                    # Get body
-                    body = ""
-                    if email_msg.is_multipart():
-                        for part in email_msg.walk():
-                            if part.get_content_type() == "text/plain":
-                                try:
-                                    body = part.get_payload(decode=True).decode('utf-8')
-                                except UnicodeDecodeError:
-                                    body = part.get_payload(decode=True).decode('latin-1')
-                                break
-                    else:
-                        try:
-                            body = email_msg.get_payload(decode=True).decode('utf-8')
-                        except UnicodeDecodeError:
-                            body = email_msg.get_payload(decode=True).decode('latin-1')
-                    
-                    # Truncate to 230 characters if needed
-                    if len(body) > 230:
-                        body = body[:227] + "..."
-                        
-                    # Clean the body text
-                    body = ' '.join(body.split())
-                    
-                    # Format message for display - CORRECT FORMAT HERE
-                    formatted_message = f"Incoming message via eMail: {body}"
-                    print(f"Processing email: {formatted_message}")
-                    
-                    # Check connection again before sending to BBS - ALWAYS send regardless of no_spam mode
-                    if self.bot.writer and self.bot.connected:
-                        # Create task using the correct send_message method
-                        self.loop.create_task(self.send_message(formatted_message))
-                        print("Message sent to BBS chat")
-                        
-                        # Mark as read only if message was sent successfully
-                        mail.store(num, '+FLAGS', '\\Seen')
-                        print(f"Email marked as read")
-                    else:
-                        print("Not sending to BBS due to disconnection - will retry later")
-                        mail.logout()
-                        self.email_check_task = self.loop.call_later(30, self.check_emails)
-                        return
-                
-            else:
-                print("No new BBS emails")
-            
-            mail.logout()
-            print("Email check complete")
-            
+            future.result(timeout=30)
         except Exception as e:
-            print(f"Error checking emails: {str(e)}")
-            
-        finally:
-            # Schedule next check only if not already in reconnection sequence
-            if hasattr(self, 'reconnect_attempts') and self.reconnect_attempts == 0:
-                print("Scheduling next email check in 30 seconds")
-                self.email_check_task = self.loop.call_later(30, self.check_emails)
-            else:
-                print("In reconnection sequence - email checking will resume after reconnection")
+            print(f"Failed to send email to BBS chat: {e}")
+            return False
+        print("Message sent to BBS chat")
+        return True
 
     def process_data_chunk(self, data):
         """Process incoming data chunks."""
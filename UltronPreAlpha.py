@@ -5,8 +5,8 @@ import asyncio
 import telnetlib3
 import time
 import queue
+import concurrent.futures
 import re
-import sys
 import requests
 import openai
 import json
@@ -21,9 +21,22 @@ import smtplib
 from email.mime.text import MIMEText
 import shlex
 from bs4 import BeautifulSoup
-import imaplib
-import email
-from email.utils import parseaddr
+from urllib.parse import quote
+from line_classifier import (
+    ANSI_ESCAPE_RE, BANNER_MEMBERS_RE, CHAT_KINDS, DIRECT, JOIN, PAGE, PUBLIC,
+    THIRD_PARTY, WHISPER, base_username, classify_line, strip_ansi
+)
+from command_dispatcher import CommandDispatcher
+from http_client import AsyncHttpPool, HTTPError
+from presence_store import ChatStore, PresenceStore, normalize_username
+from conversation_cache import ConversationCache
+from response_cache import ResponseCache
+from scraper_service import ScraperService, format_age
+from mail_relay import MailRelay
+from dynamo_writer import BatchWriteQueue
+from chat_members import MEMBERS_TABLE, ChatMembers
+from text_chunker import SentenceBuffer, chunk_text
+from outbound_queue import LANE_CONTROL, LANE_INTERACTIVE, ROOM, OutboundQueue
 
 # Load API keys from api_keys.json
 def load_api_keys():
@@ -56,6 +69,9 @@ table_name = 'ChatBotConversations'
 table = dynamodb.Table(table_name)
 
 class BBSBotApp:
+    # Commands whose handlers are native coroutines; these run directly on the bot's event loop
+    async_commands = {'weather', 'yt', 'search', 'news', 'map', 'pic', 'gif'}
+
     def __init__(self, master):
         self.master = master
         self.master.title("BBS Chatbot Jeremy")
@@ -63,6 +79,9 @@ class BBSBotApp:
         # Load nospam states first
         saved_states = self.load_no_spam_state()
         self.no_spam_mode = tk.BooleanVar(value=saved_states['nospam'])
+        # Handlers run on worker threads and must not touch Tk variables, so they read this mirror
+        self.no_spam = bool(saved_states['nospam'])
+        self.no_spam_mode.trace_add('write', lambda *_: setattr(self, 'no_spam', self.no_spam_mode.get()))
         self.no_spam_perm = saved_states['nospam_perm']  # Initialize from saved state
 
         # ----------------- Configurable variables ------------------
@@ -91,7 +110,6 @@ class BBSBotApp:
         self.giphy_api_key = tk.StringVar(value=DEFAULT_GIPHY_API_KEY)  # Add Giphy API Key
         self.split_view_enabled = False  # Add Split View toggle
         self.split_view_clones = []  # Track split view clones
-        self.public_message_history = {}  # Dictionary to store public messages
         self.multi_line_buffer = {}    # Maps username -> accumulated message string
         self.multiline_timeout = {}    # Maps username -> timeout ID (from after())
 
@@ -110,6 +128,22 @@ class BBSBotApp:
 
         # A queue to pass data from telnet thread => main thread
         self.msg_queue = queue.Queue()
+        # Terminal output produced by command worker threads, drained on the main thread
+        self.terminal_queue = queue.Queue()
+
+        # Trigger handlers run on a bounded worker pool so slow commands never stall ingestion
+        self.command_workers = 4  # Max commands running at once
+        self.command_queue_limit = 32  # Max commands queued before new ones are refused
+        self.dispatcher = CommandDispatcher(max_workers=self.command_workers,
+                                            max_pending=self.command_queue_limit,
+                                            loop_getter=lambda: self.loop)
+        # All writes to the BBS go through one paced queue per connection
+        self.outbound = None
+        self.outbound_task = None
+        self.outbound_rate = 2.0  # Lines per second the board tolerates
+        self.outbound_burst = 4
+        # One pooled keep-alive HTTP client shared by every HTTP-backed command
+        self.http = AsyncHttpPool()
 
         # A buffer to accumulate partial lines
         self.partial_line = ""
@@ -118,9 +152,10 @@ class BBSBotApp:
         self.favorites = self.load_favorites()  # Load favorite BBS addresses
         self.favorites_window = None  # Track the Favorites window instance
 
-        self.chat_members = set()  # Set to keep track of chat members
-        self.last_seen = self.load_last_seen()  # Load last seen timestamps from file
-        self.last_spoke = self.load_last_spoke()  # Load last spoke timestamps from file
+        self.chat_store = ChatStore()  # SQLite presence and public message history
+        self.chat_store.import_json()  # One-time migration of the old JSON files
+        self.last_seen = self.load_last_seen()  # Load last seen timestamps from the store
+        self.last_spoke = self.load_last_spoke()  # Load last spoke timestamps from the store
 
         # Build UI
         self.build_ui()
@@ -136,18 +171,31 @@ class BBSBotApp:
         self.dynamodb_client = boto3.client('dynamodb', region_name='us-east-1')
         self.table_name = table_name
         self.create_dynamodb_table()
+        self.conversation_cache = ConversationCache()  # Recent turns per user, written through on save
+        self.response_cache = ResponseCache()  # Short-lived !weather/!news/!crypto/!search answers
+        self.scrapers = ScraperService(self.http, lambda: self.loop)  # Warm browser sessions for !trump and !musk
+        self.post_poll_interval = 300  # Seconds between background !trump/!musk refreshes
+        self.announce_new_posts = False  # Post newly detected Trump/Musk posts to the room
+        # History writes are batched in the background so replies never wait on them
+        self.dynamo_writer = BatchWriteQueue(dynamodb, key_schema={self.table_name: ('username', 'timestamp'),
+                                                                   MEMBERS_TABLE: ('room',)})
+        # Membership lives in memory; DynamoDB is only mirrored when it changes
+        self.chat_members = ChatMembers(writer=self.dynamo_writer)
         self.previous_line = ""  # Store the previous line to detect multi-line triggers
         self.user_list_buffer = []  # Buffer to accumulate user list lines
         self.timers = {}  # Dictionary to store active timers
+        # Handlers run on worker threads and the event loop, so they read keys from this mirror
+        self.api_keys = self.read_api_keys()
         self.auto_greeting_enabled = self.load_greeting_state()
         self.pending_messages_table_name = 'PendingMessages'
         self.create_pending_messages_table()
         self.openai_client = OpenAI(api_key=self.openai_api_key.get())
+        self.stream_chatgpt = True  # Send ChatGPT replies sentence by sentence as they generate
         self.in_teleconference = False  # Add this flag
         self.join_timer = None  # Add timer reference
         
-        # Start checking for incoming emails
-        self.master.after(10000, self.check_incoming_mail)  # Start checking after 10 seconds
+        # Relay incoming "BBS" emails to the chatroom; started once connected
+        self.mail_relay = MailRelay(self.load_email_credentials, self.relay_email)
 
 
 
@@ -197,44 +245,55 @@ class BBSBotApp:
             self.dynamodb_client.get_waiter('table_exists').wait(TableName=self.pending_messages_table_name)
 
     def save_conversation(self, username, message, response):
-        """Save conversation to DynamoDB."""
+        """Queue the conversation for a batched DynamoDB write and update the history cache."""
         timestamp = int(time.time())
         # Ensure the response is split into chunks of 250 characters
         response_chunks = self.chunk_message(response, 250)
         for chunk in response_chunks:
-            table.put_item(
-                Item={
-                    'username': username,
-                    'timestamp': timestamp,
-                    'message': message,
-                    'response': chunk
-                }
-            )
+            self.dynamo_writer.put(self.table_name, {
+                'username': username,
+                'timestamp': timestamp,
+                'message': message,
+                'response': chunk
+            })
             # Update the timestamp for each chunk to maintain order
             timestamp += 1
-
-    def get_conversation_history(self, username):
-        """Retrieve conversation history from DynamoDB."""
-        response = table.query(
-            KeyConditionExpression=boto3.dynamodb.conditions.Key('username').eq(username)
-        )
-        items = response.get('Items', [])
-        # Combine response chunks into full responses
-        conversation_history = []
-        current_response = ""
-        for item in items:
-            current_response += item['response']
-            if len(current_response) >= 250:
-                conversation_history.append({
-                    'message': item['message'],
-                    'response': current_response
-                })
-                current_response = ""
-        if current_response:
-            conversation_history.append({
-                'message': items[-1]['message'],
-                'response': current_response
-            })
+        self.conversation_cache.append(username, message, response)
+
+    def get_conversation_history(self, username, max_turns=None):
+        """Return the user's most recent turns, from the cache or the tail of their DynamoDB history."""
+        max_turns = max_turns or self.conversation_cache.max_turns
+        cached = self.conversation_cache.get(username)
+        if cached is not None:
+            return cached[-max_turns:]
+
+        # Newest chunks first; stop paging once we hold one more turn than needed,
+        # since the oldest turn we saw may have been cut off mid-response.
+        turns = []  # Newest first, each a list of chunk items newest first
+        query_kwargs = {
+            'KeyConditionExpression': boto3.dynamodb.conditions.Key('username').eq(username),
+            'ScanIndexForward': False,
+            'Limit': max_turns * 4
+        }
+        while True:
+            response = table.query(**query_kwargs)
+            for item in response.get('Items', []):
+                # Chunks of one response share its message and have consecutive timestamps
+                if turns and turns[-1][-1]['message'] == item['message'] and \
+                        turns[-1][-1]['timestamp'] - item['timestamp'] == 1:
+                    turns[-1].append(item)
+                else:
+                    turns.append([item])
+            last_key = response.get('LastEvaluatedKey')
+            if len(turns) > max_turns or not last_key:
+                break
+            query_kwargs['ExclusiveStartKey'] = last_key
+
+        conversation_history = [
+            {'message': chunks[0]['message'], 'response': "".join(item['response'] for item in reversed(chunks))}
+            for chunks in reversed(turns[:max_turns])
+        ]
+        self.conversation_cache.put(username, conversation_history)
         return conversation_history
 
     def save_pending_message(self, recipient, sender, message):
@@ -534,9 +593,9 @@ class BBSBotApp:
         self.save_api_keys()
         window.destroy()
 
-    def save_api_keys(self):
-        """Save API keys to a file."""
-        api_keys = {
+    def read_api_keys(self):
+        """Read API keys from the settings variables (main thread only)."""
+        return {
             "openai_api_key": self.openai_api_key.get(),
             "weather_api_key": self.weather_api_key.get(),
             "youtube_api_key": self.youtube_api_key.get(),
@@ -550,6 +609,11 @@ class BBSBotApp:
             "coinmarketcap_api_key": self.coinmarketcap_api_key.get(),
             "giphy_api_key": self.giphy_api_key.get()  # Save Giphy API Key
         }
+
+    def save_api_keys(self):
+        """Save API keys to a file."""
+        api_keys = self.read_api_keys()
+        self.api_keys = api_keys
         with open("api_keys.json", "w") as file:
             json.dump(api_keys, file)
 
@@ -570,6 +634,7 @@ class BBSBotApp:
                 self.alpha_vantage_api_key.set(api_keys.get("alpha_vantage_api_key", ""))  # Ensure Alpha Vantage API Key is loaded
                 self.coinmarketcap_api_key.set(api_keys.get("coinmarketcap_api_key", ""))  # Ensure CoinMarketCap API Key is loaded
                 self.giphy_api_key.set(api_keys.get("giphy_api_key", ""))  # Ensure Giphy API Key is loaded
+            self.api_keys = self.read_api_keys()
 
     def update_display_font(self):
         """Update the Text widget's font based on self.font_name and self.font_size."""
@@ -649,6 +714,9 @@ class BBSBotApp:
         self.reader = reader
         self.writer = writer
         self.connected = True
+        self.start_outbound()
+        self.mail_relay.start()
+        self.scrapers.start_polling(interval=self.post_poll_interval, on_new_post=self.announce_new_post)
         self.connect_button.config(text="Disconnect")
         self.msg_queue.put_nowait(f"Connected to {host}:{port}\n")
 
@@ -684,8 +752,8 @@ class BBSBotApp:
     def send_teleconference_command(self):
         """Send '/go Wordldlink', wait 0.5 seconds, and then send 'ENTER'."""
         if self.connected and self.writer:
-            asyncio.run_coroutine_threadsafe(self._send_message('/go tele'), self.loop)
-            self.master.after(500, lambda: asyncio.run_coroutine_threadsafe(self._send_message('\r\n'), self.loop))
+            self.queue_outbound('/go tele', LANE_CONTROL)
+            self.master.after(500, lambda: self.queue_outbound('\r\n', LANE_CONTROL))
 
     async def disconnect_from_bbs(self):
         """Stop the background thread and close connections."""
@@ -696,6 +764,8 @@ class BBSBotApp:
         self.in_teleconference = False  # Reset teleconference state
         self.stop_event.set()
         self.stop_keep_alive()  # Stop keep-alive coroutine
+        self.scrapers.stop_polling()  # Only refresh !trump/!musk posts while connected
+        await self.stop_outbound()
         if self.writer:
             try:
                 self.writer.close()
@@ -704,6 +774,7 @@ class BBSBotApp:
                 print(f"Error closing writer: {e}")
         else:
             print("Writer is already None")
+        await self.http.aclose()  # Pooled connections belong to this connection's loop
 
         self.connected = False
         self.reader = None
@@ -736,8 +807,28 @@ class BBSBotApp:
         except queue.Empty:
             pass
         finally:
+            self.flush_terminal_queue()
             self.master.after(100, self.process_incoming_messages)
 
+    def flush_terminal_queue(self):
+        """Insert terminal text queued by command worker threads."""
+        try:
+            while True:
+                text, tag = self.terminal_queue.get_nowait()
+                self.append_terminal_text(text, tag)
+        except queue.Empty:
+            pass
+
+    def dispatch_command(self, username, func, *args):
+        """Run a trigger handler on the worker pool, in order with the user's earlier commands."""
+        if self.dispatcher.submit(base_username(username).lower(), func, *args):
+            return True
+
+        print(f"[DEBUG] Command queue full, dropping command from {username}")
+        if self.connected and self.writer:
+            self.queue_outbound(f"Whisper to {username} I'm busy right now, try again in a moment.\r\n")
+        return False
+
     def process_data_chunk(self, data):
         """Process incoming data and handle triggers."""
         data = data.replace('\r\n', '\n').replace('\r', '\n')
@@ -747,33 +838,26 @@ class BBSBotApp:
 
         for line in lines[:-1]:
             self.append_terminal_text(line + "\n", "normal")
-            
-            # Remove ANSI codes for easier parsing
-            ansi_escape_regex = re.compile(r'\x1b\[(.*?)m')
-            clean_line = ansi_escape_regex.sub('', line)
-
-            # ENHANCED USER JOIN DETECTION - Add more detailed debugging
-            join_patterns = [
-                r'(.+?) just joined this channel!',
-                r'(.+?)@(.+?) just joined this channel!',
-                r'-> (.+?) enters\.',
-                r'-> (.+?)@(.+?) enters\.'
-            ]
-        
-            for pattern in join_patterns:
-                join_match = re.search(pattern, clean_line)
-                if join_match:
-                    username = join_match.group(1)
-                    print(f"[DEBUG] JOIN DETECTED: '{clean_line}' matched pattern '{pattern}'")
-                    print(f"[DEBUG] Extracted username: {username}")
-                    self.handle_user_greeting(username)
-                    break
+
+            # Remove ANSI codes and classify the line in a single pass
+            clean_line = strip_ansi(line)
+            event = classify_line(clean_line)
+            if event is None:
+                continue
+
+            if event.kind == JOIN:
+                print(f"[DEBUG] JOIN DETECTED: '{clean_line}'")
+                print(f"[DEBUG] Extracted username: {event.username}")
+                self.dispatch_command(event.username, self.handle_user_greeting, event.username)
+                continue
+            if event.kind not in CHAT_KINDS:
+                continue
+
+            username = event.username
+            content = event.content
 
             # Explicitly check for nospamperm command via whisper
-            whisper_nospamperm_match = re.match(r'From (.+?) \(whispered\): !nospamperm', clean_line) or \
-                                       re.match(r':\[(.+?)\] \(whispered\): !nospamperm', clean_line)
-            if whisper_nospamperm_match:
-                username = whisper_nospamperm_match.group(1)
+            if event.kind == WHISPER and content.startswith('!nospamperm'):
                 print(f"Detected !nospamperm command from {username}")
                 self.no_spam_perm = not self.no_spam_perm
                 state = "permanently enabled" if self.no_spam_perm else "disabled"
@@ -782,106 +866,92 @@ class BBSBotApp:
                 continue
 
             # Update last seen and last spoke timestamps for any user activity
-            public_message_match = re.match(r'From (.+?): (.+)', clean_line)
-            whisper_match = re.match(r'From (.+?) \(whispered\): (.+)', clean_line)
-            direct_match = re.match(r'From (.+?) \(to you\): (.+)', clean_line)
-            page_match = re.match(r'(.+?) is paging you from (.+?): (.+)', clean_line)
-
             current_time = int(time.time())
-            
-            # Update timestamps for any type of message
-            if public_message_match:
-                username = public_message_match.group(1)
-                base_username = username.split('@')[0]
-                self.last_seen[base_username.lower()] = current_time
-                self.last_spoke[base_username.lower()] = current_time
-            elif whisper_match:
-                username = whisper_match.group(1)
-                base_username = username.split('@')[0]
-                self.last_seen[base_username.lower()] = current_time
-                self.last_spoke[base_username.lower()] = current_time
-            elif direct_match:
-                username = direct_match.group(1)
-                base_username = username.split('@')[0]
-                self.last_seen[base_username.lower()] = current_time
-                self.last_spoke[base_username.lower()] = current_time
-            elif page_match:
-                username = page_match.group(1)
-                base_username = username.split('@')[0]
-                self.last_seen[base_username.lower()] = current_time
-                self.last_spoke[base_username.lower()] = current_time
-
-            # Save timestamps after any updates
-            if any([public_message_match, whisper_match, direct_match, page_match]):
-                self.save_last_seen()
-                self.save_last_spoke()
-
-            # Check for private commands first 
-            private_message_match = re.match(r'From (.+?) \(whispered\): (.+)', clean_line)
-            if private_message_match:
-                username = private_message_match.group(1)
-                message = private_message_match.group(2)
-
-                # Handle !nospamperm and !nospam via whisper only
-                if message.strip() in ["!nospamperm", "!nospam"]:
-                    self.handle_private_trigger(username, message)
-                    continue
+            self.last_seen[username] = current_time  # Keys are normalized by the store
+            self.last_spoke[username] = current_time
+            if event.kind == PUBLIC:
+                self.store_public_message(username, content)
+
+            # Handle !nospam via whisper only
+            if event.kind == WHISPER and content == "!nospam":
+                self.handle_private_trigger(username, content)
+                continue
 
-            # Parse message for normal processing
-            msg_type, username, content = self.parse_message(clean_line)
-            if msg_type and username and content:
-                # Ignore messages from Ultron itself
-                if username.lower() == 'ultron':
-                    continue
-                    
-                # Handle !nospam command when sent publicly by responding via whisper
-                if content.strip() == "!nospam":
-                    self.handle_private_trigger(username, content)
-                    continue
-                    
-                # Regular message handling
-                if msg_type == 'page':
-                    if content.startswith('!'):
-                        response = self.get_command_response(content, username)
-                    else:
-                        response = self.get_chatgpt_response(content, username=username)
-                    if response:
-                        self.send_page_response(username, 'teleconference', response)
-                    
-                elif msg_type == 'whisper':
-                    if content.startswith('!'):
-                        response = self.get_command_response(content, username)
-                    else:
-                        response = self.get_chatgpt_response(content, username=username)
-                    if response:
-                        self.send_private_message(username, response)
-                    
-                elif msg_type == 'direct':
-                    if content.startswith('!'):
-                        response = self.get_command_response(content, username)
-                    else:
-                        response = self.get_chatgpt_response(content, username=username)
-                    if response:
-                        if self.no_spam_mode.get() or self.no_spam_perm:
-                            self.send_private_message(username, response)
-                        else:
-                            self.send_direct_message(username, response)
-                        
-                elif msg_type == 'public' and content.startswith('!'):
-                    response = self.get_command_response(content, username)
-                    if response:
-                        if self.no_spam_mode.get() or self.no_spam_perm:
-                            self.send_private_message(username, response)
-                        else:
-                            self.send_full_message(response)
+            # Ignore messages from Ultron itself
+            if username.lower() == 'ultron':
+                continue
+
+            # Ignore public messages mentioning ultron from someone else
+            if event.kind == PUBLIC and 'ultron' in content.lower() and not username.lower().startswith('ultron'):
+                continue
+
+            # Handle !nospam command when sent publicly by responding via whisper
+            if content == "!nospam":
+                self.handle_private_trigger(username, content)
+                continue
 
-            # Update last spoke timestamp for public messages
-            public_trigger_match = re.match(r'From (.+?): (.+)', clean_line)
-            if public_trigger_match:
-                username = public_trigger_match.group(1)
-                base_username = username.split('@')[0]  # Strip domain part
-                self.last_spoke[base_username.lower()] = int(time.time())
-                self.save_last_spoke()
+            # Regular message handling runs on the worker pool (or the event loop for async commands)
+            if self.command_name(content) in self.async_commands:
+                self.dispatch_command(username, self.handle_chat_event_async, event.kind, username, content)
+            else:
+                self.dispatch_command(username, self.handle_chat_event, event.kind, username, content)
+
+    def handle_chat_event(self, kind, username, content):
+        """Build the response to a chat line and send it back on the matching channel."""
+        if kind == PUBLIC and not content.startswith('!'):
+            return
+        if self.stream_chatgpt and not content.startswith('!'):
+            # Plain chat: send each sentence as soon as ChatGPT produces it
+            self.stream_chatgpt_response(content, lambda piece: self.send_chat_response(kind, username, piece),
+                                         username=username)
+            return
+        if self.stream_chatgpt and self.command_name(content) == 'chat':
+            self.stream_chatgpt_response(content[len('!chat'):].strip(),
+                                         lambda piece: self.send_chat_response(kind, username, piece),
+                                         username=username)
+            return
+        if content.startswith('!'):
+            # A duplicate of a request already running is answered when that one finishes,
+            # without holding this worker
+            response = self.get_command_response(
+                content, username, deliver=lambda shared: shared and self.send_chat_response(kind, username, shared)
+            )
+        else:
+            response = self.get_chatgpt_response(content, username=username)
+        if response:
+            self.send_chat_response(kind, username, response)
+
+    async def handle_chat_event_async(self, kind, username, content):
+        """Event-loop counterpart of handle_chat_event for commands with native async handlers."""
+        response = await self.get_command_response_async(content, username)
+        if response:
+            # The send helpers only chunk the reply and hand it to the OutboundQueue, so they are safe on the loop
+            self.send_chat_response(kind, username, response)
+
+    def send_chat_response(self, kind, username, response):
+        """Send a response back on the channel matching the incoming message type."""
+        if kind == PAGE:
+            self.send_page_response(username, 'teleconference', response)
+        elif kind == WHISPER:
+            self.send_private_message(username, response)
+        elif self.no_spam or self.no_spam_perm:
+            self.send_private_message(username, response)
+        elif kind == DIRECT:
+            self.send_direct_message(username, response)
+        elif kind == PUBLIC:
+            self.send_full_message(response)
+
+    def run_async(self, coro, timeout=60):
+        """Run a coroutine on the bot's event loop from a worker thread and return its result."""
+        if self.loop.is_running():
+            future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+            try:
+                return future.result(timeout=timeout)
+            except concurrent.futures.TimeoutError:
+                future.cancel()
+                return "Sorry, that request timed out."
+        # No connection loop is running (e.g. just disconnected), so run it right here
+        return asyncio.run(coro)
 
     def update_chat_members(self, lines_with_users):
         """
@@ -893,12 +963,11 @@ class BBSBotApp:
         print(f"[DEBUG] Combined user lines: {combined}")
 
         # Remove ANSI codes
-        ansi_escape_regex = re.compile(r'\x1b\[(.*?)m')
-        combined_clean = ansi_escape_regex.sub('', combined)
+        combined_clean = strip_ansi(combined)
         print(f"[DEBUG] Cleaned combined user lines: {combined_clean}")
 
         # Extract user section between Topic and "are here with you"
-        user_list_match = re.search(r'Topic:.*?\)\.\s*(.*?)\s*(?:are|is)\s+here with you', combined_clean, re.DOTALL)
+        user_list_match = BANNER_MEMBERS_RE.search(combined_clean)
         if not user_list_match:
             print("[DEBUG] Could not find user list section")
             return
@@ -924,35 +993,17 @@ class BBSBotApp:
                     self.last_seen[username.lower()] = int(time.time())
 
         print(f"[DEBUG] Extracted usernames with timestamps: {usernames}")
+        print(f"[DEBUG] Updated last seen timestamps for {len(usernames)} users")
 
-        # Update chat members set
-        self.chat_members = set(usernames)
-        self.save_chat_members()
+        # The banner repeats on every ENTER; ChatMembers only mirrors to DynamoDB when the room changed
+        self.chat_members.replace(usernames)
 
-        # Save updated last seen timestamps
-        self.save_last_seen()
-        print(f"[DEBUG] Updated last seen timestamps: {self.last_seen}")
-
-        # Check for pending messages
+        # Check for pending messages for everyone listed; a !msg can be left for someone already in the room
         for username in usernames:
-            self.check_and_send_pending_messages(username)
-
-    def save_chat_members(self):
-        """Save chat members to DynamoDB."""
-        chat_members_table = dynamodb.Table('ChatRoomMembers')
-        try:
-            chat_members_table.put_item(
-                Item={
-                    'room': 'default',
-                    'members': list(self.chat_members)
-                }
-            )
-            print(f"[DEBUG] Saved chat members to DynamoDB: {self.chat_members}")
-        except Exception as e:
-            print(f"Error saving chat members to DynamoDB: {e}")
+            self.dispatch_command(username, self.check_and_send_pending_messages, username)
 
     def get_chat_members(self):
-        """Retrieve chat members from DynamoDB."""
+        """Retrieve the mirrored chat members from DynamoDB (the live list is self.chat_members)."""
         chat_members_table = dynamodb.Table('ChatRoomMembers')
         try:
             response = chat_members_table.get_item(Key={'room': 'default'})
@@ -969,13 +1020,12 @@ class BBSBotApp:
         And now also capture public messages for conversation history.
         """
         # Remove ANSI codes for easier parsing
-        ansi_escape_regex = re.compile(r'\x1b\[(.*?)m')
-        clean_line = ansi_escape_regex.sub('', line)
+        clean_line = strip_ansi(line)
 
         # Handle !nospam toggle first, so you can always toggle it
         if "!nospam" in clean_line:
-            self.no_spam_mode.set(not self.no_spam_mode.get())
-            state = "enabled" if self.no_spam_mode.get() else "disabled"
+            self.set_no_spam_mode(not self.no_spam)
+            state = "enabled" if self.no_spam else "disabled"
             self.send_full_message(f"No Spam Mode has been {state}.")
             return
 
@@ -985,7 +1035,7 @@ class BBSBotApp:
         direct_message_match = re.match(r'From (.+?) \(to you\): (.+)', clean_line)
 
         # Ignore other public messages if no_spam_mode is enabled
-        if self.no_spam_mode.get() and not private_message_match and not page_message_match and not direct_message_match:
+        if self.no_spam and not private_message_match and not page_message_match and not direct_message_match:
             return
 
         # Check for private messages
@@ -1021,7 +1071,7 @@ class BBSBotApp:
         if public_trigger_match:
             username = public_trigger_match.group(1)
             message = public_trigger_match.group(2)
-            if self.no_spam_mode.get():
+            if self.no_spam:
                 self.append_terminal_text(f"Ignored public trigger due to No Spam Mode: {message}\n", "normal")
                 return
             if message.startswith("!"):
@@ -1074,7 +1124,7 @@ class BBSBotApp:
     def send_enter_keystroke(self):
         """Send an <ENTER> keystroke to get the list of current chat members."""
         if self.connected and self.writer:
-            asyncio.run_coroutine_threadsafe(self._send_message("\r\n"), self.loop)
+            self.queue_outbound("\r\n", LANE_CONTROL)
 
     def handle_private_trigger(self, username, message):
         """Handle private message triggers and respond privately."""
@@ -1096,8 +1146,8 @@ class BBSBotApp:
             if self.no_spam_perm:
                 self.send_private_message(username, "Not possible - No Spam Mode is permanently locked.")
             else:
-                self.no_spam_mode.set(not self.no_spam_mode.get())
-                state = "enabled" if self.no_spam_mode.get() else "disabled"
+                self.set_no_spam_mode(not self.no_spam)
+                state = "enabled" if self.no_spam else "disabled"
                 self.send_private_message(username, f"No Spam Mode has been {state}.")
                 self.save_no_spam_state()
             return
@@ -1380,12 +1430,8 @@ class BBSBotApp:
         Handle direct messages and interpret them as !chat queries.
         """
         self.refresh_membership()  # Refresh membership before generating response
-        time.sleep(1)  # Allow time for membership list to be updated
-        self.master.update()  # Process any pending updates
 
-        # Fetch the latest chat members from DynamoDB
-        self.chat_members = set(self.get_chat_members())
-        print(f"[DEBUG] Updated chat members list before generating response: {self.chat_members}")
+        print(f"[DEBUG] Chat members before generating response: {self.chat_members.prompt_names()}")
 
         if "who's here" in message.lower() or "who is here" in message.lower():
             query = "who else is in the chat room?"
@@ -1436,8 +1482,12 @@ class BBSBotApp:
                 time.sleep(0.5)  # Add 0.5 second delay between chunks
 
     def get_weather_response(self, args):
+        """Synchronous wrapper around get_weather_response_async for worker-thread callers."""
+        return self.run_async(self.get_weather_response_async(args))
+
+    async def get_weather_response_async(self, args):
         """Fetch weather info and return a ChatGPT-generated response as a string."""
-        key = self.weather_api_key.get()
+        key = self.api_keys["weather_api_key"]
         if not key:
             return "Weather API key is missing."
 
@@ -1463,7 +1513,7 @@ class BBSBotApp:
                     "appid": key,
                     "units": "imperial"
                 }
-                r = requests.get(url, params=params, timeout=10)
+                r = await self.http.get(url, params=params)
                 r.raise_for_status()
                 data = r.json()
                 
@@ -1495,7 +1545,7 @@ class BBSBotApp:
                     "appid": key,
                     "units": "imperial"
                 }
-                r = requests.get(url, params=params, timeout=10)
+                r = await self.http.get(url, params=params)
                 r.raise_for_status()
                 data = r.json()
                 
@@ -1520,12 +1570,16 @@ class BBSBotApp:
 
             return response
 
-        except requests.exceptions.RequestException as e:
+        except HTTPError as e:
             return f"Error fetching weather: {str(e)}"
 
     def get_youtube_response(self, query):
+        """Synchronous wrapper around get_youtube_response_async for worker-thread callers."""
+        return self.run_async(self.get_youtube_response_async(query))
+
+    async def get_youtube_response_async(self, query):
         """Perform a YouTube search and return the response as a string."""
-        key = self.youtube_api_key.get()
+        key = self.api_keys["youtube_api_key"]
         if not key:
             return "YouTube API key is missing."
         else:
@@ -1537,7 +1591,7 @@ class BBSBotApp:
                 "maxResults": 1
             }
             try:
-                r = requests.get(url, params=params)
+                r = await self.http.get(url, params=params)
                 data = r.json()
                 items = data.get("items", [])
                 if not items:
@@ -1551,9 +1605,13 @@ class BBSBotApp:
                 return f"Error fetching YouTube results: {str(e)}"
 
     def get_web_search_response(self, query):
+        """Synchronous wrapper around get_web_search_response_async for worker-thread callers."""
+        return self.run_async(self.get_web_search_response_async(query))
+
+    async def get_web_search_response_async(self, query):
         """Perform a Google Custom Search and return the response as a string."""
-        cse_key = self.google_cse_api_key.get()
-        cse_id = self.google_cse_cx.get()
+        cse_key = self.api_keys["google_cse_api_key"]
+        cse_id = self.api_keys["google_cse_cx"]
         if not cse_key or not cse_id:
             return "Google CSE API key or engine ID is missing."
         else:
@@ -1565,7 +1623,7 @@ class BBSBotApp:
                 "num": 1  # just one top result
             }
             try:
-                r = requests.get(url, params=params)
+                r = await self.http.get(url, params=params)
                 data = r.json()
                 items = data.get("items", [])
                 if not items:
@@ -1585,24 +1643,10 @@ class BBSBotApp:
             except Exception as e:
                 return f"Error with Google search: {str(e)}"
 
-    def get_chatgpt_response(self, user_text, direct=False, username=None):
-        """Send user_text to ChatGPT and return the response as a string."""
-        if not self.openai_client:
-            return "OpenAI client is not initialized."
-
-        # Fetch the latest chat members from DynamoDB
-        self.chat_members = set(self.get_chat_members())
-        members = list(self.chat_members)
-        print(f"[DEBUG] Members list used for ChatGPT response: {members}")
-
-        # Turn user@domain into just the username portion if you want:
-        chatroom_usernames = []
-        for member in members:
-            name_part = member.split('@')[0]
-            chatroom_usernames.append(name_part)
-
-        # Create a simple comma-separated string for the system prompt
-        chatroom_members_str = ", ".join(chatroom_usernames)
+    def build_chatgpt_messages(self, user_text, direct=False, username=None):
+        """Build the ChatGPT message list: system prompt, recent history, then user_text."""
+        # Membership is kept current in memory; the prompt string is rebuilt only when it changes
+        chatroom_members_str = self.chat_members.prompt_names()
         print(f"[DEBUG] Chatroom members string for ChatGPT: {chatroom_members_str}")
 
         system_message = (
@@ -1630,7 +1674,7 @@ class BBSBotApp:
         else:
             conversation_history = self.get_conversation_history("public_chat")
 
-        # Truncate conversation history to the last 5 messages
+        # History is already limited to the last 5 turns
         truncated_history = conversation_history[-5:]
 
         messages = [
@@ -1649,6 +1693,14 @@ class BBSBotApp:
         messages.append({"role": "user", "content": user_text})
 
         print(f"[DEBUG] Chunks sent to ChatGPT: {messages}")  # Log chunks sent to ChatGPT
+        return messages
+
+    def get_chatgpt_response(self, user_text, direct=False, username=None):
+        """Send user_text to ChatGPT and return the response as a string."""
+        if not self.openai_client:
+            return "OpenAI client is not initialized."
+
+        messages = self.build_chatgpt_messages(user_text, direct=direct, username=username)
 
         try:
             completion = self.openai_client.chat.completions.create(
@@ -1671,9 +1723,64 @@ class BBSBotApp:
         print(f"[DEBUG] ChatGPT response: {gpt_response}")  # Log ChatGPT response
         return gpt_response
 
+    def stream_chatgpt_response(self, user_text, emit, direct=False, username=None):
+        """
+        Stream a ChatGPT reply, calling emit(piece) as soon as each sentence
+        (or 200-character run) is complete, then persist the assembled text.
+        Returns the full response.
+        """
+        if not self.openai_client:
+            gpt_response = "OpenAI client is not initialized."
+            emit(gpt_response)
+            return gpt_response
+
+        messages = self.build_chatgpt_messages(user_text, direct=direct, username=username)
+        sentences = SentenceBuffer(max_chars=200)
+        parts = []
+
+        try:
+            stream = self.openai_client.chat.completions.create(
+                model="gpt-4o-mini",
+                n=1,
+                max_tokens=500,  # Allow for longer responses
+                temperature=0.2,  # Set temperature to 0.2
+                messages=messages,
+                stream=True
+            )
+            for event in stream:
+                if not event.choices:
+                    continue
+                delta = event.choices[0].delta.content
+                if delta:
+                    parts.append(delta)
+                    for piece in sentences.feed(delta):
+                        emit(piece)
+            tail = sentences.flush()
+            if tail:
+                emit(tail)
+            gpt_response = "".join(parts)
+
+            # Persist only the final assembled text
+            self.save_conversation(username or "public_chat", user_text, gpt_response)
+
+        except Exception as e:
+            # Send whatever had already arrived before reporting the error
+            tail = sentences.flush()
+            if tail:
+                emit(tail)
+            gpt_response = f"Error with ChatGPT API: {str(e)}"
+            emit(gpt_response)
+
+        print(f"[DEBUG] ChatGPT response (streamed): {gpt_response}")  # Log ChatGPT response
+        return gpt_response
+
     def get_map_response(self, place):
+        """Synchronous wrapper around get_map_response_async for worker-thread callers."""
+        return self.run_async(self.get_map_response_async(place))
+
+    async def get_map_response_async(self, place):
         """Fetch place info from Google Places API and return the response as a string."""
-        key = self.google_places_api_key.get()
+        key = self.api_keys["google_places_api_key"]
         if not key:
             return "Google Places API key is missing."
         elif not place:
@@ -1689,7 +1796,7 @@ class BBSBotApp:
                 "textQuery": place
             }
             try:
-                r = requests.post(url, json=data, headers=headers, timeout=10)
+                r = await self.http.post(url, json=data, headers=headers)
                 r.raise_for_status()  # Raise an HTTPError for bad responses
                 data = r.json()
                 places = data.get("places", [])
@@ -1707,7 +1814,7 @@ class BBSBotApp:
                         f"Types: {types}\n"
                         f"Website: {website}"
                     )
-            except requests.exceptions.RequestException as e:
+            except HTTPError as e:
                 return f"Error fetching place info: {str(e)}"
 
     def get_help_response(self):
@@ -1755,6 +1862,10 @@ class BBSBotApp:
 
     def append_terminal_text(self, text, default_tag="normal"):
         """Append text to the terminal display with ANSI parsing."""
+        if threading.current_thread() is not threading.main_thread():
+            # Tk widgets may only be touched from the main thread
+            self.terminal_queue.put_nowait((text, default_tag))
+            return
         self.terminal_display.configure(state=tk.NORMAL)
         self.parse_ansi_and_insert(text)
         self.terminal_display.see(tk.END)
@@ -1762,12 +1873,10 @@ class BBSBotApp:
 
     def parse_ansi_and_insert(self, text_data):
         """Minimal parser for ANSI color codes (foreground only)."""
-        ansi_escape_regex = re.compile(r'\x1b\[(.*?)m')
-
         last_end = 0
         current_tag = "normal"
 
-        for match in ansi_escape_regex.finditer(text_data):
+        for match in ANSI_ESCAPE_RE.finditer(text_data):
             start, end = match.span()
             # Insert text before this ANSI code with current tag
             if start > last_end:
@@ -1829,21 +1938,51 @@ class BBSBotApp:
         if processed_input.strip():
             prefix = "Gos " if self.mud_mode.get() else ""
             message = prefix + processed_input
-            asyncio.run_coroutine_threadsafe(self._send_message(message + "\r\n"), self.loop)
+            self.queue_outbound(message + "\r\n")
             self.append_terminal_text(message + "\n", "normal")
             print(f"Sent to BBS: {message}")
 
     async def _send_message(self, message):
-        """Coroutine to send a message with error handling."""
-        try:
-            if self.writer:
-                self.writer.write(message)
-                await asyncio.wait_for(self.writer.drain(), timeout=3.0)
-        except asyncio.TimeoutError:
-            print(f"Timeout sending message: {message}")
-            # Optionally retry or handle the timeout
-        except Exception as e:
-            print(f"Error sending message: {str(e)}")
+        """Coroutine kept for older callers; queues the message on the outbound writer."""
+        self.queue_outbound(message)
+
+    def queue_outbound(self, text, lane=LANE_INTERACTIVE):
+        """Queue text (with its line ending) on an outbound lane. Returns immediately."""
+        if self.outbound is None:
+            print(f"Not connected, dropping: {text.strip()}")
+            return False
+        self.outbound.put(text, lane)
+        return True
+
+    def queue_outbound_lines(self, lines, lane=None, recipient=ROOM):
+        """
+        Queue a message's lines together. Without a lane it is picked by length
+        (see lane_for), keeping replies to the same recipient in order.
+        """
+        if self.outbound is None:
+            print(f"Not connected, dropping {len(lines)} lines")
+            return False
+        key = recipient.lower() if recipient else ROOM
+        self.outbound.put_many(lines, lane, key)
+        return True
+
+    def start_outbound(self):
+        """Create this connection's outbound queue and writer task. Call on the event loop."""
+        if self.outbound_task:
+            self.outbound_task.cancel()  # Left over from a connection that dropped
+        self.outbound = OutboundQueue(self.loop, lambda: self.writer,
+                                      rate=self.outbound_rate, burst=self.outbound_burst)
+        self.outbound_task = self.loop.create_task(self.outbound.run())
+
+    async def stop_outbound(self, timeout=2.0):
+        """Give queued lines a moment to go out, then stop the writer task."""
+        if self.outbound is None:
+            return
+        await self.outbound.flush(timeout)
+        if self.outbound_task:
+            self.outbound_task.cancel()
+        self.outbound = None
+        self.outbound_task = None
 
     def send_full_message(self, message):
         """
@@ -1866,44 +2005,11 @@ class BBSBotApp:
 
     def chunk_message(self, message, chunk_size):
         """
-        Break a message into chunks, up to `chunk_size` characters each,
-        ensuring no splits in the middle of words or lines.
-
-        1. Split by newline to preserve paragraph boundaries.
-        2. For each paragraph, break it into word-based lines
-           that do not exceed chunk_size.
+        Break a message into chunks of up to `chunk_size` CP437 bytes each,
+        splitting only between words (or inside words longer than a chunk)
+        and preserving paragraph boundaries. See text_chunker.chunk_text.
         """
-        paragraphs = message.split('\n')
-        final_chunks = []
-
-        for para in paragraphs:
-            # If paragraph is totally empty, keep it as a blank line
-            if not para.strip():
-                final_chunks.append('')
-                continue
-
-            words = para.split()
-            current_line_words = []
-
-            for word in words:
-                if not current_line_words:
-                    # Start a fresh line
-                    current_line_words.append(word)
-                else:
-                    # Test if we can add " word" without exceeding chunk_size
-                    test_line = ' '.join(current_line_words + [word])
-                    if len(test_line) <= chunk_size:
-                        current_line_words.append(word)
-                    else:
-                        # We have to finalize the current line
-                        final_chunks.append(' '.join(current_line_words))
-                        current_line_words = [word]
-
-            # Any leftover words in current_line_words
-            if current_line_words:
-                final_chunks.append(' '.join(current_line_words))
-
-        return final_chunks
+        return chunk_text(message, chunk_size)
 
     def show_favorites_window(self):
         """Open a Toplevel window to manage favorite BBS addresses."""
@@ -1999,7 +2105,7 @@ class BBSBotApp:
         """Send the username to the BBS."""
         if self.connected and self.writer:
             username = self.username.get()
-            asyncio.run_coroutine_threadsafe(self._send_message(username + "\r\n"), self.loop)  # Append carriage return and newline
+            self.queue_outbound(username + "\r\n", LANE_CONTROL)  # Append carriage return and newline
             if self.remember_username.get():
                 self.save_username()
 
@@ -2007,7 +2113,7 @@ class BBSBotApp:
         """Send the password to the BBS."""
         if self.connected and self.writer:
             password = self.password.get()
-            asyncio.run_coroutine_threadsafe(self._send_message(password + "\r\n"), self.loop)  # Append carriage return and newline
+            self.queue_outbound(password + "\r\n", LANE_CONTROL)  # Append carriage return and newline
             if self.remember_password.get():
                 self.save_password()
 
@@ -2040,14 +2146,13 @@ class BBSBotApp:
     ########################################################################
     def parse_incoming_triggers(self, line):
         # Remove ANSI codes for easier parsing.
-        ansi_escape_regex = re.compile(r'\x1b\[(.*?)m')
-        clean_line = ansi_escape_regex.sub('', line)
+        clean_line = strip_ansi(line)
 
         # Always allow the !nospam command to toggle state
         if "!nospam" in clean_line:
             # Toggle and persist the new state
-            self.no_spam_mode.set(not self.no_spam_mode.get())
-            state = "enabled" if self.no_spam_mode.get() else "disabled"
+            self.set_no_spam_mode(not self.no_spam)
+            state = "enabled" if self.no_spam else "disabled"
             self.send_full_message(f"No Spam Mode has been {state}.")
             self.save_no_spam_state()
             return
@@ -2058,7 +2163,7 @@ class BBSBotApp:
         direct_message_match = re.match(r'From (.+?) \(to you\): (.+)', clean_line)
 
         # If !nospam is ON, only allow whispered and paging messages.
-        if self.no_spam_mode.get() and not (private_message_match or page_message_match):
+        if self.no_spam and not (private_message_match or page_message_match):
             self.append_terminal_text("Ignored trigger due to No Spam Mode.\n", "normal")
             return
 
@@ -2193,7 +2298,7 @@ class BBSBotApp:
                         parts = message.split("!since", 1)[1].strip()
                         response = self.handle_since_command(parts if parts else sender)
                         if response:
-                            if self.no_spam_mode.get() or self.no_spam_perm:
+                            if self.no_spam or self.no_spam_perm:
                                 self.send_private_message(sender, response)
                             else:
                                 self.send_full_message(response)
@@ -2209,7 +2314,7 @@ class BBSBotApp:
         if not self.chat_members:
             return "No users currently in the chatroom."
         else:
-            return "Users currently in the chatroom: " + ", ".join(self.chat_members)
+            return "Users currently in the chatroom: " + self.chat_members.prompt_names()
 
     def send_page_response(self, username, module_or_channel, message):
         """
@@ -2229,7 +2334,7 @@ class BBSBotApp:
         help_chunks = self.get_help_response()
         
         # Send each chunk separately without using delayed scheduling
-        if self.no_spam_mode.get() or self.no_spam_perm:
+        if self.no_spam or self.no_spam_perm:
             # Find the sender - check previous line for username pattern
             sender_match = re.match(r'From (.+?): !help', self.previous_line)
             if sender_match:
@@ -2250,7 +2355,7 @@ class BBSBotApp:
     ########################################################################
     def handle_weather_command(self, location):
         """Fetch weather info and relay it to the user using ChatGPT."""
-        key = self.weather_api_key.get()
+        key = self.api_keys["weather_api_key"]
         if not key:
             response = "Weather API key is missing."
         elif not location:
@@ -2301,7 +2406,7 @@ class BBSBotApp:
     ########################################################################
     def handle_youtube_command(self, query):
         """Perform a YouTube search for the given query (unlimited length)."""
-        key = self.youtube_api_key.get()
+        key = self.api_keys["youtube_api_key"]
         if not key:
             response = "YouTube API key is missing."
         else:
@@ -2335,8 +2440,8 @@ class BBSBotApp:
         """
         Perform a Google Custom Search (unlimited length) for better link display.
         """
-        cse_key = self.google_cse_api_key.get()
-        cse_id = self.google_cse_cx.get()
+        cse_key = self.api_keys["google_cse_api_key"]
+        cse_id = self.api_keys["google_cse_cx"]
         if not cse_key or not cse_id:
             response = "Google CSE API key or engine ID is missing."
         else:
@@ -2379,12 +2484,8 @@ class BBSBotApp:
         The response can be longer than 220 characters but will be split into blocks.
         """
         self.refresh_membership()  # Refresh membership before generating response
-        time.sleep(1)  # Allow time for membership list to be updated
-        self.master.update()  # Process any pending updates
 
-        # Fetch the latest chat members from DynamoDB
-        self.chat_members = set(self.get_chat_members())
-        print(f"[DEBUG] Updated chat members list before generating response: {self.chat_members}")
+        print(f"[DEBUG] Chat members before generating response: {self.chat_members.prompt_names()}")
 
         response = self.get_chatgpt_response(user_text, username=username)
         self.send_full_message(response)
@@ -2409,7 +2510,7 @@ class BBSBotApp:
     ########################################################################
     def handle_map_command(self, place):
         """Fetch place info from Google Places API and return the response as a string."""
-        key = self.google_places_api_key.get()
+        key = self.api_keys["google_places_api_key"]
         if not key:
             response = "Google Places API key is missing."
         elif not place:
@@ -2455,8 +2556,7 @@ class BBSBotApp:
         """Send an <ENTER> keystroke every 10 seconds to keep the connection alive."""
         while not self.keep_alive_stop_event.is_set():
             if self.connected and self.writer:
-                self.writer.write("\r\n")
-                await self.writer.drain()
+                self.queue_outbound("\r\n", LANE_CONTROL)
             await asyncio.sleep(10)
 
     def start_keep_alive(self):
@@ -2488,27 +2588,32 @@ class BBSBotApp:
         # This ensures we always greet regardless of membership status
         greeting_message = f"{new_member_username} just came into the chatroom, give them a casual greeting directed at them."
         
-        # Generate response with ChatGPT
-        response = self.get_chatgpt_response(greeting_message, direct=True, username=new_member_username)
-        
-        # Append help message to the AI-generated greeting
-        response += " Use !help to see what I can do!"
-        
-        # Send a direct response to the user
-        print(f"[DEBUG] Sending greeting to {new_member_username}: {response}")
-        self.send_direct_message(new_member_username, response)
+        if self.stream_chatgpt:
+            # Stream the greeting to the user sentence by sentence, then the help hint
+            self.stream_chatgpt_response(greeting_message,
+                                         lambda piece: self.send_direct_message(new_member_username, piece),
+                                         direct=True, username=new_member_username)
+            self.send_direct_message(new_member_username, "Use !help to see what I can do!")
+        else:
+            # Generate response with ChatGPT
+            response = self.get_chatgpt_response(greeting_message, direct=True, username=new_member_username)
+
+            # Append help message to the AI-generated greeting
+            response += " Use !help to see what I can do!"
+
+            # Send a direct response to the user
+            print(f"[DEBUG] Sending greeting to {new_member_username}: {response}")
+            self.send_direct_message(new_member_username, response)
         
-        # Add to chat members if not already there
+        # Add to chat members if not already there (mirrored to DynamoDB only if new)
         self.chat_members.add(new_member_username)
-        self.save_chat_members()
         
         # Update last seen timestamp
         self.last_seen[new_member_username.lower()] = int(time.time())
-        self.save_last_seen()
 
     def handle_pic_command(self, query):
         """Fetch a random picture from Pexels based on the query."""
-        key = self.pexels_api_key.get()
+        key = self.api_keys["pexels_api_key"]
         if not key:
             response = "Pexels API key is missing."
         elif not query:
@@ -2543,12 +2648,17 @@ class BBSBotApp:
     def refresh_membership(self):
         """Refresh the membership list by sending an ENTER keystroke and allowing time for processing."""
         self.send_enter_keystroke()
-        time.sleep(1)         # Allow BBS lines to arrive
-        self.master.update()  # Let process_incoming_messages() parse them
+        # Runs on a worker thread: the main thread's process_incoming_messages() parses
+        # the reply every 100 ms, so waiting is enough (Tk must not be pumped from here)
+        time.sleep(2)
 
     def get_news_response(self, topic):
+        """Synchronous wrapper around get_news_response_async for worker-thread callers."""
+        return self.run_async(self.get_news_response_async(topic))
+
+    async def get_news_response_async(self, topic):
         """Fetch top 2 news headlines and return the response as a string."""
-        key = self.news_api_key.get()
+        key = self.api_keys["news_api_key"]
         if not key:
             return "News API key is missing."
         else:
@@ -2560,7 +2670,7 @@ class BBSBotApp:
                 "pageSize": 2  # Fetch top 2 headlines
             }
             try:
-                r = requests.get(url, params=params)
+                r = await self.http.get(url, params=params)
                 data = r.json()
                 articles = data.get("articles", [])
                 if not articles:
@@ -2675,7 +2785,7 @@ class BBSBotApp:
         response = f"AUTO-GREETING-STATUS: Auto-greeting has been {state}."
         
         # Send the response using normal channel
-        if self.no_spam_mode.get() or self.no_spam_perm:
+        if self.no_spam or self.no_spam_perm:
             # Find the sender from the previous line if possible
             sender_match = re.match(r'From (.+?): !greeting', self.previous_line)
             if sender_match:
@@ -2699,43 +2809,42 @@ class BBSBotApp:
         response = self.get_seen_response(username)
         self.send_full_message(response)
 
+    def resolve_presence_name(self, username):
+        """
+        Map a possibly mistyped name to a known presence key.
+        Returns (key, None) on a unique match, or (None, suggestions) otherwise.
+        """
+        matches = self.last_seen.suggest(username)
+        if len(matches) == 1:
+            return matches[0], None
+        return None, matches
+
     def get_seen_response(self, username):
         """Return the last seen timestamp of a user in GMT time."""
-        username_lower = username.lower()
-        last_seen_lower = {k.lower(): v for k, v in self.last_seen.items()}
+        key, suggestions = self.resolve_presence_name(username)
+        if key and key != normalize_username(username):
+            username = key  # Report under the name we actually matched
+        last_seen_time = self.last_seen.get(key) if key else None
 
-        if username_lower in last_seen_lower:
-            last_seen_time = last_seen_lower[username_lower]
+        if last_seen_time is not None:
             # Convert timestamp to GMT/UTC time
             last_seen_str = time.strftime('%Y-%m-%d %H:%M:%S GMT', time.gmtime(last_seen_time))
             time_diff = int(time.time()) - last_seen_time
             hours, remainder = divmod(time_diff, 3600)
             minutes, seconds = divmod(remainder, 60)
             return f"{username} was last seen on {last_seen_str} ({hours} hours, {minutes} minutes, {seconds} seconds ago)."
+        elif suggestions:
+            return f"{username} has not been seen in the chatroom. Did you mean: {', '.join(suggestions)}?"
         else:
             return f"{username} has not been seen in the chatroom."
 
     def save_last_seen(self):
-        """Save the last seen dictionary to a file with error handling."""
-        try:
-            with open("last_seen.json", "w") as file:
-                json.dump(self.last_seen, file, indent=2)
-            print("[DEBUG] Successfully saved last seen timestamps")
-        except Exception as e:
-            print(f"[ERROR] Failed to save last seen timestamps: {e}")
+        """Flush pending last seen updates to disk now (normally done in the background)."""
+        self.last_seen.flush()
 
     def load_last_seen(self):
-        """Load the last seen dictionary from a file with error handling."""
-        try:
-            if os.path.exists("last_seen.json"):
-                with open("last_seen.json", "r") as file:
-                    data = json.load(file)
-                    # Convert all keys to lowercase for case-insensitive matching
-                    return {k.lower(): v for k, v in data.items()}
-            return {}
-        except Exception as e:
-            print(f"[ERROR] Failed to load last seen timestamps: {e}")
-            return {}
+        """Load last seen timestamps into a dict that persists itself in batches."""
+        return PresenceStore(self.chat_store, 'last_seen')
 
     def get_stock_price(self, symbol):
         """Fetch the current price of a stock using Yahoo Finance."""
@@ -2773,7 +2882,7 @@ class BBSBotApp:
 
     def get_crypto_price(self, crypto):
         """Fetch the current price of a cryptocurrency."""
-        api_key = self.coinmarketcap_api_key.get()
+        api_key = self.api_keys["coinmarketcap_api_key"]
         url = 'https://pro-api.coinmarketcap.com/v1/cryptocurrency/quotes/latest'
         parameters = {
             'symbol': crypto,
@@ -2798,7 +2907,7 @@ class BBSBotApp:
 
     def handle_stock_command(self, symbol):
         """Handle the !stocks command to show the current price of a stock."""
-        if not self.alpha_vantage_api_key.get():
+        if not self.api_keys["alpha_vantage_api_key"]:
             response = "Alpha Vantage API key is missing."
         else:
             response = self.get_stock_price(symbol)
@@ -2806,7 +2915,7 @@ class BBSBotApp:
 
     def handle_crypto_command(self, crypto):
         """Handle the !crypto command to show the current price of a cryptocurrency."""
-        if not self.coinmarketcap_api_key.get():
+        if not self.api_keys["coinmarketcap_api_key"]:
             response = "CoinMarketCap API key is missing."
         else:
             response = self.get_crypto_price(crypto)
@@ -2835,14 +2944,18 @@ class BBSBotApp:
 
         def timer_callback():
             self.send_full_message(f"Timer for {username} has ended.")
-            del self.timers[timer_id]
+            self.timers.pop(timer_id, None)
 
-        self.timers[timer_id] = self.master.after(duration * 1000, timer_callback)
+        # This runs on a dispatcher worker, where master.after is not safe to call
+        timer = threading.Timer(duration, timer_callback)
+        timer.daemon = True
+        self.timers[timer_id] = timer
+        timer.start()
         self.send_full_message(f"Timer set for {username} for {value} {unit}.")
 
     def get_gif_response(self, query):
         """Fetch a popular GIF based on the query and return the direct link to the GIF."""
-        key = self.giphy_api_key.get()
+        key = self.api_keys["giphy_api_key"]
         if not key:
             return "Giphy API key is missing."
         elif not query:
@@ -2956,7 +3069,7 @@ class BBSBotApp:
     def handle_msg_command(self, recipient, message, sender):
         """Handle the !msg command to leave a message for another user."""
         # When in no_spam mode, always respond via whisper
-        if self.no_spam_mode.get() or self.no_spam_perm:
+        if self.no_spam or self.no_spam_perm:
             self.send_private_message(sender, f"Message for {recipient} saved. They will receive it the next time they are seen in the chatroom.")
         else:
             self.send_full_message(f"Message for {recipient} saved. They will receive it the next time they are seen in the chatroom.")
@@ -2989,10 +3102,10 @@ class BBSBotApp:
         try:
             with open("nospam_state.json", "w") as file:
                 json.dump({
-                    "nospam": self.no_spam_mode.get(),
+                    "nospam": self.no_spam,
                     "nospam_perm": self.no_spam_perm
                 }, file, indent=4)
-            print(f"Saved no_spam state: mode={self.no_spam_mode.get()}, perm={self.no_spam_perm}")
+            print(f"Saved no_spam state: mode={self.no_spam}, perm={self.no_spam_perm}")
         except Exception as e:
             print(f"Error saving no_spam state: {e}")
 
@@ -3001,7 +3114,7 @@ class BBSBotApp:
         if not query:
             response_message = "Please provide a query for the document."
             # Check no_spam setting when deciding how to respond
-            if public and not (self.no_spam_mode.get() or self.no_spam_perm):
+            if public and not (self.no_spam or self.no_spam_perm):
                 self.send_full_message(response_message)
             else:
                 self.send_private_message(username, response_message)
@@ -3043,7 +3156,7 @@ class BBSBotApp:
             response_message = f"Error creating document: {str(e)}"
 
         # Check no_spam setting when deciding how to respond
-        if public and not (self.no_spam_mode.get() or self.no_spam_perm):
+        if public and not (self.no_spam or self.no_spam_perm):
             self.send_full_message(response_message)
         else:
             self.send_private_message(username, response_message)
@@ -3073,37 +3186,29 @@ class BBSBotApp:
         return gpt_response
 
     def store_public_message(self, username, message):
-        """Store the public message for the given username (keeping only the three most recent)."""
-        username = username.lower()
-        if username not in self.public_message_history:
-            self.public_message_history[username] = []
+        """Store the public message for the given username in the chat history store."""
+        username = normalize_username(username)
         # Split the message into lines and store each line separately
-        lines = message.split('\n')
-        for line in lines:
-            self.public_message_history[username].append(line)
-        if len(self.public_message_history[username]) > 3:
-            self.public_message_history[username] = self.public_message_history[username][-3:]
+        for line in message.split('\n'):
+            self.chat_store.log_message(username, line)
 
     def handle_said_command(self, sender, command_text, is_page=False, module_or_channel=None):
         """Handle the !said command to report the last three public messages of a user."""
         parts = command_text.split()
         if len(parts) == 1:
             # No username provided, report the last three things said in the chatroom
-            all_messages = []
-            for user_messages in self.public_message_history.values():
-                all_messages.extend(user_messages)
-            all_messages = all_messages[-3:]  # Get the last three messages
+            all_messages = self.chat_store.recent_messages(limit=3)
             if not all_messages:
                 response = "No public messages found."
             else:
                 response = "Last three public messages in the chatroom: " + " ".join(all_messages)
         elif len(parts) == 2:
             # Username provided, report the last three messages from that user
-            target_username = parts[1].lower()
-            if target_username not in self.public_message_history:
+            target_username = normalize_username(parts[1])
+            messages = self.chat_store.recent_messages(target_username, limit=3)
+            if not messages:
                 response = f"No public messages found for {target_username}."
             else:
-                messages = self.public_message_history[target_username][-3:]  # Get the last three messages
                 response = f"Last three public messages from {target_username}: " + " ".join(messages)
         else:
             response = "Usage: !said [<username>]"
@@ -3112,7 +3217,7 @@ class BBSBotApp:
             self.send_page_response(sender, module_or_channel, response)
         else:
             # Check no_spam setting before deciding how to respond
-            if self.no_spam_mode.get() or self.no_spam_perm:
+            if self.no_spam or self.no_spam_perm:
                 self.send_private_message(sender, response)
             else:
                 self.send_full_message(response)
@@ -3160,7 +3265,7 @@ class BBSBotApp:
             help_chunks = self.get_help_response()
             # Special handling for help chunks
             for chunk in help_chunks:
-                if self.no_spam_mode.get():
+                if self.no_spam:
                     self.send_private_message(username, chunk)
                 else:
                     self.send_full_message(chunk)
@@ -3179,7 +3284,7 @@ class BBSBotApp:
             response = self.get_seen_response(target_username)
         elif "!doc" in message:
             query = message.split("!doc", 1)[1].strip()
-            self.handle_doc_command(query, username, public=not self.no_spam_mode.get())
+            self.handle_doc_command(query, username, public=not self.no_spam)
             return
         elif "!said" in message:
             self.handle_said_command(username, message)
@@ -3199,7 +3304,7 @@ class BBSBotApp:
             parts = message.split(maxsplit=2)
             if len(parts) < 3:
                 response = "Usage: !msg <username> <message>"
-                if self.no_spam_mode.get() or self.no_spam_perm:
+                if self.no_spam or self.no_spam_perm:
                     self.send_private_message(username, response)
                 else:
                     self.send_full_message(response)
@@ -3213,7 +3318,7 @@ class BBSBotApp:
             response = self.handle_since_command(parts if parts else username)
 
         if response:
-            if self.no_spam_mode.get():
+            if self.no_spam:
                 self.send_private_message(username, response)
             else:
                 self.send_full_message(response)
@@ -3227,7 +3332,7 @@ class BBSBotApp:
                 self.send_page_response(sender, module_or_channel, response)
             else:
                 # Check no_spam setting before deciding how to respond
-                if self.no_spam_mode.get() or self.no_spam_perm:
+                if self.no_spam or self.no_spam_perm:
                     self.send_private_message(sender, response)
                 else:
                     self.send_full_message(response)
@@ -3240,12 +3345,16 @@ class BBSBotApp:
             self.send_page_response(sender, module_or_channel, response)
         else:
             # Check no_spam setting before deciding how to respond
-            if self.no_spam_mode.get() or self.no_spam_perm:
+            if self.no_spam or self.no_spam_perm:
                 self.send_private_message(sender, response)
             else:
                 self.send_full_message(response)
 
     def get_podcast_response(self, show, episode):
+        """Synchronous wrapper around get_podcast_response_async for worker-thread callers."""
+        return self.run_async(self.get_podcast_response_async(show, episode))
+
+    async def get_podcast_response_async(self, show, episode):
         """Query the iTunes API for podcast episode details."""
         url = "https://itunes.apple.com/search"
         # Build parameters with a cache-buster parameter
@@ -3258,13 +3367,13 @@ class BBSBotApp:
         }
         try:
             # Add header to prevent caching
-            r = requests.get(url, params=params, headers={"Cache-Control": "no-cache"})
+            r = await self.http.get(url, params=params, headers={"Cache-Control": "no-cache"})
             data = r.json()
             if data["resultCount"] == 0:
                 # Retry with just the show name if no results found
                 params["term"] = show
                 params["cb"] = int(time.time())  # Update cache buster
-                r = requests.get(url, params=params, headers={"Cache-Control": "no-cache"})
+                r = await self.http.get(url, params=params, headers={"Cache-Control": "no-cache"})
                 data = r.json()
                 if data["resultCount"] == 0:
                     return f"No matching episode found for {show} {episode}."
@@ -3298,31 +3407,27 @@ class BBSBotApp:
             return f"Error fetching podcast details: {str(e)}"
 
     def get_trump_post(self):
-        """Run the Trump post scraper script and return the latest post."""
+        """Return the latest Trump post, from the background poller's cache when it is fresh."""
         try:
-            script_path = "/home/ec2-user/Headless-Robot/TrumpsLatestPostScraper.py"
-            command = [sys.executable, script_path]
-            
-            # Verify script exists before running
-            if not os.path.exists(script_path):
-                return f"Error: Script not found at {script_path}"
-                
-            result = subprocess.run(command, capture_output=True, text=True, encoding='utf-8', 
-                                  errors='ignore', timeout=180)
-            output = result.stdout.strip()
-
-            if result.returncode != 0:
-                error_msg = result.stderr.strip() or "Unknown error from Trump scraper."
-                return f"Error from Trump post script: {error_msg}"
-
-            # Split the output into lines and get the last two lines
-            lines = output.splitlines()
-            if len(lines) >= 2:
-                return "\n".join(lines[-2:])
-            else:
-                return output
+            post, age = self.scrapers.latest_post('trump')
+        except ImportError as e:
+            return f"Trump scraper unavailable, missing package: {e.name}"
         except Exception as e:
-            return f"Error running Trump post script: {str(e)}"
+            return f"Error running Trump post scraper: {str(e)}"
+        if post is None:
+            return "No recent post found."
+        response = f"Latest Post: {post.text}"
+        if post.posted_at:
+            response += f"\nPosted on: {post.posted_at}"
+        return f"{response}\n(fetched {format_age(age)} ago)" if age >= 60 else response
+
+    def announce_new_post(self, source, post):
+        """Background poller callback: share a newly detected post if announcements are on."""
+        print(f"[DEBUG] New {source} post detected: {post.text[:80]}")
+        if not self.announce_new_posts or not self.connected:
+            return
+        label = "Trump" if source == 'trump' else "Musk"
+        self.send_full_message(f"New {label} post: {post.text}")
 
     def load_email_credentials(self):
         """Load email credentials from a file."""
@@ -3367,82 +3472,13 @@ class BBSBotApp:
 
 
 
-    def check_incoming_mail(self):
-        """
-        Periodically check for incoming emails with the subject 'BBS'.
-        If found, post their content to the BBS chatroom.
-        """
-        if not self.connected:
-            # Skip if not connected to BBS
-            self.master.after(60000, self.check_incoming_mail)  # Check again in 1 minute
-            return
-
-        credentials = self.load_email_credentials()
-        email_address = credentials.get("sender_email")
-        password = credentials.get("sender_password")
-
-        if not email_address or not password:
-            print("Email credentials are missing. Cannot check incoming mail.")
-            self.master.after(60000, self.check_incoming_mail)  # Check again in 1 minute
-            return
-
-        try:
-            # Connect to the IMAP server
-            mail = imaplib.IMAP4_SSL('imap.gmail.com')
-            mail.login(email_address, password)
-            mail.select('inbox')
-
-            # Search for unread emails with subject 'BBS'
-            status, messages = mail.search(None, '(UNSEEN SUBJECT "BBS")')
-
-            if status != 'OK':
-                print(f"Error searching for messages: {status}")
-                mail.logout()
-                self.master.after(60000, self.check_incoming_mail)  # Check again in 1 minute
-                return
-
-            # Process each matching email
-            for num in messages[0].split():
-                status, data = mail.fetch(num, '(RFC822)')
-                if status != 'OK':
-                    print(f"Error fetching message {num}: {status}")
-                    continue
-
-                email_msg = email.message_from_bytes(data[0][1])
-                sender = parseaddr(email_msg['From'])[1]
-
-                # Get the message body
-                body = ""
-                if email_msg.is_multipart():
-                    for part in email_msg.walk():
-                        content_type = part.get_content_type()
-                        if content_type == "text/plain":
-                            body = part.get_payload(decode=True).decode('utf-8')
-                            break
-                else:
-                    body = email_msg.get_payload(decode=True).decode('utf-8')
-
-                # Truncate to 230 characters if needed
-                if len(body) > 230:
-                    body = body[:227] + "..."
-
-                # Post to BBS chatroom
-                self.send_full_message(f"Email from {sender}: {body}")
-
-                # Mark the email as read
-                mail.store(num, '+FLAGS', '\\Seen')
-
-            mail.logout()
-        except Exception as e:
-            print(f"Error checking incoming mail: {e}")
-
-        # Schedule next check
-        self.master.after(30000, self.check_incoming_mail)  # Check every 30 seconds
-
-
-
-
-
+    def relay_email(self, sender, body):
+        """MailRelay callback: post an incoming email to the chatroom. Returns False to retry later."""
+        if not self.connected or not self.writer:
+            return False
+        print(f"[DEBUG] Relaying email from {sender}")
+        self.send_full_message(f"Incoming message via eMail: {body}")
+        return True
 
     def handle_mail_command(self, command_text):
         """Handle the !mail command to send an email."""
@@ -3455,7 +3491,7 @@ class BBSBotApp:
             if len(parts) < 4:
                 response = "Usage: !mail \"recipient@example.com\" \"Subject\" \"Body\""
                 # Check no_spam setting before deciding how to respond
-                if self.no_spam_mode.get() or self.no_spam_perm:
+                if self.no_spam or self.no_spam_perm:
                     if sender_username != "Unknown User":
                         self.send_private_message(sender_username, response)
                     else:
@@ -3470,7 +3506,7 @@ class BBSBotApp:
             response = self.send_email(recipient, subject, body, sender_username)
             
             # Check no_spam setting before deciding how to respond
-            if self.no_spam_mode.get() or self.no_spam_perm:
+            if self.no_spam or self.no_spam_perm:
                 if sender_username != "Unknown User":
                     self.send_private_message(sender_username, response)
                 else:
@@ -3480,7 +3516,7 @@ class BBSBotApp:
         except ValueError as e:
             error_response = f"Error parsing command: {str(e)}"
             # Same check for response
-            if self.no_spam_mode.get() or self.no_spam_perm:
+            if self.no_spam or self.no_spam_perm:
                 sender_match = re.match(r'From (.+?): !mail', command_text)
                 sender_username = sender_match.group(1) if sender_match else None
                 if sender_username:
@@ -3491,6 +3527,10 @@ class BBSBotApp:
                 self.send_full_message(error_response)
 
     def get_pic_response(self, query):
+        """Synchronous wrapper around get_pic_response_async for worker-thread callers."""
+        return self.run_async(self.get_pic_response_async(query))
+
+    async def get_pic_response_async(self, query):
         """Fetch a picture or GIF URL based on the query format '!pic <img/gif> <search terms>'."""
         if not query:
             return "Usage: !pic <img/gif> <search terms>"
@@ -3505,8 +3545,8 @@ class BBSBotApp:
         if pic_type not in ["img", "gif"]:
             return "Invalid type. Use 'img' for images or 'gif' for GIFs."
     
-        cse_key = self.google_cse_api_key.get()
-        cse_id = self.google_cse_pic_cx.get()
+        cse_key = self.api_keys["google_cse_api_key"]
+        cse_id = self.api_keys["google_cse_pic_cx"]
         if not cse_key or not cse_id:
             return "Google CSE API key or engine ID is missing."
     
@@ -3526,7 +3566,7 @@ class BBSBotApp:
             params["fileType"] = "jpg,png"
     
         try:
-            r = requests.get(url, params=params, timeout=10)
+            r = await self.http.get(url, params=params)
             data = r.json()
             items = data.get("items", [])
             if not items:
@@ -3568,7 +3608,7 @@ class BBSBotApp:
             
             # Shorten URL with error handling
             try:
-                shortened_url = self.shorten_url(image_url)
+                shortened_url = await self.shorten_url_async(image_url)
                 if shortened_url and "tinyurl.com" in shortened_url:
                     final_url = shortened_url
                 else:
@@ -3590,7 +3630,7 @@ class BBSBotApp:
                 
             return response
     
-        except requests.exceptions.RequestException as e:
+        except HTTPError as e:
             return f"Error fetching {pic_type}: {str(e)}"
         except Exception as e:
             return f"Unexpected error processing {pic_type} request: {str(e)}"
@@ -3630,37 +3670,21 @@ class BBSBotApp:
         self.send_full_message(response)
 
     def get_musk_post(self):
-        """Run the Musk post scraper script and return the latest post."""
+        """Return Musk's latest post, from the background poller's cache when it is fresh."""
         try:
-            script_path = "/home/ec2-user/Headless-Robot/MusksLatestPostScraper.py"
-            command = [sys.executable, script_path]
-            
-            # Verify script exists before running
-            if not os.path.exists(script_path):
-                return f"Error: Script not found at {script_path}"
-                
-            result = subprocess.run(command, capture_output=True, text=True, encoding='utf-8', 
-                                  errors='ignore', timeout=180)
-            output = result.stdout.strip()
-
-            if result.returncode != 0:
-                # If the script returned a non-zero exit code
-                error_msg = result.stderr.strip() or "Unknown error from Musk scraper."
-                return f"Error from Musk post script: {error_msg}"
-
-            # Split the output into lines and get the last line
-            lines = output.splitlines()
-            if len(lines) >= 1:
-                return lines[-1]
-            else:
-                return output
+            post, age = self.scrapers.latest_post('musk')
+        except ImportError as e:
+            return f"Musk scraper unavailable, missing package: {e.name}"
         except Exception as e:
-            return f"Error running Musk post script: {str(e)}"
+            return f"Error running Musk post scraper: {str(e)}"
+        if post is None:
+            return "No recent posts found."
+        return f"{post.text} (fetched {format_age(age)} ago)" if age >= 60 else post.text
 
     def start_join_timer(self):
         """Start timer to send 'join majorlink' every 60 seconds"""
         if self.connected and self.writer:
-            asyncio.run_coroutine_threadsafe(self._send_message("join majorlink\r\n"), self.loop)
+            self.queue_outbound("join majorlink\r\n", LANE_CONTROL)
             self.join_timer = self.master.after(60000, self.start_join_timer)  # Schedule next join
 
     def stop_join_timer(self):
@@ -3670,14 +3694,18 @@ class BBSBotApp:
             self.join_timer = None
 
     def shorten_url(self, url):
+        """Synchronous wrapper around shorten_url_async for worker-thread callers."""
+        return self.run_async(self.shorten_url_async(url))
+
+    async def shorten_url_async(self, url):
         """Shorten a URL using TinyURL's API with special handling for image URLs."""
         try:
             # Special handling for image URLs - DON'T use TinyURL for these
             if "jpg" in url.lower() or "jpeg" in url.lower() or "png" in url.lower() or "gif" in url.lower() or "image" in url.lower():
                 # For images, use a different URL shortener that's more reliable
                 # Using is.gd instead of TinyURL for images
-                isgd_api = f"https://is.gd/create.php?format=simple&url={requests.utils.quote(url, safe='')}"
-                response = requests.get(isgd_api, timeout=5)
+                isgd_api = f"https://is.gd/create.php?format=simple&url={quote(url, safe='')}"
+                response = await self.http.get(isgd_api, timeout=5)
                 
                 if response.status_code == 200:
                     shortened = response.text.strip()
@@ -3690,9 +3718,9 @@ class BBSBotApp:
                 return url
                 
             # Standard TinyURL for non-image URLs
-            encoded_url = requests.utils.quote(url, safe='')
+            encoded_url = quote(url, safe='')
             tinyurl_api = f"http://tinyurl.com/api-create.php?url={encoded_url}"
-            response = requests.get(tinyurl_api, timeout=5)
+            response = await self.http.get(tinyurl_api, timeout=5)
             
             if response.status_code == 200:
                 shortened = response.text.strip()
@@ -3711,8 +3739,12 @@ class BBSBotApp:
             return url
 
     def get_gif_response(self, query):
+        """Synchronous wrapper around get_gif_response_async for worker-thread callers."""
+        return self.run_async(self.get_gif_response_async(query))
+
+    async def get_gif_response_async(self, query):
         """Fetch a popular GIF based on the query and return the direct link to the GIF."""
-        key = self.giphy_api_key.get()
+        key = self.api_keys["giphy_api_key"]
         if not key:
             return "Giphy API key is missing."
         elif not query:
@@ -3726,14 +3758,14 @@ class BBSBotApp:
                 "rating": "g"
             }
             try:
-                r = requests.get(url, params=params)
+                r = await self.http.get(url, params=params)
                 data = r.json()
                 if not data['data']:
                     return "No GIFs found for the query."
                 else:
                     gif_page_url = data['data'][0]['url']
                     # Fetch the HTML content of the Giphy page
-                    page_response = requests.get(gif_page_url)
+                    page_response = await self.http.get(gif_page_url)
                     soup = BeautifulSoup(page_response.content, 'html.parser')
                     # Extract the direct link to the GIF
                     meta_tag = soup.find('meta', property='og:image')
@@ -3743,11 +3775,11 @@ class BBSBotApp:
                         if direct_gif_url.endswith('.webp'):
                             direct_gif_url = direct_gif_url.replace('.webp', '.gif')
                         # Shorten the URL
-                        shortened_url = self.shorten_url(direct_gif_url)
+                        shortened_url = await self.shorten_url_async(direct_gif_url)
                         return shortened_url
                     else:
                         return "Could not extract the direct GIF link."
-            except requests.exceptions.RequestException as e:
+            except HTTPError as e:
                 return f"Error fetching GIF: {str(e)}"
 
     def determine_response_channel(self, message_type, nospam_state, nospam_perm):
@@ -3761,57 +3793,14 @@ class BBSBotApp:
 
     def parse_message(self, line):
         """Parse incoming messages and return tuple of (type, username, content)."""
-        # Remove ANSI codes for easier parsing
-        ansi_escape_regex = re.compile(r'\x1b\[(.*?)m')
-        clean_line = ansi_escape_regex.sub('', line)
-
-        # Define patterns with their corresponding message types - now supporting both formats
-        patterns = {
-            # Existing patterns with "From" prefix
-            'page': [(r'(.+?) is paging you from (.+?): (.+)', 
-                    lambda m: ('page', m.group(1), m.group(3)))],
-                    
-            'whisper': [(r'From (.+?) \(whispered\): (.+)',
-                        lambda m: ('whisper', m.group(1), m.group(2))),
-                       # New whisper patterns with :[] format
-                       (r':\[(.+?)\] \(whispered\): (.+)',
-                        lambda m: ('whisper', m.group(1), m.group(2))),
-                       (r':\[(.+?@.+?)\] \(whispered\): (.+)',
-                        lambda m: ('whisper', m.group(1), m.group(2)))],
-                        
-            'direct': [(r'From (.+?) \(to you\): (.+)',
-                       lambda m: ('direct', m.group(1), m.group(2))),
-                      # New direct message patterns with :[] format
-                      (r':\[(.+?)\] \(to you\): (.+)',
-                       lambda m: ('direct', m.group(1), m.group(2))),
-                      (r':\[(.+?@.+?)\] \(to you\): (.+)',
-                       lambda m: ('direct', m.group(1), m.group(2)))],
-                       
-            'public': [(r'From (.+?): (.+)',
-                       lambda m: ('public', m.group(1), m.group(2))),
-                      # New public message patterns with :[] format
-                      (r':\[(.+?)\]: (.+)',
-                       lambda m: ('public', m.group(1), m.group(2))),
-                      (r':\[(.+?@.+?)\]: (.+)', 
-                       lambda m: ('public', m.group(1), m.group(2)))],
-                       
-            'third_party': [(r':\[(.+?)\] \(to (.+?)\): (.+)',
-                            lambda m: ('third_party', m.group(1), m.group(3))),
-                           (r':\[(.+?@.+?)\] \(to (.+?@.+?)\): (.+)',
-                            lambda m: ('third_party', m.group(1), m.group(3)))]
-        }
-
-        # Process each message type and its patterns
-        for msg_type, pattern_list in patterns.items():
-            for pattern, extract in pattern_list:
-                if match := re.match(pattern, clean_line):
-                    msg_type, username, content = extract(match)
-                    # Ignore public messages containing 'ultron' if from someone else
-                    if msg_type == 'public' and 'ultron' in content.lower() and not username.lower().startswith('ultron'):
-                        return None, None, None
-                    return msg_type, username, content.strip()
+        event = classify_line(strip_ansi(line))
+        if event is None or event.kind not in CHAT_KINDS + (THIRD_PARTY,):
+            return None, None, None
 
-        return None, None, None
+        # Ignore public messages containing 'ultron' if from someone else
+        if event.kind == PUBLIC and 'ultron' in event.content.lower() and not event.username.lower().startswith('ultron'):
+            return None, None, None
+        return event.kind, event.username, event.content
 
     def process_message(self, msg_type, username, content):
         """Process messages according to type and content."""
@@ -3835,8 +3824,8 @@ class BBSBotApp:
             if self.no_spam_perm:
                 self.send_private_message(username, "Not possible - No Spam Mode is permanently locked.")
             else:
-                self.no_spam_mode.set(not self.no_spam_mode.get())
-                state = "enabled" if self.no_spam_mode.get() else "disabled"
+                self.set_no_spam_mode(not self.no_spam)
+                state = "enabled" if self.no_spam else "disabled"
                 self.send_private_message(username, f"No Spam Mode has been {state}.")
                 self.save_no_spam_state()
             return
@@ -3864,7 +3853,7 @@ class BBSBotApp:
             else:
                 response = self.get_chatgpt_response(content, username=username)
             if response:
-                if self.no_spam_mode.get() or self.no_spam_perm:
+                if self.no_spam or self.no_spam_perm:
                     self.send_private_message(username, response)
                 else:
                     self.send_direct_message(username, response)
@@ -3873,7 +3862,7 @@ class BBSBotApp:
             if content.startswith('!'):
                 response = self.get_command_response(content, username)
                 if response:
-                    if self.no_spam_mode.get() or self.no_spam_perm:
+                    if self.no_spam or self.no_spam_perm:
                         self.send_private_message(username, response)
                     else:
                         self.send_full_message(response)
@@ -3881,10 +3870,8 @@ class BBSBotApp:
     def send_page_response(self, username, channel, message):
         """Send a page response via /p command."""
         chunks = self.chunk_message(message, 250)
-        for chunk in chunks:
-            full_message = f"/p {username} {chunk}"
-            asyncio.run_coroutine_threadsafe(self._send_message(full_message + "\r\n"), self.loop)
-            time.sleep(0.5)  # Add delay between chunks
+        # One handoff per message; long replies yield to short ones and control keystrokes
+        self.queue_outbound_lines([f"/p {username} {chunk}\r\n" for chunk in chunks], recipient=username)
 
     def send_private_message(self, username, message):
         """Send a private message with proper error handling and no recursion."""
@@ -3896,22 +3883,11 @@ class BBSBotApp:
                 message = "\n".join(message)
                 
             chunks = self.chunk_message(message, 200)
-            for i, chunk in enumerate(chunks):
-                if self.connected and self.writer:
-                    full_message = f"Whisper to {username} {chunk}"
-                    # Use asyncio.run_coroutine_threadsafe with timeout
-                    future = asyncio.run_coroutine_threadsafe(
-                        self._send_message(full_message + "\r\n"), 
-                        self.loop
-                    )
-                    # Wait for the message to be sent with timeout
-                    future.result(timeout=3.0)
-                    
-                    # Log success but don't try to send again
-                    self.append_terminal_text(full_message + "\n", "normal")
-                    
-                    if i < len(chunks) - 1:
-                        time.sleep(0.5)
+            if self.connected and self.writer:
+                lines = [f"Whisper to {username} {chunk}" for chunk in chunks]
+                # Queued for the paced writer in one handoff; nothing here waits on the send
+                self.queue_outbound_lines([line + "\r\n" for line in lines], recipient=username)
+                self.append_terminal_text("".join(line + "\n" for line in lines), "normal")
         except Exception as e:
             print(f"Error sending private message: {str(e)}")
             # Don't try to send error message to avoid potential infinite loop
@@ -3919,20 +3895,45 @@ class BBSBotApp:
     def send_direct_message(self, username, message):
         """Send a direct public message."""
         chunks = self.chunk_message(message, 250)
-        for chunk in chunks:
-            full_message = f">{username} {chunk}"
-            asyncio.run_coroutine_threadsafe(self._send_message(full_message + "\r\n"), self.loop)
-            time.sleep(0.5)  # Add delay between chunks
+        self.queue_outbound_lines([f">{username} {chunk}\r\n" for chunk in chunks], recipient=username)
 
     def send_full_message(self, message):
         """Send a public message."""
         chunks = self.chunk_message(message, 250)
-        for chunk in chunks:
-            asyncio.run_coroutine_threadsafe(self._send_message(chunk + "\r\n"), self.loop)
-            time.sleep(0.5)  # Add delay between chunks
+        # Help listings, email relays etc. are long enough to go out as bulk
+        self.queue_outbound_lines([chunk + "\r\n" for chunk in chunks])
 
-    def get_command_response(self, content, username=None):
-        """Get appropriate response for a command."""
+    def command_name(self, content):
+        """Return the trigger name of a '!command' message, or None."""
+        if not content.startswith('!'):
+            return None
+        parts = content.split(maxsplit=1)
+        return parts[0][1:] if parts else None
+
+    async def get_command_response_async(self, content, username=None):
+        """Get the response for a command, awaiting native async handlers on the event loop."""
+        command = self.command_name(content)
+        if command not in self.async_commands:
+            return await asyncio.get_running_loop().run_in_executor(None, self.get_command_response, content, username)
+
+        args = content[len(command)+2:].strip()  # Get everything after command
+        async_handlers = {
+            'weather': self.get_weather_response_async,
+            'yt': self.get_youtube_response_async,
+            'search': self.get_web_search_response_async,
+            'news': self.get_news_response_async,
+            'map': self.get_map_response_async,
+            'pic': self.get_pic_response_async,
+            'gif': self.get_gif_response_async,
+        }
+        return await self.response_cache.get_or_compute_async(command, args, lambda: async_handlers[command](args))
+
+    def get_command_response(self, content, username=None, deliver=None):
+        """
+        Get appropriate response for a command. With deliver, a request that
+        duplicates one already running returns None and is answered through
+        deliver(response) instead (see ResponseCache.get_or_compute).
+        """
         if not content.startswith('!'):
             return None
 
@@ -3970,13 +3971,15 @@ class BBSBotApp:
             'blaz': lambda: self.handle_blaz_command(args),
             'radio': lambda: self.handle_radio_command(args),
             'msg': lambda: self.handle_msg_command(*args.split(maxsplit=1), username) if len(args.split(maxsplit=1)) == 2 else "Usage: !msg <username> <message>",
-            'nospam': lambda: self.no_spam_mode.set(not self.no_spam_mode.get()) or f"No Spam Mode has been {'enabled' if self.no_spam_mode.get() else 'disabled'}.",
+            'nospam': lambda: self.set_no_spam_mode(not self.no_spam) or f"No Spam Mode has been {'enabled' if self.no_spam else 'disabled'}.",
             'nospamperm': lambda: "This command is only available via whisper.",
             'since': lambda: self.handle_since_command(args if args else username)
         }
 
         handler = command_handlers.get(command)
-        return handler() if handler else None
+        if not handler:
+            return None
+        return self.response_cache.get_or_compute(command, args, handler, deliver)
 
         
 
@@ -3987,15 +3990,18 @@ class BBSBotApp:
         try:
             # Strip domain part if present
             base_username = username.split('@')[0]
-            username_lower = base_username.lower()
 
-            # Create case-insensitive mappings with base usernames (no domains)
-            last_seen_lower = {k.split('@')[0].lower(): v for k, v in self.last_seen.items()}
-            last_spoke_lower = {k.split('@')[0].lower(): v for k, v in self.last_spoke.items()}
+            # Keys are normalized on write, so once the name is resolved these are direct lookups
+            key, suggestions = self.resolve_presence_name(base_username)
+            if key is None and suggestions:
+                return f"{base_username} - not seen. Did you mean: {', '.join(suggestions)}?"
+            if key and key != normalize_username(base_username):
+                base_username = key
+            last_seen_time = self.last_seen.get(key) if key else None
+            last_spoke_time = self.last_spoke.get(key) if key else None
 
             # Get last seen time
-            if username_lower in last_seen_lower:
-                last_seen_time = last_seen_lower[username_lower]
+            if last_seen_time is not None:
                 last_seen_str = time.strftime('%Y-%m-%d %H:%M:%S GMT', time.gmtime(last_seen_time))
                 seen_diff = int(time.time()) - last_seen_time
                 seen_hours, seen_remainder = divmod(seen_diff, 3600)
@@ -4005,8 +4011,7 @@ class BBSBotApp:
                 last_seen_str = "never"
 
             # Get last spoke time
-            if username_lower in last_spoke_lower:
-                last_spoke_time = last_spoke_lower[username_lower]
+            if last_spoke_time is not None:
                 last_spoke_str = time.strftime('%Y-%m-%d %H:%M:%S GMT', time.gmtime(last_spoke_time))
                 spoke_diff = int(time.time()) - last_spoke_time
                 spoke_hours, spoke_remainder = divmod(spoke_diff, 3600)
@@ -4024,16 +4029,28 @@ class BBSBotApp:
             return f"Error processing !since command for {username}"
 
     def load_last_spoke(self):
-        """Load the last spoke dictionary from a file."""
-        if os.path.exists("last_spoke.json"):
-            with open("last_spoke.json", "r") as file:
-                return json.load(file)
-        return {}
+        """Load last spoke timestamps into a dict that persists itself in batches."""
+        return PresenceStore(self.chat_store, 'last_spoke')
 
     def save_last_spoke(self):
-        """Save the last spoke dictionary to a file."""
-        with open("last_spoke.json", "w") as file:
-            json.dump(self.last_spoke, file)
+        """Flush pending last spoke updates to disk now (normally done in the background)."""
+        self.last_spoke.flush()
+
+    def close_stores(self):
+        """Write out buffered presence/history and DynamoDB updates and quit pooled browsers; call once on shutdown."""
+        self.chat_store.close()
+        self.dynamo_writer.close()
+        self.mail_relay.stop()
+        print(f"[DEBUG] Response cache: {self.response_cache.stats()}")
+        self.scrapers.close()
+
+    def set_no_spam_mode(self, enabled):
+        """Switch No Spam Mode from any thread; the Tk variable is updated on the main thread."""
+        self.no_spam = enabled
+        if threading.current_thread() is threading.main_thread():
+            self.no_spam_mode.set(enabled)
+        else:
+            self.master.after(0, self.no_spam_mode.set, enabled)
 
     def load_greeting_state(self):
         """Load auto-greeting state from file."""
@@ -4059,6 +4076,9 @@ def main():
     except Exception as e:
         print(f"An error occurred: {e}")
     finally:
+        if app:
+            app.dispatcher.shutdown()
+            app.close_stores()
         if app and app.connected:
             try:
                 asyncio.run_coroutine_threadsafe(app.disconnect_from_bbs(), app.loop).result()
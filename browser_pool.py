@@ -0,0 +1,214 @@
+"""
+Small pool of long-lived headless Chrome sessions.
+
+Starting Chrome (and, for X, logging in again) used to cost most of a
+!trump or !musk request.  BrowserPool keeps up to `size` drivers alive and
+hands them out with session(); a driver is reused across requests and only
+replaced after max_uses requests, when a request fails with a WebDriver
+error, or when it no longer answers a health check.  Each pooled driver gets
+its own persistent Chrome profile directory, so cookies and local storage
+(including a logged-in X session) survive a recycle or a bot restart.
+
+Selenium is imported lazily so the bot still starts on machines without it.
+"""
+import os
+import platform
+import threading
+from contextlib import contextmanager
+
+DEFAULT_POOL_SIZE = 1
+DEFAULT_MAX_USES = 50
+DEFAULT_PROFILE_ROOT = "browser_profiles"
+
+LINUX_USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/133.0.0.0 Safari/537.36"
+WINDOWS_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/133.0.0.0 Safari/537.36"
+
+
+def find_chromedriver():
+    """Return the chromedriver path for this platform, or None to let Selenium locate it."""
+    if platform.system() == "Windows":
+        candidates = ["C:\\chromedriver.exe", ".\\chromedriver.exe"]
+    else:
+        candidates = ["/usr/bin/chromedriver", "/usr/local/bin/chromedriver"]
+    for path in candidates:
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def new_chrome(profile_dir=None, headless=True, user_agent=None, block_images=False, page_load_timeout=30):
+    """Start a Chrome WebDriver with the options the scrapers share."""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+
+    chrome_options = Options()
+    if headless:
+        chrome_options.add_argument("--headless=new")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--disable-notifications")
+    chrome_options.add_argument("--disable-infobars")
+    chrome_options.add_argument("--window-size=1366,768")
+    if profile_dir:
+        os.makedirs(profile_dir, exist_ok=True)
+        chrome_options.add_argument(f"--user-data-dir={os.path.abspath(profile_dir)}")
+    if block_images:
+        chrome_options.add_experimental_option("prefs", {
+            "profile.default_content_setting_values.images": 2,  # Don't load images
+        })
+    if user_agent is None:
+        user_agent = WINDOWS_USER_AGENT if platform.system() == "Windows" else LINUX_USER_AGENT
+    chrome_options.add_argument(f"--user-agent={user_agent}")
+
+    chromedriver_path = find_chromedriver()
+    if chromedriver_path:
+        driver = webdriver.Chrome(service=Service(chromedriver_path), options=chrome_options)
+    else:
+        driver = webdriver.Chrome(options=chrome_options)
+    driver.set_page_load_timeout(page_load_timeout)
+    return driver
+
+
+class PooledBrowser:
+    """A pooled driver plus its bookkeeping."""
+
+    def __init__(self, driver, slot):
+        self.driver = driver
+        self.slot = slot
+        self.uses = 0
+        self.state = {}  # Per-session scraper state, e.g. whether X login has been done
+
+
+class BrowserPool:
+    """Hand out warm WebDriver sessions, recycling them after max_uses or on failure."""
+
+    def __init__(self, name, factory=None, size=DEFAULT_POOL_SIZE, max_uses=DEFAULT_MAX_USES,
+                 profile_root=DEFAULT_PROFILE_ROOT):
+        self.name = name
+        self.factory = factory or (lambda profile_dir: new_chrome(profile_dir=profile_dir))
+        self.size = size
+        self.max_uses = max_uses
+        self.profile_root = profile_root
+        self.condition = threading.Condition()
+        self.idle = []  # PooledBrowser objects ready for use
+        self.free_slots = list(range(size))  # Slots with no live driver
+        self.closed = False
+
+    def _profile_dir(self, slot):
+        return os.path.join(self.profile_root, f"{self.name}-{slot}")
+
+    def _start(self, slot):
+        print(f"[DEBUG] Starting {self.name} browser session {slot}")
+        return PooledBrowser(self.factory(self._profile_dir(slot)), slot)
+
+    def _healthy(self, browser):
+        try:
+            browser.driver.current_url  # Raises if Chrome or chromedriver has died
+            return True
+        except Exception:
+            return False
+
+    def _quit(self, browser):
+        """Quit a driver, ignoring errors from an already dead browser."""
+        try:
+            browser.driver.quit()
+        except Exception as e:
+            print(f"[DEBUG] Error quitting {self.name} browser: {e}")
+
+    def _discard(self, browser):
+        """Quit a driver and give its slot back. Never raises."""
+        self._quit(browser)
+        with self.condition:
+            self.free_slots.append(browser.slot)
+            self.condition.notify()
+
+    def acquire(self, timeout=None):
+        """Take an idle session, starting one if a slot is free; waits while all are busy."""
+        with self.condition:
+            while True:
+                if self.closed:
+                    raise RuntimeError(f"{self.name} browser pool is closed")
+                if self.idle:
+                    browser = self.idle.pop()
+                    break
+                if self.free_slots:
+                    slot = self.free_slots.pop()
+                    browser = None
+                    break
+                if not self.condition.wait(timeout):
+                    raise TimeoutError(f"No {self.name} browser available")
+
+        if browser is not None and not self._healthy(browser):
+            print(f"[DEBUG] {self.name} browser session {browser.slot} is dead, restarting it")
+            slot = browser.slot
+            self._quit(browser)  # Keep the slot; it is restarted below
+            browser = None
+        if browser is None:
+            try:
+                browser = self._start(slot)
+            except Exception:
+                with self.condition:
+                    self.free_slots.append(slot)
+                    self.condition.notify()
+                raise
+        return browser
+
+    def release(self, browser, failed=False):
+        """Return a session to the pool, or retire it if it failed or is worn out."""
+        browser.uses += 1
+        if failed or browser.uses >= self.max_uses or self.closed:
+            reason = "failed" if failed else "closing" if self.closed else f"{browser.uses} uses"
+            print(f"[DEBUG] Retiring {self.name} browser session {browser.slot} ({reason})")
+            self._discard(browser)
+            return
+        with self.condition:
+            self.idle.append(browser)
+            self.condition.notify()
+
+    @contextmanager
+    def session(self, timeout=None):
+        """Context manager yielding a PooledBrowser; WebDriver errors retire the session."""
+        from selenium.common.exceptions import WebDriverException
+
+        browser = self.acquire(timeout)
+        failed = False
+        try:
+            yield browser
+        except WebDriverException:
+            failed = True
+            raise
+        finally:
+            self.release(browser, failed=failed)
+
+    def warm(self, prepare=None):
+        """
+        Start a session ahead of the first request, running prepare(browser)
+        on it (e.g. a login). Blocks while Chrome starts; call from a worker.
+        """
+        try:
+            browser = self.acquire(timeout=0)
+        except Exception as e:
+            print(f"[DEBUG] Could not warm {self.name} browser: {e}")
+            return
+        try:
+            if prepare is not None:
+                prepare(browser)
+        except Exception as e:
+            print(f"[DEBUG] Error preparing {self.name} browser: {e}")
+            self._discard(browser)
+            return
+        with self.condition:
+            self.idle.append(browser)  # Warming does not count as a use
+            self.condition.notify()
+
+    def close(self):
+        """Quit every idle session; busy ones are quit when released."""
+        with self.condition:
+            self.closed = True
+            idle, self.idle = self.idle, []
+            self.condition.notify_all()
+        for browser in idle:
+            self._discard(browser)
@@ -0,0 +1,76 @@
+"""
+Authoritative in-memory model of who is in the chatroom.
+
+The banner parser and the greeting handler keep ChatMembers up to date as
+lines arrive, so replies read membership straight from memory.  DynamoDB's
+ChatRoomMembers item is only a mirror: it is written (through the
+write-behind queue) when the member set actually changes, and never read on
+the reply path.  The comma-separated name list used in the ChatGPT system
+prompt is cached and rebuilt only after a change.
+"""
+import threading
+
+from line_classifier import base_username
+
+MEMBERS_TABLE = 'ChatRoomMembers'
+MEMBERS_ROOM = 'default'
+
+
+class ChatMembers:
+    """Thread-safe set of current chatroom members with change-only mirroring."""
+
+    def __init__(self, writer=None, table_name=MEMBERS_TABLE, room=MEMBERS_ROOM):
+        self.writer = writer
+        self.table_name = table_name
+        self.room = room
+        self.lock = threading.Lock()
+        self.members = set()
+        self._prompt_names = ""
+
+    def __iter__(self):
+        return iter(self.snapshot())
+
+    def __len__(self):
+        return len(self.members)
+
+    def __contains__(self, username):
+        return username in self.members
+
+    def snapshot(self):
+        """Return a copy of the current member set."""
+        with self.lock:
+            return set(self.members)
+
+    def replace(self, usernames):
+        """Set the full member list (from a banner). Returns the set of new arrivals."""
+        new_members = set(usernames)
+        with self.lock:
+            if new_members == self.members:
+                return set()
+            arrivals = new_members - self.members
+            self.members = new_members
+            self._changed()
+        return arrivals
+
+    def add(self, username):
+        """Add one member. Returns True if they were not already present."""
+        with self.lock:
+            if username in self.members:
+                return False
+            self.members.add(username)
+            self._changed()
+        return True
+
+    def prompt_names(self):
+        """Comma-separated base usernames for the ChatGPT system prompt."""
+        return self._prompt_names
+
+    def _changed(self):
+        """Rebuild the cached prompt string and mirror the new set. Caller holds the lock."""
+        self._prompt_names = ", ".join(sorted(base_username(member) for member in self.members))
+        print(f"[DEBUG] Chat members changed: {self._prompt_names}")
+        if self.writer is not None:
+            try:
+                self.writer.put(self.table_name, {'room': self.room, 'members': sorted(self.members)})
+            except Exception as e:
+                print(f"Error queueing chat members for DynamoDB: {e}")
@@ -0,0 +1,128 @@
+"""
+Bounded worker pool for trigger handlers.
+
+Line ingestion hands each command to CommandDispatcher.submit() and moves on;
+the handler (ChatGPT, weather, scrapers, ...) runs on a worker thread.  Jobs
+for the same user run one at a time in FIFO order, while different users run
+concurrently up to max_workers.  When too much work is already pending,
+submit() refuses the job instead of blocking the caller.
+
+Coroutine functions are also accepted: when loop_getter returns a running
+event loop they are scheduled straight onto it (no worker thread is held while
+they await I/O), otherwise they are run to completion on a worker.
+"""
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_MAX_PENDING = 32
+DEFAULT_MAX_PENDING_PER_USER = 4
+
+
+class CommandDispatcher:
+    """Run handlers on a thread pool, keeping each user's commands in order."""
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, max_pending=DEFAULT_MAX_PENDING,
+                 max_pending_per_user=DEFAULT_MAX_PENDING_PER_USER, loop_getter=None):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="command")
+        self.max_pending = max_pending
+        self.max_pending_per_user = max_pending_per_user
+        self.lock = threading.Lock()
+        self.user_queues = {}  # Maps user key -> deque of jobs (head is the running job)
+        self.pending = 0
+        self.closed = False
+        self.loop_getter = loop_getter
+
+    def submit(self, key, func, *args, **kwargs):
+        """
+        Queue func(*args, **kwargs) behind any earlier jobs for the same key.
+        Returns False (without queueing) if the dispatcher is full.
+        """
+        with self.lock:
+            if self.closed or self.pending >= self.max_pending:
+                return False
+            user_queue = self.user_queues.setdefault(key, deque())
+            if len(user_queue) >= self.max_pending_per_user:
+                return False
+            user_queue.append((func, args, kwargs))
+            self.pending += 1
+            start_now = len(user_queue) == 1
+
+        if start_now:
+            self._start(key)
+        return True
+
+    def _running_loop(self):
+        """Return the event loop coroutine jobs should run on, if it is running."""
+        loop = self.loop_getter() if self.loop_getter else None
+        if loop is not None and loop.is_running() and not loop.is_closed():
+            return loop
+        return None
+
+    def _start(self, key):
+        """Start the job at the head of a user's queue on the loop or a worker."""
+        with self.lock:
+            func, args, kwargs = self.user_queues[key][0]
+
+        loop = self._running_loop() if asyncio.iscoroutinefunction(func) else None
+        if loop is None:
+            self.executor.submit(self._run_next, key)
+            return
+
+        try:
+            future = asyncio.run_coroutine_threadsafe(func(*args, **kwargs), loop)
+        except RuntimeError:
+            # Loop closed between the check and the call; fall back to a worker
+            self.executor.submit(self._run_next, key)
+            return
+        future.add_done_callback(lambda f: self._finish_async(key, f))
+
+    def _finish_async(self, key, future):
+        """Done-callback for coroutine jobs scheduled on the event loop."""
+        if not future.cancelled() and future.exception() is not None:
+            print(f"Error in command handler for {key}: {future.exception()}")
+        self._job_done(key)
+
+    def _run_next(self, key):
+        """Run the job at the head of a user's queue on this worker thread."""
+        with self.lock:
+            func, args, kwargs = self.user_queues[key][0]
+
+        try:
+            result = func(*args, **kwargs)
+            if asyncio.iscoroutine(result):
+                asyncio.run(result)
+        except Exception as e:
+            print(f"Error in command handler for {key}: {e}")
+
+        self._job_done(key)
+
+    def _job_done(self, key):
+        """Pop the finished job and schedule the user's next one, if any."""
+        with self.lock:
+            user_queue = self.user_queues[key]
+            user_queue.popleft()
+            self.pending -= 1
+            has_more = bool(user_queue)
+            if not has_more:
+                del self.user_queues[key]
+
+        # Resubmit rather than loop so a busy user can't hog a worker
+        if has_more and not self.closed:
+            try:
+                self._start(key)
+            except RuntimeError:
+                pass  # Executor shut down while this job was running
+
+    def pending_count(self):
+        """Return the number of queued and running jobs."""
+        with self.lock:
+            return self.pending
+
+    def shutdown(self, wait=False):
+        """Stop accepting work and release the worker threads."""
+        with self.lock:
+            self.closed = True
+        self.executor.shutdown(wait=wait, cancel_futures=True)
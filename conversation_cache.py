@@ -0,0 +1,70 @@
+"""
+Per-user cache of recent ChatGPT turns in front of DynamoDB.
+
+get_chatgpt_response only ever sends the last few turns of a user's history,
+so ConversationCache keeps just those turns per user in an LRU with a TTL.
+save_conversation writes through to it, so once a user's history has been
+loaded, replying to them needs no DynamoDB read at all.
+"""
+import threading
+import time
+from collections import OrderedDict, deque
+
+DEFAULT_MAX_USERS = 256
+DEFAULT_MAX_TURNS = 5
+DEFAULT_TTL = 30 * 60  # Seconds before a cached history is re-read from DynamoDB
+
+
+class ConversationCache:
+    """LRU + TTL map of username -> last max_turns {'message', 'response'} dicts."""
+
+    def __init__(self, max_users=DEFAULT_MAX_USERS, max_turns=DEFAULT_MAX_TURNS, ttl=DEFAULT_TTL):
+        self.max_users = max_users
+        self.max_turns = max_turns
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # username -> (expires_at, deque of turns)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, username):
+        """Return a copy of the cached turns (oldest first), or None on a miss."""
+        with self.lock:
+            entry = self.entries.get(username)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self.entries[username]
+                self.misses += 1
+                return None
+            self.entries.move_to_end(username)
+            self.hits += 1
+            return list(entry[1])
+
+    def put(self, username, turns):
+        """Cache the tail of a freshly loaded history."""
+        with self.lock:
+            self.entries[username] = (time.monotonic() + self.ttl, deque(turns, maxlen=self.max_turns))
+            self.entries.move_to_end(username)
+            while len(self.entries) > self.max_users:
+                self.entries.popitem(last=False)
+
+    def append(self, username, message, response):
+        """
+        Write-through for a new turn.  Only users already cached are updated;
+        anyone else is loaded from DynamoDB (new turn included) on next use.
+        """
+        with self.lock:
+            entry = self.entries.get(username)
+            if entry is None:
+                return
+            entry[1].append({'message': message, 'response': response})
+            self.entries[username] = (time.monotonic() + self.ttl, entry[1])
+            self.entries.move_to_end(username)
+
+    def invalidate(self, username=None):
+        """Drop one user's cached history, or everyone's."""
+        with self.lock:
+            if username is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(username, None)
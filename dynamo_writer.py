@@ -0,0 +1,109 @@
+"""
+Write-behind queue for DynamoDB puts.
+
+Callers hand items to BatchWriteQueue.put() and return immediately; a
+background thread groups them into BatchWriteItem calls (up to 25 items per
+call, across tables) and retries any UnprocessedItems with exponential
+backoff.  This keeps history and membership writes off the reply path, and a
+multi-chunk answer costs one round trip instead of one per chunk.
+"""
+import queue
+import threading
+import time
+
+MAX_BATCH_SIZE = 25  # DynamoDB's BatchWriteItem limit
+DEFAULT_FLUSH_INTERVAL = 0.5
+DEFAULT_MAX_RETRIES = 5
+
+_STOP = object()
+
+
+class BatchWriteQueue:
+    """Background BatchWriteItem writer for one boto3 DynamoDB resource."""
+
+    def __init__(self, dynamodb, key_schema=None, flush_interval=DEFAULT_FLUSH_INTERVAL,
+                 max_retries=DEFAULT_MAX_RETRIES):
+        self.dynamodb = dynamodb
+        self.key_schema = key_schema or {}  # table name -> key attribute names, for de-duplication
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.queue = queue.Queue()
+        self.closed = False
+        self.thread = threading.Thread(target=self._run, daemon=True, name="dynamo-writer")
+        self.thread.start()
+
+    def put(self, table_name, item):
+        """Queue an item to be written to table_name."""
+        if self.closed:
+            raise RuntimeError("BatchWriteQueue is closed")
+        self.queue.put((table_name, item))
+
+    def _run(self):
+        """Collect up to a full batch (or whatever arrives within the interval) and write it."""
+        stopping = False
+        while not stopping:
+            entry = self.queue.get()
+            if entry is _STOP:
+                break
+            batch = [entry]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < MAX_BATCH_SIZE:
+                try:
+                    entry = self.queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if entry is _STOP:
+                    stopping = True
+                    break
+                batch.append(entry)
+            self._write(batch)
+
+        # Drain anything queued behind the stop marker
+        leftovers = []
+        while True:
+            try:
+                entry = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is not _STOP:
+                leftovers.append(entry)
+        for start in range(0, len(leftovers), MAX_BATCH_SIZE):
+            self._write(leftovers[start:start + MAX_BATCH_SIZE])
+
+    def _request_items(self, batch):
+        """Build RequestItems, keeping only the last write per key (DynamoDB rejects duplicates)."""
+        by_table = {}
+        for table_name, item in batch:
+            key_names = self.key_schema.get(table_name)
+            key = tuple(item.get(name) for name in key_names) if key_names else id(item)
+            by_table.setdefault(table_name, {})[key] = item
+        return {
+            table_name: [{'PutRequest': {'Item': item}} for item in items.values()]
+            for table_name, items in by_table.items()
+        }
+
+    def _write(self, batch):
+        """Send one BatchWriteItem, retrying unprocessed items with backoff."""
+        request_items = self._request_items(batch)
+        delay = 0.1
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self.dynamodb.batch_write_item(RequestItems=request_items)
+            except Exception as e:
+                print(f"[ERROR] DynamoDB batch write failed (attempt {attempt + 1}): {e}")
+                response = {'UnprocessedItems': request_items}
+            request_items = response.get('UnprocessedItems') or {}
+            if not request_items:
+                return
+            time.sleep(delay)
+            delay = min(delay * 2, 5.0)
+        dropped = sum(len(requests) for requests in request_items.values())
+        print(f"[ERROR] Dropping {dropped} DynamoDB writes after {self.max_retries} retries")
+
+    def close(self, timeout=10):
+        """Stop accepting items and wait for queued writes to be sent."""
+        if self.closed:
+            return
+        self.closed = True
+        self.queue.put(_STOP)
+        self.thread.join(timeout=timeout)
@@ -0,0 +1,99 @@
+"""
+Shared, connection-pooled async HTTP client for command handlers.
+
+One httpx.AsyncClient is kept per bot and reused by every HTTP-backed command,
+so repeated requests to the same API host reuse a warm keep-alive connection
+(HTTP/2 when the h2 package is installed) instead of paying a fresh TCP+TLS
+handshake each time.  Every request gets a default timeout.
+
+The pool is shared by the event loop and by worker threads that run their
+own short-lived loops (the !trump poller while the bot is disconnected), so
+the client is created and swapped under a lock.  A client whose loop has
+closed is replaced and closed, and aclose() only closes the client when it
+belongs to the calling loop.
+"""
+import asyncio
+import threading
+
+import httpx
+
+try:
+    import h2  # noqa: F401 - only needed so httpx can negotiate HTTP/2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+DEFAULT_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+DEFAULT_LIMITS = httpx.Limits(max_connections=50, max_keepalive_connections=20, keepalive_expiry=60.0)
+
+# Same exception base class the handlers used to catch from requests
+HTTPError = httpx.HTTPError
+
+
+class AsyncHttpPool:
+    """Lazily created, loop-bound pooled HTTP client."""
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, limits=DEFAULT_LIMITS):
+        self.timeout = timeout
+        self.limits = limits
+        self.client = None
+        self.client_loop = None
+        self.lock = threading.Lock()  # Guards client/client_loop across threads
+
+    def _new_client(self):
+        return httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            timeout=self.timeout,
+            limits=self.limits,
+            follow_redirects=True
+        )
+
+    async def request(self, method, url, **kwargs):
+        """Send a request through the shared client and return the httpx.Response."""
+        loop = asyncio.get_running_loop()
+        stale = None
+        with self.lock:
+            if self.client is None or self.client.is_closed or self.client_loop.is_closed():
+                # First use, or the loop that owned the old pool is gone (reconnect)
+                stale = self.client
+                self.client = self._new_client()
+                self.client_loop = loop
+            client, client_loop = self.client, self.client_loop
+        if stale is not None:
+            await self._discard(stale)
+
+        if loop is client_loop:
+            return await client.request(method, url, **kwargs)
+
+        # Connections belong to the loop that opened them; a caller on another
+        # loop (e.g. a worker fallback while disconnected) gets a one-off client.
+        async with self._new_client() as client:
+            return await client.request(method, url, **kwargs)
+
+    async def get(self, url, **kwargs):
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url, **kwargs):
+        return await self.request("POST", url, **kwargs)
+
+    async def aclose(self):
+        """Close the shared client and its pooled connections, if it belongs to the running loop."""
+        with self.lock:
+            if self.client_loop is not asyncio.get_running_loop():
+                # Another loop owns it; its connections cannot be closed from here
+                return
+            client = self.client
+            self.client = None
+            self.client_loop = None
+        if not client.is_closed:
+            await client.aclose()
+
+    @staticmethod
+    async def _discard(client):
+        """Close a replaced client; its loop may already be closed, so errors are ignored."""
+        if client.is_closed:
+            return
+        try:
+            await client.aclose()
+        except Exception:
+            pass
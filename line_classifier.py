@@ -0,0 +1,130 @@
+"""
+Single-pass classifier for lines coming off the BBS teleconference.
+
+Every line the bot receives goes through classify_line() exactly once.  Cheap
+prefix/substring checks pick the one line family that can possibly match, and
+only that family's precompiled regex is run, so the cost per line stays flat
+no matter how many triggers the bot grows.
+"""
+import re
+from collections import namedtuple
+
+# Event kinds returned by classify_line()
+JOIN = 'join'
+WHISPER = 'whisper'
+DIRECT = 'direct'
+PAGE = 'page'
+PUBLIC = 'public'
+THIRD_PARTY = 'third_party'
+BANNER = 'banner'
+LOGIN_PROMPT = 'login_prompt'
+CLEANUP = 'cleanup'
+
+# Chat kinds that count as a user speaking
+CHAT_KINDS = (PUBLIC, WHISPER, DIRECT, PAGE)
+
+# Login prompt names (stored in LineEvent.content for LOGIN_PROMPT events)
+PROMPT_USERNAME = 'username'
+PROMPT_PASSWORD = 'password'
+PROMPT_WELCOME_BACK = 'welcome_back'
+PROMPT_MORE = 'more'
+
+LineEvent = namedtuple('LineEvent', ['kind', 'username', 'content', 'channel', 'target', 'line'],
+                       defaults=(None, None, None, None, ''))
+
+ANSI_ESCAPE_RE = re.compile(r'\x1b\[(.*?)m')
+
+# "From bob: hi", "From bob (whispered): hi", "From bob (to you): hi"
+_FROM_RE = re.compile(r'From (?P<user>.+?)(?: \((?P<tag>whispered|to you)\))?: (?P<content>.+)')
+
+# ":[bob]: hi", ":[bob] (whispered): hi", ":[bob] (to you): hi", ":[bob] (to alice): hi"
+_BRACKET_RE = re.compile(
+    r':\[(?P<user>.+?)\](?: \((?P<tag>whispered|to you|to (?P<target>.+?))\))?: (?P<content>.+)'
+)
+
+# "bob is paging you from Teleconference: hi" (older boards say "via")
+_PAGE_RE = re.compile(r'(?P<user>.+?) is paging you (?:from|via) (?P<channel>.+?): (?P<content>.+)')
+
+_JOINED_RE = re.compile(r'(?P<user>.+?) just joined this channel!')
+_ENTERS_RE = re.compile(r'-> (?P<user>.+?) enters\.')
+
+# Member list inside a (possibly wrapped) channel banner
+BANNER_MEMBERS_RE = re.compile(r'Topic:.*?\)\.\s*(.*?)\s*(?:are|is)\s+here with you', re.DOTALL)
+
+_TAG_KINDS = {
+    None: PUBLIC,
+    'whispered': WHISPER,
+    'to you': DIRECT,
+}
+
+
+def strip_ansi(line):
+    """Remove ANSI color codes from a line."""
+    if '\x1b' not in line:
+        return line
+    return ANSI_ESCAPE_RE.sub('', line)
+
+
+def _chat_event(match, line):
+    """Build a chat event from a _FROM_RE or _BRACKET_RE match."""
+    tag = match.group('tag')
+    target = match.groupdict().get('target')
+    kind = THIRD_PARTY if target else _TAG_KINDS[tag]
+    return LineEvent(kind, match.group('user'), match.group('content').strip(), None, target, line)
+
+
+def _classify_prompt(lowered, line):
+    """Return a LOGIN_PROMPT/CLEANUP event for system lines, or None."""
+    if 'please finish up and log off.' in lowered:
+        return LineEvent(CLEANUP, line=line)
+    if 'otherwise type "new":' in lowered or 'type it in and press enter' in lowered:
+        return LineEvent(LOGIN_PROMPT, content=PROMPT_USERNAME, line=line)
+    if 'enter your password: ' in lowered:
+        return LineEvent(LOGIN_PROMPT, content=PROMPT_PASSWORD, line=line)
+    if 'greetings, ' in lowered and 'glad to see you back again.' in lowered:
+        return LineEvent(LOGIN_PROMPT, content=PROMPT_WELCOME_BACK, line=line)
+    if '(n)onstop, (q)uit, or (c)ontinue?' in lowered:
+        return LineEvent(LOGIN_PROMPT, content=PROMPT_MORE, line=line)
+    return None
+
+
+def classify_line(line):
+    """
+    Classify one ANSI-free BBS line and return a LineEvent, or None for
+    lines the bot does not care about.
+    """
+    if not line:
+        return None
+
+    if line.startswith('From '):
+        match = _FROM_RE.match(line)
+        if match:
+            return _chat_event(match, line)
+    elif line.startswith(':['):
+        match = _BRACKET_RE.match(line)
+        if match:
+            return _chat_event(match, line)
+    elif line.startswith('Topic:'):
+        return LineEvent(BANNER, content=line, line=line)
+
+    if ' is paging you ' in line:
+        match = _PAGE_RE.match(line)
+        if match:
+            return LineEvent(PAGE, match.group('user'), match.group('content').strip(),
+                             match.group('channel'), None, line)
+
+    if ' just joined this channel!' in line:
+        match = _JOINED_RE.search(line)
+        if match:
+            return LineEvent(JOIN, match.group('user').strip(), line=line)
+    elif '-> ' in line and ' enters.' in line:
+        match = _ENTERS_RE.search(line)
+        if match:
+            return LineEvent(JOIN, match.group('user').strip(), line=line)
+
+    return _classify_prompt(line.lower(), line)
+
+
+def base_username(username):
+    """Strip the @domain part of a username."""
+    return username.split('@')[0]
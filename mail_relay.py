@@ -0,0 +1,194 @@
+"""
+Push-based relay of incoming "BBS" emails into the chatroom.
+
+The bot used to open a fresh IMAP4_SSL connection every 30-60 s, log in,
+select, search, fetch and log out again, paying a TLS handshake and a login
+per check (and, in the CLI, doing all of it synchronously on the event loop
+that reads the BBS).  MailRelay keeps one authenticated connection on a
+daemon thread and waits in IMAP IDLE, so the server tells it as soon as a
+message arrives.  The IDLE is renewed every idle_timeout seconds (servers
+drop idle connections after ~30 minutes), servers without IDLE are polled
+with NOOP on the same connection, and a lost connection is re-established
+with exponential backoff.
+
+Messages are fetched with BODY.PEEK[] and only flagged \\Seen once the
+deliver(sender, body) callback returns True, so mail that arrives while the
+bot is offline is relayed after it reconnects instead of being lost.
+"""
+import email
+import imaplib
+import select
+import threading
+import time
+from email.utils import parseaddr
+
+DEFAULT_HOST = "imap.gmail.com"
+DEFAULT_SEARCH = '(UNSEEN SUBJECT "BBS")'
+IDLE_TIMEOUT = 300  # Renew IDLE (and re-check the inbox) this often
+NOOP_INTERVAL = 30  # Poll interval on servers without IDLE
+RETRY_DELAY = 30  # Wait before retrying mail that could not be delivered
+MIN_BACKOFF = 5
+MAX_BACKOFF = 300
+MAX_BODY_LENGTH = 230
+
+
+def message_text(msg, limit=MAX_BODY_LENGTH):
+    """Plain-text body of an email on one line, truncated to limit characters."""
+    part = next((p for p in msg.walk() if p.get_content_type() == "text/plain"), None) \
+        if msg.is_multipart() else msg
+    payload = part.get_payload(decode=True) if part is not None else None
+    if not payload:
+        return ""
+    try:
+        body = payload.decode('utf-8')
+    except UnicodeDecodeError:
+        body = payload.decode('latin-1')
+    body = ' '.join(body.split())
+    if len(body) > limit:
+        body = body[:limit - 3] + "..."
+    return body
+
+
+class MailRelay:
+    """Hold one IMAP connection in IDLE and hand each matching message to deliver()."""
+
+    def __init__(self, credentials_getter, deliver, host=DEFAULT_HOST, search=DEFAULT_SEARCH,
+                 idle_timeout=IDLE_TIMEOUT):
+        self.credentials_getter = credentials_getter  # Returns {'sender_email': ..., 'sender_password': ...}
+        self.deliver = deliver  # deliver(sender, body) -> True once posted, False to retry later
+        self.host = host
+        self.search = search
+        self.idle_timeout = idle_timeout
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.lock = threading.Lock()
+        self.idle_tags = 0
+
+    def start(self):
+        """Start the relay thread; later calls do nothing while it is running."""
+        with self.lock:
+            if self.thread is not None and self.thread.is_alive():
+                return
+            self.stop_event.clear()
+            self.thread = threading.Thread(target=self._run, daemon=True, name="mail-relay")
+            self.thread.start()
+
+    def stop(self):
+        """Ask the relay thread to leave IDLE and log out (within a few seconds)."""
+        self.stop_event.set()
+
+    def _run(self):
+        backoff = MIN_BACKOFF
+        while not self.stop_event.is_set():
+            credentials = self.credentials_getter()
+            address = credentials.get("sender_email")
+            password = credentials.get("sender_password")
+            if not address or not password:
+                print("Email credentials are missing. Cannot relay incoming mail.")
+                self.stop_event.wait(60)
+                continue
+
+            mail = None
+            try:
+                mail = imaplib.IMAP4_SSL(self.host)
+                mail.login(address, password)
+                mail.select('inbox')
+                print(f"[DEBUG] Mail relay connected as {address}")
+                backoff = MIN_BACKOFF
+                self._serve(mail)
+            except (imaplib.IMAP4.error, OSError) as e:
+                # IMAP4.abort (connection dropped) is a subclass of IMAP4.error
+                print(f"[ERROR] Mail relay connection failed: {e}; reconnecting in {backoff}s")
+            except Exception as e:
+                print(f"[ERROR] Mail relay error: {e}; reconnecting in {backoff}s")
+            finally:
+                self._logout(mail)
+            if not self.stop_event.is_set():
+                self.stop_event.wait(backoff)
+                backoff = min(backoff * 2, MAX_BACKOFF)
+
+    def _serve(self, mail):
+        """Relay what is waiting, then sleep until the server reports new mail."""
+        supports_idle = 'IDLE' in mail.capabilities
+        if not supports_idle:
+            print("[DEBUG] IMAP server has no IDLE, polling with NOOP")
+        while not self.stop_event.is_set():
+            undelivered = self._relay_unseen(mail)
+            timeout = RETRY_DELAY if undelivered else self.idle_timeout
+            if supports_idle:
+                self._idle(mail, timeout)
+            else:
+                self.stop_event.wait(min(timeout, NOOP_INTERVAL))
+                mail.noop()
+
+    def _relay_unseen(self, mail):
+        """Deliver every matching unseen message. Returns True if some could not be delivered."""
+        status, messages = mail.search(None, self.search)
+        if status != 'OK':
+            raise imaplib.IMAP4.error(f"Search failed: {status}")
+        for num in messages[0].split():
+            status, data = mail.fetch(num, '(BODY.PEEK[])')
+            raw = next((item[1] for item in data if isinstance(item, tuple)), None) if status == 'OK' else None
+            if raw is None:
+                print(f"Error fetching message {num}: {status}")
+                continue
+            msg = email.message_from_bytes(raw)
+            sender = parseaddr(msg['From'])[1]
+            try:
+                delivered = self.deliver(sender, message_text(msg))
+            except Exception as e:
+                print(f"[ERROR] Relaying email from {sender} failed: {e}")
+                delivered = False
+            if not delivered:
+                print("Not connected to the BBS, will relay incoming mail later")
+                return True
+            mail.store(num, '+FLAGS', '\\Seen')
+        return False
+
+    def _idle(self, mail, timeout):
+        """
+        Wait in IDLE until the mailbox changes, timeout passes or stop() is called.
+        imaplib has no IDLE command before Python 3.14, so it is spoken directly.
+        """
+        self.idle_tags += 1
+        tag = f"RLY{self.idle_tags}".encode('ascii')
+        mail.send(tag + b" IDLE\r\n")
+        reply = mail.readline()
+        if not reply.startswith(b"+"):
+            raise imaplib.IMAP4.error(f"IDLE refused: {reply.strip()!r}")
+
+        # Bytes TLS has already decrypted do not show up in select()
+        pending = getattr(mail.sock, 'pending', lambda: 0)
+        # A deadline, so untagged keep-alives ("* OK Still here") cannot stretch the wait
+        deadline = time.monotonic() + timeout
+        while not self.stop_event.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            # Short slices so stop() is noticed
+            if pending() or select.select([mail.sock], [], [], min(5, remaining))[0]:
+                line = mail.readline()
+                if not line:
+                    raise imaplib.IMAP4.abort("Connection closed during IDLE")
+                if line.startswith(b"* BYE"):
+                    raise imaplib.IMAP4.abort(f"Server ended IDLE: {line.strip()!r}")
+                if line.rstrip().endswith((b"EXISTS", b"RECENT")):
+                    break
+
+        mail.send(b"DONE\r\n")
+        while True:
+            line = mail.readline()
+            if not line:
+                raise imaplib.IMAP4.abort("Connection closed while leaving IDLE")
+            if line.startswith(tag + b" "):
+                if not line[len(tag) + 1:].startswith(b"OK"):
+                    raise imaplib.IMAP4.error(f"IDLE failed: {line.strip()!r}")
+                return
+
+    def _logout(self, mail):
+        if mail is None:
+            return
+        try:
+            mail.logout()
+        except Exception:
+            pass
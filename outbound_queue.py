@@ -0,0 +1,215 @@
+"""
+Paced, prioritized outbound path to the BBS.
+
+Each connection gets one OutboundQueue whose run() coroutine is the only code
+that writes to the telnet writer.  Any thread can put() a line and return at
+once; lines are paced by a token bucket so bursts of chunks stay under the
+board's flood limits without anyone sleeping on the caller's thread.  A
+multi-chunk message is handed over with put_many() in one cross-thread call,
+and whatever lines fit in the current pacing window go out as a single
+write with a single drain.
+
+Lines are queued on one of three lanes, FIFO within each:
+
+- LANE_CONTROL: keystrokes the session depends on (keep-alive ENTER, login,
+  channel joins).  Always sent next, and never made to wait for a token, so a
+  long public dump cannot hold up a login or rejoin.
+- LANE_INTERACTIVE: replies to a user (whispers, pages, short answers).
+- LANE_BULK: long public output (help listings, email relays, !doc text).
+  At least one bulk line goes out for every BULK_SHARE interactive lines, so
+  a busy room delays bulk output but never starves it.
+
+Choosing the lane by length alone would let a short reply overtake a long
+one still queued for the same person, so messages queued without an
+explicit lane carry a recipient key (a username, or ROOM for public output).
+While a recipient has lines waiting, further messages to them join the same
+lane, which keeps each recipient's replies in the order they were queued.
+"""
+import asyncio
+import time
+from collections import deque
+
+DEFAULT_RATE = 2.0  # Lines per second once the burst allowance is spent
+DEFAULT_BURST = 4  # Lines that may go out back to back after a quiet spell
+DRAIN_TIMEOUT = 3.0
+
+LANE_CONTROL = 0
+LANE_INTERACTIVE = 1
+LANE_BULK = 2
+BULK_SHARE = 4  # Interactive lines allowed in a row while bulk output is waiting
+BULK_CHUNKS = 3  # Messages longer than this many lines are sent as bulk
+ROOM = ""  # Recipient key for public output
+
+
+def lane_for(line_count):
+    """Lane for a reply of line_count chunks: short replies are interactive, long ones bulk."""
+    return LANE_BULK if line_count > BULK_CHUNKS else LANE_INTERACTIVE
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, holding at most `burst`."""
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, cost=1):
+        """Seconds until `cost` tokens are available (0 if they are now)."""
+        self._refill()
+        return max(0.0, (cost - self.tokens) / self.rate)
+
+    def try_spend(self, cost=1):
+        """Take tokens only if they are available right now."""
+        self._refill()
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return True
+        return False
+
+    def spend(self, cost=1):
+        """Take tokens without waiting, borrowing (up to one burst) from the future."""
+        self._refill()
+        self.tokens = max(-self.burst, self.tokens - cost)
+
+
+class OutboundQueue:
+    """Laned queue of outbound text drained by a single paced writer coroutine."""
+
+    def __init__(self, loop, writer_getter, rate=DEFAULT_RATE, burst=DEFAULT_BURST):
+        self.loop = loop
+        self.writer_getter = writer_getter
+        self.bucket = TokenBucket(rate, burst)
+        self.lanes = (deque(), deque(), deque())  # Indexed by LANE_* constant; entries are (text, key)
+        self.waiting = {}  # Recipient key -> [lane, queued line count]; touched only on the loop
+        self.interactive_streak = 0
+        self.ready = asyncio.Event()
+        self.control_arrived = asyncio.Event()  # Cuts a token wait short
+        self.idle = asyncio.Event()
+        self.idle.set()
+
+    def put(self, text, lane=LANE_INTERACTIVE):
+        """Queue text (including its line ending) on a lane. Safe from any thread."""
+        if self.loop.is_closed():
+            return
+        if self._on_loop():
+            self._push(text, lane)
+        else:
+            self.loop.call_soon_threadsafe(self._push, text, lane)
+
+    def put_many(self, texts, lane=LANE_INTERACTIVE, key=None):
+        """
+        Queue several lines on one lane with a single cross-thread handoff.
+        With lane=None the lane is picked by length (lane_for), unless the
+        recipient key still has lines queued, in which case they join those.
+        """
+        texts = list(texts)
+        if not texts or self.loop.is_closed():
+            return
+        if self._on_loop():
+            self._push_many(texts, lane, key)
+        else:
+            self.loop.call_soon_threadsafe(self._push_many, texts, lane, key)
+
+    def _on_loop(self):
+        try:
+            return asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            return False
+
+    def _push(self, text, lane):
+        self._push_many((text,), lane)
+
+    def _push_many(self, texts, lane, key=None):
+        if lane is None:
+            waiting = self.waiting.get(key)
+            lane = waiting[0] if waiting else lane_for(len(texts))
+            self.waiting[key] = [lane, (waiting[1] if waiting else 0) + len(texts)]
+        else:
+            key = None  # Explicitly laned lines are not tracked per recipient
+        self.lanes[lane].extend((text, key) for text in texts)
+        self.idle.clear()
+        self.ready.set()
+        if lane == LANE_CONTROL:
+            self.control_arrived.set()
+
+    def pending_count(self):
+        return sum(len(lane) for lane in self.lanes)
+
+    def _next_line(self):
+        """Pick the next line: control first, then interactive, with bulk's guaranteed share."""
+        control, interactive, bulk = self.lanes
+        if control:
+            lane = control
+        elif bulk and (not interactive or self.interactive_streak >= BULK_SHARE):
+            self.interactive_streak = 0
+            lane = bulk
+        else:
+            self.interactive_streak += 1
+            lane = interactive
+        text, key = lane.popleft()
+        if key is not None:
+            waiting = self.waiting[key]
+            waiting[1] -= 1
+            if not waiting[1]:
+                del self.waiting[key]
+        return text
+
+    async def run(self):
+        """Writer loop: take a token, pick the most urgent line, write and drain."""
+        while True:
+            if not self.pending_count():
+                self.idle.set()
+                self.ready.clear()
+                await self.ready.wait()
+                continue
+
+            await self._take_token()
+            # Send every line the current pacing window allows as one buffer
+            batch = [self._next_line()]
+            while self.pending_count() and len(batch) < self.bucket.burst and self.bucket.try_spend():
+                batch.append(self._next_line())
+            await self._write("".join(batch))
+
+    async def _take_token(self):
+        """Wait for a token, unless a control line is (or becomes) queued."""
+        while True:
+            delay = self.bucket.wait_time()
+            if delay <= 0 or self.lanes[LANE_CONTROL]:
+                # Control keystrokes never wait behind chat output; they borrow a token
+                self.bucket.spend()
+                return
+            self.control_arrived.clear()
+            try:
+                await asyncio.wait_for(self.control_arrived.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _write(self, text):
+        writer = self.writer_getter()
+        if writer is None:
+            print(f"Dropping outbound line, not connected: {text.strip()}")
+            return
+        try:
+            writer.write(text)
+            await asyncio.wait_for(writer.drain(), timeout=DRAIN_TIMEOUT)
+        except asyncio.TimeoutError:
+            print(f"Timeout sending message: {text.strip()}")
+        except Exception as e:
+            print(f"Error sending message: {str(e)}")
+
+    async def flush(self, timeout=2.0):
+        """Wait (up to timeout seconds) for everything queued so far to be written."""
+        if not self.pending_count():
+            return True
+        try:
+            await asyncio.wait_for(self.idle.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
@@ -0,0 +1,259 @@
+"""
+Single-pass extraction of the latest post from rendered Truth Social and X pages.
+
+Both scrapers used to build a tree of the whole page and scan it more than
+once: the Truth Social parser collected every status, walked each one's
+parents looking for the virtual list's data-index, sorted the lot, and on a
+miss rescanned every post paragraph with another parent walk.  Here a
+SoupStrainer limits parsing to the elements that can hold a post (the
+data-index rows, or <article> for X), rows are visited once in document
+order while tracking the lowest index, and the scan stops as soon as row 0
+(which is always the newest post) turns up.  Pages without data-index rows
+fall back to a second strained pass over the status containers, ranked by
+timestamp.
+
+Scrapers return their result as a ScrapedPost rather than printed lines.
+
+No Selenium is needed, so the extraction can be benchmarked offline.  Run
+this module directly to compare it with the old extractors on a corpus of
+saved pages (files or directories given as arguments, e.g. the debug dumps
+written with DEBUG_TRUMP / DEBUG_MUSK), or on generated pages if none are given.
+"""
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401 - only needed so BeautifulSoup can use the C parser
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+TRUMP_LABELS = ('Donald J. Trump', 'realDonaldTrump')
+
+_ROWS = SoupStrainer(attrs={'data-index': True})
+_STATUSES = SoupStrainer('div', class_='status')
+_ARTICLES = SoupStrainer('article')
+
+
+class ScrapedPost:
+    """The latest post from one source: its text, when it was posted, and where it came from."""
+
+    def __init__(self, source, text, posted_at=None, method=None):
+        self.source = source  # 'trump' or 'musk'
+        self.text = text
+        self.posted_at = posted_at  # Display string as shown on the site, or None if unknown
+        self.method = method  # How it was fetched, e.g. 'json' or 'browser'
+
+    def __repr__(self):
+        return f"ScrapedPost({self.source!r}, {self.text[:40]!r}, posted_at={self.posted_at!r}, method={self.method!r})"
+
+
+def _is_text_post(text):
+    """Skip empty posts and posts that are just a URL."""
+    return bool(text) and not (text.startswith('http') and ' ' not in text)
+
+
+def _truth_status(status):
+    """(post_text, post_time, timestamp) for a Trump status div, or None if it has no text post."""
+    label = status.get('aria-label', '')
+    if not any(name in label for name in TRUMP_LABELS):
+        return None
+    content_p = status.find('p', {'data-markup': 'true'})
+    if content_p is None:
+        return None
+    post_text = content_p.get_text(strip=True)
+    if not _is_text_post(post_text):
+        return None
+    time_element = status.find('time')
+    if time_element is None:
+        return None
+    return post_text, time_element.get('title'), time_element.get('datetime')
+
+
+def latest_truth_post(html):
+    """
+    Latest Trump text post on a rendered Truth Social profile.
+    Returns (post_text, post_time), or (None, None) if there is none.
+    """
+    # Pass 1: only the virtual list's rows; the lowest data-index is the newest post
+    rows = BeautifulSoup(html, HTML_PARSER, parse_only=_ROWS)
+    best_index, best = None, None
+    for row in rows.find_all(attrs={'data-index': True}, recursive=False):
+        try:
+            index = int(row['data-index'])
+        except ValueError:
+            continue
+        if best_index is not None and index >= best_index:
+            continue
+        status = row.find('div', class_='status')
+        post = _truth_status(status) if status is not None else None
+        if post is None:
+            continue
+        best_index, best = index, post
+        if index == 0:
+            break  # Nothing can be newer than the first row
+    if best is not None:
+        return best[0], best[1]
+
+    # Pass 2: no usable rows, so rank the status containers by timestamp
+    statuses = BeautifulSoup(html, HTML_PARSER, parse_only=_STATUSES)
+    posts = [post for post in map(_truth_status, statuses.find_all('div', class_='status', recursive=False))
+             if post is not None]
+    if not posts:
+        return None, None
+    post_text, post_time, _ = max(posts, key=lambda post: post[2] or "")
+    return post_text, post_time
+
+
+def latest_x_post(html):
+    """Text of the first non-pinned post on a rendered X profile, or None."""
+    return latest_x_post_details(html)[0]
+
+
+def latest_x_post_details(html):
+    """(text, posted_at) of the first non-pinned post on a rendered X profile, or (None, None)."""
+    articles = BeautifulSoup(html, HTML_PARSER, parse_only=_ARTICLES)
+    for article in articles.find_all('article', recursive=False):
+        pinned = article.find(attrs={'data-testid': 'socialContext'})
+        if pinned is not None and 'Pinned' in pinned.get_text():
+            continue
+        # tweetText is a div on current pages and a span on older ones
+        text_element = article.find(attrs={'data-testid': 'tweetText'})
+        if text_element is None:
+            continue
+        post_text = text_element.get_text(' ', strip=True)
+        if post_text:
+            time_element = article.find('time')
+            return post_text, time_element.get('datetime') if time_element is not None else None
+    return None, None
+
+
+if __name__ == "__main__":
+    import os
+    import random
+    import sys
+    import timeit
+
+    def old_truth_post(content):
+        """The previous Truth Social extractor (full parse, parent walks, rescan on a miss)."""
+        soup = BeautifulSoup(content, HTML_PARSER)
+        valid_posts = []
+        for div in soup.find_all('div', class_='status cursor-pointer focusable'):
+            if 'Donald J. Trump' not in div.get('aria-label', ''):
+                continue
+            content_p = div.find('p', {'data-markup': 'true'})
+            if not content_p:
+                continue
+            post_text = content_p.get_text(strip=True)
+            if not post_text or (post_text.startswith('http') and ' ' not in post_text):
+                continue
+            time_element = div.find('time')
+            if not time_element:
+                continue
+            index = 999
+            for parent in div.parents:
+                if parent.has_attr('data-index'):
+                    try:
+                        index = int(parent.get('data-index', '999'))
+                    except ValueError:
+                        pass
+                    break
+            valid_posts.append((post_text, time_element.get('title'), time_element.get('datetime'), index))
+        if valid_posts:
+            best = sorted(valid_posts, key=lambda x: x[3])[0]
+            return best[0], best[1]
+        valid_posts = []
+        for p in soup.find_all('p', {'data-markup': 'true'}):
+            post_text = p.get_text(strip=True)
+            if not post_text or (post_text.startswith('http') and ' ' not in post_text):
+                continue
+            status_div = None
+            for parent in p.parents:
+                if parent.name == 'div' and 'status' in parent.get('class', []):
+                    status_div = parent
+                    break
+            if not status_div:
+                continue
+            aria_label = status_div.get('aria-label', '')
+            if 'Donald J. Trump' not in aria_label and 'realDonaldTrump' not in aria_label:
+                continue
+            time_element = status_div.find('time')
+            if not time_element:
+                continue
+            valid_posts.append((post_text, time_element.get('title'), time_element.get('datetime')))
+        if valid_posts:
+            best = sorted(valid_posts, key=lambda x: x[2] if x[2] else "", reverse=True)[0]
+            return best[0], best[1]
+        return None, None
+
+    def old_x_post(html_content):
+        """The previous X extractor (full parse, nested span joins)."""
+        soup = BeautifulSoup(html_content, HTML_PARSER)
+        for article in soup.find_all('article'):
+            pinned = article.find('div', {'data-testid': 'socialContext'})
+            if pinned and 'Pinned' in pinned.text:
+                continue
+            text_div = article.find('div', {'data-testid': 'tweetText'})
+            if text_div:
+                post_text = ' '.join([span.text for span in text_div.find_all('span')])
+                if post_text.strip():
+                    return post_text.strip()
+        return None
+
+    random.seed(42)
+
+    def filler(n):
+        """Navigation, sidebars and scripts that surround the timeline on a real page."""
+        return "".join(
+            f'<div class="sidebar-item"><a href="/link{i}"><span>Suggested {i}</span></a>'
+            f'<script>var x{i} = "{"z" * 200}";</script></div>'
+            for i in range(n)
+        )
+
+    def words(k):
+        return " ".join("".join(random.choices("abcdefghij", k=random.randint(2, 9))) for _ in range(k))
+
+    def truth_page(posts):
+        rows = "".join(
+            f'<div data-index="{i}"><div class="status cursor-pointer focusable" aria-label="Donald J. Trump, post {i}">'
+            f'<div class="status__header"><time title="Jan {i % 28 + 1}, 2025" datetime="2025-01-{i % 28 + 1:02d}"></time></div>'
+            f'<p data-markup="true">{words(40)}</p><div class="status__actions">{filler(2)}</div></div></div>'
+            for i in range(posts)
+        )
+        return f"<html><head>{filler(50)}</head><body>{filler(200)}<main>{rows}</main>{filler(200)}</body></html>"
+
+    def x_page(posts):
+        articles = "".join(
+            f'<article><div data-testid="User-Name"><span>Elon Musk</span></div>'
+            + ('<div data-testid="socialContext"><span>Pinned</span></div>' if i == 0 else '')
+            + f'<div data-testid="tweetText"><span>{words(30)}</span></div>{filler(3)}</article>'
+            for i in range(posts)
+        )
+        return f"<html><head>{filler(50)}</head><body>{filler(200)}<main>{articles}</main>{filler(200)}</body></html>"
+
+    def load_corpus(paths):
+        pages = []
+        for path in paths:
+            files = [os.path.join(path, name) for name in sorted(os.listdir(path))] if os.path.isdir(path) else [path]
+            for file_path in files:
+                with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
+                    html = f.read()
+                kind = "x" if "<article" in html else "truth"
+                pages.append((os.path.basename(file_path), kind, html))
+        return pages
+
+    corpus = load_corpus(sys.argv[1:]) if sys.argv[1:] else [
+        ("truth, 20 posts", "truth", truth_page(20)),
+        ("truth, 60 posts", "truth", truth_page(60)),
+        ("x, 20 posts", "x", x_page(20)),
+        ("x, 60 posts", "x", x_page(60)),
+    ]
+    print(f"parser: {HTML_PARSER}")
+    extractors = {"truth": (latest_truth_post, old_truth_post), "x": (latest_x_post, old_x_post)}
+    for name, kind, html in corpus:
+        new_extract, old_extract = extractors[kind]
+        new_result, old_result = new_extract(html), old_extract(html)
+        runs = 10
+        new = timeit.timeit(lambda: new_extract(html), number=runs) / runs
+        old = timeit.timeit(lambda: old_extract(html), number=runs) / runs
+        same = "same result" if new_result == old_result else "DIFFERENT result"
+        print(f"{name:<24} single-pass {new * 1000:8.2f} ms   old {old * 1000:8.2f} ms   ({old / new:4.1f}x, {same})")
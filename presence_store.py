@@ -0,0 +1,311 @@
+"""
+SQLite-backed presence and public chat history for the bot.
+
+ChatStore owns one local SQLite database (WAL mode) with two indexed tables:
+presence (last seen / last spoke per user) and messages (a bounded log of
+each user's recent public lines).  Writes are buffered in memory and flushed
+in a single transaction by a background thread every flush_interval seconds,
+or sooner once flush_threshold updates have piled up.  Call close() on
+shutdown to flush what is left.
+
+PresenceStore is the dict view the bot uses for last_seen / last_spoke:
+keys are normalized once on write (domain stripped, casefolded) so lookups
+are plain dict hits, and assignments are queued on the ChatStore as
+prepared-statement upserts for just the rows that changed.  It also keeps a
+sorted name list for prefix matches and a single-deletion index for typo
+matches, so suggesting names never scans every key.
+
+The old last_seen.json, last_spoke.json and public_message_history.json files
+are imported once, the first time a database is opened next to them.
+"""
+import bisect
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from line_classifier import base_username
+
+DEFAULT_DB_PATH = "ultron.db"
+DEFAULT_FLUSH_INTERVAL = 30.0
+DEFAULT_FLUSH_THRESHOLD = 200
+DEFAULT_MESSAGES_PER_USER = 50
+
+PRESENCE_COLUMNS = ('last_seen', 'last_spoke')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS presence (
+    username   TEXT PRIMARY KEY,
+    last_seen  INTEGER,
+    last_spoke INTEGER
+);
+CREATE TABLE IF NOT EXISTS messages (
+    id       INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT NOT NULL,
+    message  TEXT NOT NULL,
+    ts       INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS messages_user_id ON messages (username, id);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# COALESCE keeps the column we are not updating when the row already exists
+_UPSERT_PRESENCE = """
+INSERT INTO presence (username, last_seen, last_spoke) VALUES (?, ?, ?)
+ON CONFLICT(username) DO UPDATE SET
+    last_seen = COALESCE(excluded.last_seen, presence.last_seen),
+    last_spoke = COALESCE(excluded.last_spoke, presence.last_spoke)
+"""
+
+_INSERT_MESSAGE = "INSERT INTO messages (username, message, ts) VALUES (?, ?, ?)"
+
+_TRIM_MESSAGES = """
+DELETE FROM messages WHERE username = ? AND id <= (
+    SELECT id FROM messages WHERE username = ? ORDER BY id DESC LIMIT 1 OFFSET ?
+)
+"""
+
+
+class ChatStore:
+    """Buffered writer and indexed reader for the bot's SQLite database."""
+
+    def __init__(self, path=DEFAULT_DB_PATH, flush_interval=DEFAULT_FLUSH_INTERVAL,
+                 flush_threshold=DEFAULT_FLUSH_THRESHOLD, messages_per_user=DEFAULT_MESSAGES_PER_USER):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self.messages_per_user = messages_per_user
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        self.db_lock = threading.Lock()  # Serializes use of the connection
+        self.lock = threading.Lock()  # Guards the pending buffers
+        self.pending_presence = {}  # username -> [last_seen, last_spoke] (None = unchanged)
+        self.pending_messages = []  # (username, message, ts)
+        self.closed = False
+        self.wake = threading.Event()
+        self.thread = threading.Thread(target=self._flush_loop, daemon=True, name="chat-store")
+        self.thread.start()
+
+    def _pending_count(self):
+        return len(self.pending_presence) + len(self.pending_messages)
+
+    def _queued(self):
+        """Wake the flush thread early once enough work is buffered."""
+        if self._pending_count() >= self.flush_threshold:
+            self.wake.set()
+
+    def set_presence(self, username, column, value):
+        """Queue a last_seen or last_spoke update for username."""
+        index = PRESENCE_COLUMNS.index(column)
+        with self.lock:
+            row = self.pending_presence.setdefault(username, [None, None])
+            row[index] = value
+            self._queued()
+
+    def log_message(self, username, message, ts=None):
+        """Queue a public chat line for username's history."""
+        with self.lock:
+            self.pending_messages.append((username, message, int(ts or time.time())))
+            self._queued()
+
+    def load_presence(self, column):
+        """Return {username: value} for every user with the column set."""
+        if column not in PRESENCE_COLUMNS:
+            raise ValueError(f"Unknown presence column: {column}")
+        with self.db_lock:
+            rows = self.conn.execute(
+                f"SELECT username, {column} FROM presence WHERE {column} IS NOT NULL"
+            ).fetchall()
+        return dict(rows)
+
+    def recent_messages(self, username=None, limit=3):
+        """Return the last `limit` public lines (oldest first) for a user, or for everyone."""
+        self.flush()  # Make sure lines said a moment ago are visible
+        with self.db_lock:
+            if username is None:
+                rows = self.conn.execute(
+                    "SELECT message FROM messages ORDER BY id DESC LIMIT ?", (limit,)
+                ).fetchall()
+            else:
+                rows = self.conn.execute(
+                    "SELECT message FROM messages WHERE username = ? ORDER BY id DESC LIMIT ?",
+                    (username, limit)
+                ).fetchall()
+        return [row[0] for row in reversed(rows)]
+
+    def _flush_loop(self):
+        """Flush on the interval, or early when the threshold wakes us."""
+        while not self.closed:
+            self.wake.wait(self.flush_interval)
+            self.wake.clear()
+            if not self.closed:
+                self.flush()
+
+    def flush(self):
+        """Write buffered updates in one transaction. Returns False on a database error."""
+        with self.db_lock:
+            with self.lock:
+                if not self._pending_count():
+                    return True
+                presence = self.pending_presence
+                messages = self.pending_messages
+                self.pending_presence = {}
+                self.pending_messages = []
+
+            try:
+                with self.conn:
+                    self.conn.executemany(
+                        _UPSERT_PRESENCE,
+                        [(name, seen, spoke) for name, (seen, spoke) in presence.items()]
+                    )
+                    self.conn.executemany(_INSERT_MESSAGE, messages)
+                    for name in {row[0] for row in messages}:
+                        self.conn.execute(_TRIM_MESSAGES, (name, name, self.messages_per_user))
+                return True
+            except sqlite3.Error as e:
+                print(f"[ERROR] Failed to write to {self.path}: {e}")
+                with self.lock:
+                    # Put the batch back (newer updates win) so the next tick retries it
+                    for name, row in presence.items():
+                        newer = self.pending_presence.setdefault(name, [None, None])
+                        for i, value in enumerate(row):
+                            if newer[i] is None:
+                                newer[i] = value
+                    self.pending_messages[:0] = messages
+                return False
+
+    def import_json(self, last_seen_path="last_seen.json", last_spoke_path="last_spoke.json",
+                    history_path="public_message_history.json"):
+        """Import the legacy JSON files once; later calls are no-ops."""
+        with self.db_lock:
+            if self.conn.execute("SELECT 1 FROM meta WHERE key = 'json_imported'").fetchone():
+                return False
+
+        imported = 0
+        for column, path in zip(PRESENCE_COLUMNS, (last_seen_path, last_spoke_path)):
+            for name, value in _read_json(path).items():
+                self.set_presence(normalize_username(name), column, value)
+                imported += 1
+
+        for name, lines in _read_json(history_path).items():
+            for line in lines[-self.messages_per_user:]:
+                self.log_message(normalize_username(name), line, ts=0)
+                imported += 1
+
+        self.flush()
+        with self.db_lock, self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('json_imported', ?)",
+                              (str(int(time.time())),))
+        print(f"[DEBUG] Imported {imported} presence/history entries into {self.path}")
+        return True
+
+    def close(self):
+        """Stop the flush thread, write out remaining changes and close the database."""
+        self.closed = True
+        self.wake.set()
+        if self.thread.is_alive() and self.thread is not threading.current_thread():
+            self.thread.join(timeout=5)
+        ok = self.flush()
+        with self.db_lock:
+            self.conn.close()
+        return ok
+
+
+def _read_json(path):
+    """Read a legacy JSON mapping, returning {} if it is missing or unreadable."""
+    try:
+        if os.path.exists(path):
+            with open(path, "r") as file:
+                return json.load(file)
+    except Exception as e:
+        print(f"[ERROR] Failed to import {path}: {e}")
+    return {}
+
+
+def normalize_username(username):
+    """Presence key for a username: domain stripped, whitespace trimmed, casefolded."""
+    return base_username(username).strip().casefold()
+
+
+def _deletions(name):
+    """The name plus every variant with one character removed."""
+    return {name} | {name[:i] + name[i + 1:] for i in range(len(name))}
+
+
+class PresenceStore(dict):
+    """Username -> timestamp mapping for one presence column, persisted via a ChatStore."""
+
+    def __init__(self, store, column):
+        super().__init__()
+        self.store = store
+        self.column = column
+        self.lock = threading.Lock()  # Guards the name indexes
+        self.sorted_names = []
+        self.deletion_index = {}  # One-deletion variant -> names that produce it
+        for name, value in store.load_presence(column).items():
+            key = normalize_username(name)
+            if value is not None and (key not in self or value > dict.__getitem__(self, key)):
+                self._index(key)
+                dict.__setitem__(self, key, value)
+
+    def _index(self, key):
+        """Add a new name to the prefix and typo indexes."""
+        with self.lock:
+            if dict.__contains__(self, key):
+                return
+            bisect.insort(self.sorted_names, key)
+            for variant in _deletions(key):
+                self.deletion_index.setdefault(variant, set()).add(key)
+
+    def __setitem__(self, key, value):
+        key = normalize_username(key)
+        if not dict.__contains__(self, key):
+            self._index(key)
+        super().__setitem__(key, value)
+        self.store.set_presence(key, self.column, value)
+
+    def __getitem__(self, key):
+        return super().__getitem__(normalize_username(key))
+
+    def __contains__(self, key):
+        return super().__contains__(normalize_username(key))
+
+    def get(self, key, default=None):
+        return super().get(normalize_username(key), default)
+
+    def suggest(self, username, limit=5):
+        """
+        Return known names matching username: the exact name if present,
+        otherwise names starting with it, otherwise names one typo away.
+        """
+        key = normalize_username(username)
+        if not key:
+            return []
+        if dict.__contains__(self, key):
+            return [key]
+
+        with self.lock:
+            start = bisect.bisect_left(self.sorted_names, key)
+            prefixed = []
+            for name in self.sorted_names[start:start + limit]:
+                if not name.startswith(key):
+                    break
+                prefixed.append(name)
+            if prefixed:
+                return prefixed
+
+            # Two names within one edit (insert, delete, substitute or swap) share a deletion variant
+            close = set()
+            for variant in _deletions(key):
+                close.update(self.deletion_index.get(variant, ()))
+        return sorted(close)[:limit]
+
+    def flush(self):
+        """Write buffered updates now (normally done in the background)."""
+        return self.store.flush()
@@ -0,0 +1,199 @@
+"""
+Short-lived cache for trigger responses that only depend on their arguments.
+
+Users in the room often fire the same trigger within seconds of each other
+(`!weather current Chicago IL`, `!news bitcoin`, the same `!search`).  Each
+response is cached under the normalized (command, args) pair for a
+per-command TTL, so repeats are answered from memory instead of spending
+upstream API quota.  Entries are evicted least-recently-used once the cache
+is full.
+
+Requests are also single-flight: while one caller is fetching a key, anyone
+else asking for the same key gets that caller's result instead of making a
+second upstream call, and sends it down its own reply channel.  The
+in-flight futures are concurrent.futures ones so worker threads and
+coroutines on the event loop can share them.  A worker thread that passes a
+deliver callback is not held while it waits: the callback is attached to the
+future and the worker returns at once.  Without one it waits at most
+FOLLOWER_TIMEOUT seconds and then computes the answer itself, so duplicate
+slow requests (a !trump scrape can take minutes) cannot tie up the worker
+pool.  Commands with a TTL of 0
+(the headless-browser scrapers behind !trump and !musk) are coalesced this
+way but never cached.
+
+Error and usage replies are returned to the caller but never cached.
+"""
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+# Seconds each command's response stays fresh; commands not listed are never cached
+DEFAULT_TTLS = {
+    'weather': 600,
+    'news': 900,
+    'crypto': 30,
+    'search': 3600,
+    'trump': 0,
+    'musk': 0,
+}
+DEFAULT_MAX_ENTRIES = 512
+FOLLOWER_TIMEOUT = 15  # Seconds a blocking duplicate waits before computing on its own
+
+# Replies that describe a failure rather than an answer
+_UNCACHEABLE_PREFIXES = ("Error", "Usage:", "Please specify", "Invalid", "Could not", "Failed")
+
+
+def normalize_args(args):
+    """Collapse whitespace and case so trivially different spellings share an entry."""
+    return " ".join(args.split()).casefold()
+
+
+def is_cacheable(response):
+    """True if response looks like a real answer rather than an error or usage hint."""
+    if not isinstance(response, str) or not response.strip():
+        return False
+    return not response.startswith(_UNCACHEABLE_PREFIXES) and "API key is missing" not in response
+
+
+class ResponseCache:
+    """Thread-safe TTL + LRU cache of command responses with single-flight fetching."""
+
+    def __init__(self, ttls=None, max_entries=DEFAULT_MAX_ENTRIES):
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # (command, args) -> (expires_at, response)
+        self.inflight = {}  # (command, args) -> Future shared by concurrent callers
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0  # Misses that joined an in-flight request instead of fetching
+
+    def handles(self, command):
+        return command in self.ttls
+
+    def key(self, command, args):
+        return (command, normalize_args(args))
+
+    def _lookup(self, key):
+        """Return (cached response or None, in-flight future or None, is_leader). Caller holds the lock."""
+        entry = self.entries.get(key)
+        if entry is not None:
+            expires_at, response = entry
+            if expires_at > time.monotonic():
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return response, None, False
+            del self.entries[key]
+        self.misses += 1
+        future = self.inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return None, future, False
+        future = Future()
+        self.inflight[key] = future
+        return None, future, True
+
+    def _store(self, key, response):
+        """Record the leader's result and release the in-flight slot."""
+        with self.lock:
+            future = self.inflight.pop(key, None)
+            if self.ttls[key[0]] > 0 and is_cacheable(response):
+                self.entries[key] = (time.monotonic() + self.ttls[key[0]], response)
+                self.entries.move_to_end(key)
+                while len(self.entries) > self.max_entries:
+                    self.entries.popitem(last=False)
+        return future
+
+    def _fail(self, key, error):
+        with self.lock:
+            future = self.inflight.pop(key, None)
+        if future is not None:
+            # Includes cancellation, so followers are never left waiting on a dead leader
+            future.set_exception(error if isinstance(error, Exception) else RuntimeError("Request cancelled"))
+
+    def get_or_compute(self, command, args, compute, deliver=None):
+        """
+        Return the cached response for (command, args), calling compute() on a miss.
+        If an identical request is already running and deliver is given, return
+        None at once and call deliver(response) when that request finishes.
+        """
+        if not self.handles(command):
+            return compute()
+        key = self.key(command, args)
+        with self.lock:
+            response, future, leader = self._lookup(key)
+        if future is None:
+            return response
+        if not leader:
+            if deliver is not None:
+                future.add_done_callback(lambda done: self._deliver(done, deliver))
+                return None
+            try:
+                return future.result(timeout=FOLLOWER_TIMEOUT)
+            except Exception:
+                # Leader too slow or failed: answer this caller independently
+                return compute()
+
+        error = None
+        try:
+            response = compute()
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            # Always release the in-flight slot, whatever compute() raised
+            if error is None:
+                self._store(key, response).set_result(response)
+            else:
+                self._fail(key, error)
+        return response
+
+    @staticmethod
+    def _deliver(future, deliver):
+        """Done-callback for a coalesced caller; runs on the leader's thread."""
+        try:
+            deliver(future.result())
+        except Exception as e:
+            print(f"[ERROR] Coalesced request failed: {e}")
+
+    async def get_or_compute_async(self, command, args, compute):
+        """Async variant: compute is a zero-argument callable returning an awaitable."""
+        if not self.handles(command):
+            return await compute()
+        key = self.key(command, args)
+        with self.lock:
+            response, future, leader = self._lookup(key)
+        if future is None:
+            return response
+        if not leader:
+            return await asyncio.wrap_future(future)
+        try:
+            response = await compute()
+        except BaseException as e:
+            self._fail(key, e)
+            raise
+        self._store(key, response).set_result(response)
+        return response
+
+    def invalidate(self, command=None):
+        """Drop every entry, or only those for one command."""
+        with self.lock:
+            if command is None:
+                self.entries.clear()
+            else:
+                for key in [key for key in self.entries if key[0] == command]:
+                    del self.entries[key]
+
+    def stats(self):
+        """Hit/miss counters and current size, for logging."""
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'hit_rate': self.hits / total if total else 0.0,
+                'entries': len(self.entries),
+            }
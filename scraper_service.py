@@ -0,0 +1,245 @@
+"""
+In-process scraper service behind !trump and !musk.
+
+The scrapers used to run as a fresh Python subprocess per request, each
+starting its own Chrome (and, for X, logging in again), with the answer
+parsed back out of stdout.  ScraperService imports the scraper modules once
+and calls their scrape_latest_post() API against warm sessions from a
+BrowserPool per site, so a request only pays for loading the profile page,
+and results come back as ScrapedPost objects (text, posted_at, source).
+warm() starts the X browser (and logs in) in the background at startup.
+
+start_polling() goes further and refreshes both posts on a background thread
+every poll interval (plus or minus some jitter, so the requests do not
+arrive on an exact beat).  Each result is kept with the time it was fetched,
+so latest_post() can answer a command straight from memory and say how old
+the answer is; it only scrapes inline when the cached post is missing or
+stale.  A new post is detected by comparing content hashes, and can be
+announced through the on_new_post callback without any extra scraping.
+The bot only polls while it is connected and calls stop_polling() on
+disconnect.
+
+For !trump the Truth Social statuses JSON is tried first (truthsocial_api);
+the browser is only used when that request fails.  The JSON request goes
+through the bot's shared AsyncHttpPool: from these worker threads it is run
+on the bot's event loop while that is running, and on a short-lived loop
+(with its own client) otherwise.
+"""
+import asyncio
+import concurrent.futures
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+
+from browser_pool import DEFAULT_MAX_USES, DEFAULT_POOL_SIZE, BrowserPool, new_chrome
+from post_extract import ScrapedPost
+from truthsocial_api import TruthSocialClient, TruthSocialError
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+X_CREDENTIALS_FILE = os.path.join(SCRIPT_DIR, "xcreds.json")
+
+DEFAULT_POLL_INTERVAL = 300  # Seconds between background refreshes
+DEFAULT_POLL_JITTER = 60  # Each wait is the interval +/- up to this many seconds
+
+SOURCES = ('trump', 'musk')
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def format_age(seconds):
+    """Short human-readable age, e.g. '45s', '12m', '2h 5m'."""
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m"
+    return f"{seconds // 3600}h {seconds % 3600 // 60}m"
+
+
+class CachedPost:
+    """A ScrapedPost and when it was fetched."""
+
+    def __init__(self, post, fetched_at):
+        self.post = post
+        self.fetched_at = fetched_at
+        self.digest = content_hash(post.text)
+
+    def age(self):
+        return time.time() - self.fetched_at
+
+
+class ScraperService:
+    """Owns the browser pools and runs the Trump and Musk scrapers on them."""
+
+    def __init__(self, http, loop_getter, size=DEFAULT_POOL_SIZE, max_uses=DEFAULT_MAX_USES,
+                 profile_root=os.path.join(SCRIPT_DIR, "browser_profiles")):
+        self.trump_pool = BrowserPool(
+            "truthsocial",
+            factory=lambda profile_dir: new_chrome(profile_dir=profile_dir),
+            size=size, max_uses=max_uses, profile_root=profile_root
+        )
+        self.musk_pool = BrowserPool(
+            "x",
+            factory=lambda profile_dir: new_chrome(profile_dir=profile_dir, block_images=True, page_load_timeout=60),
+            size=size, max_uses=max_uses, profile_root=profile_root
+        )
+        self.http = http
+        self.loop_getter = loop_getter  # The loop the shared HTTP pool belongs to
+        self.truth_api = TruthSocialClient(http)
+        self.fetchers = {'trump': self.trump_post, 'musk': self.musk_post}
+        self.lock = threading.Lock()
+        self.latest = {}  # source -> CachedPost
+        self.poll_interval = DEFAULT_POLL_INTERVAL
+        self.poll_jitter = DEFAULT_POLL_JITTER
+        self.on_new_post = None  # Called as on_new_post(source, post) when a post changes
+        self.stop_event = threading.Event()
+        self.poll_thread = None
+
+    def load_x_credentials(self):
+        with open(X_CREDENTIALS_FILE, "r") as file:
+            return json.load(file)
+
+    async def _on_own_loop(self, coro):
+        """Await coro on a short-lived loop, closing any pooled client opened for it."""
+        try:
+            return await coro
+        finally:
+            # Only closes the pooled client if it was opened on this loop
+            await self.http.aclose()
+
+    def run_async(self, coro, timeout=30):
+        """Run an HTTP coroutine from a worker thread and return its result."""
+        loop = self.loop_getter()
+        if loop is not None and loop.is_running():
+            future = asyncio.run_coroutine_threadsafe(coro, loop)
+            try:
+                return future.result(timeout=timeout)
+            except concurrent.futures.TimeoutError:
+                future.cancel()
+                raise
+        # The bot is not connected, so there is no loop to borrow
+        return asyncio.run(self._on_own_loop(coro))
+
+    def trump_post(self):
+        """Latest Truth Social post as a ScrapedPost, or None if there is no text post."""
+        try:
+            post_content, post_time = self.run_async(self.truth_api.latest_post())
+            return ScrapedPost('trump', post_content, post_time, method='json')
+        except (TruthSocialError, concurrent.futures.TimeoutError) as e:
+            print(f"[DEBUG] Truth Social JSON fetch failed, using the browser: {str(e) or 'timed out'}")
+
+        import TrumpsLatestPostScraper as trump
+
+        with self.trump_pool.session(timeout=180) as browser:
+            return trump.scrape_latest_post(browser.driver)
+
+    def musk_post(self):
+        """Musk's latest non-pinned post as a ScrapedPost, or None."""
+        import MusksLatestPostScraper as musk
+
+        credentials = self.load_x_credentials()
+        with self.musk_pool.session(timeout=180) as browser:
+            return musk.scrape_latest_post(browser.driver, credentials)
+
+    def _login_x(self, browser):
+        """Warm-up step for the X pool: make sure the session can see posts."""
+        import MusksLatestPostScraper as musk
+
+        credentials = self.load_x_credentials()
+        musk.open_profile(
+            browser.driver, credentials["username"], credentials["password"], credentials["x_username"]
+        )
+
+    def _warm_pools(self):
+        # The Truth Social browser is only a fallback for the JSON fetch, so it starts on demand
+        if os.path.exists(X_CREDENTIALS_FILE):
+            self.musk_pool.warm(self._login_x)
+        else:
+            self.musk_pool.warm()
+
+    def warm(self):
+        """Start the X browser (and log in) on a background thread."""
+        threading.Thread(target=self._warm_pools, daemon=True, name="scraper-warmup").start()
+
+    def refresh(self, source):
+        """Scrape source now, update the cache and report a changed post. Returns the ScrapedPost or None."""
+        post = self.fetchers[source]()
+        if post is None:
+            return None
+        cached = CachedPost(post, time.time())
+        with self.lock:
+            previous = self.latest.get(source)
+            self.latest[source] = cached
+        if previous is not None and previous.digest != cached.digest and self.on_new_post:
+            try:
+                self.on_new_post(source, post)
+            except Exception as e:
+                print(f"[ERROR] New {source} post callback failed: {e}")
+        return post
+
+    def cached(self, source, max_age=None):
+        """The cached post for source, or None if there is none or it is older than max_age."""
+        with self.lock:
+            post = self.latest.get(source)
+        if post is None or (max_age is not None and post.age() > max_age):
+            return None
+        return post
+
+    def latest_post(self, source):
+        """
+        Return (post, age_seconds) for source: from the cache while the poller
+        keeps it fresh, otherwise scraped now (age 0). post is None if nothing was found.
+        """
+        # Allow one missed refresh (a slow scrape) before treating the cache as stale
+        post = self.cached(source, max_age=2 * self.poll_interval + self.poll_jitter)
+        if post is not None:
+            return post.post, post.age()
+        return self.refresh(source), 0
+
+    def start_polling(self, interval=None, jitter=None, on_new_post=None):
+        """Warm the pools, then refresh every source on a background thread until stop_polling()."""
+        if interval is not None:
+            self.poll_interval = interval
+        if jitter is not None:
+            self.poll_jitter = jitter
+        if on_new_post is not None:
+            self.on_new_post = on_new_post
+        with self.lock:
+            if self.poll_thread is not None and self.poll_thread.is_alive() and not self.stop_event.is_set():
+                return
+            # A stopped poller may still be finishing a scrape; it keeps its own (set) event
+            self.stop_event = threading.Event()
+            self.poll_thread = threading.Thread(target=self._poll, args=(self.stop_event,),
+                                                daemon=True, name="scraper-poller")
+            self.poll_thread.start()
+
+    def stop_polling(self):
+        """Stop the background refresh after the scrape in progress, if any."""
+        self.stop_event.set()
+
+    def _poll(self, stop_event):
+        self._warm_pools()
+        while not stop_event.is_set():
+            for source in SOURCES:
+                if stop_event.is_set():
+                    return
+                try:
+                    self.refresh(source)
+                except ImportError as e:
+                    print(f"[DEBUG] Post polling disabled: {e}")
+                    return
+                except Exception as e:
+                    print(f"[ERROR] Background {source} refresh failed: {e}")
+            delay = self.poll_interval + random.uniform(-self.poll_jitter, self.poll_jitter)
+            stop_event.wait(max(30, delay))
+
+    def close(self):
+        """Stop polling and quit all pooled browsers."""
+        self.stop_event.set()
+        self.trump_pool.close()
+        self.musk_pool.close()
@@ -0,0 +1,49 @@
+import asyncio
+import unittest
+
+import httpx
+
+from http_client import AsyncHttpPool
+
+
+class MockPool(AsyncHttpPool):
+    """AsyncHttpPool whose clients answer every request locally."""
+
+    def __init__(self):
+        super().__init__()
+        self.created = []
+
+    def _new_client(self):
+        client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200)))
+        self.created.append(client)
+        return client
+
+
+class AsyncHttpPoolTests(unittest.TestCase):
+    def test_client_from_a_closed_loop_is_replaced_and_closed(self):
+        pool = MockPool()
+        asyncio.run(pool.get("https://example.com/"))
+        old = pool.client
+        asyncio.run(pool.get("https://example.com/"))
+        self.assertIsNot(pool.client, old)
+        self.assertTrue(old.is_closed)
+        self.assertEqual(len(pool.created), 2)
+
+    def test_aclose_leaves_a_client_owned_by_another_loop(self):
+        pool = MockPool()
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(pool.get("https://example.com/"))
+            client = pool.client
+            asyncio.run(pool.aclose())
+            self.assertIs(pool.client, client)
+            self.assertFalse(client.is_closed)
+            loop.run_until_complete(pool.aclose())
+            self.assertIsNone(pool.client)
+            self.assertTrue(client.is_closed)
+        finally:
+            loop.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import asyncio
+import unittest
+
+from outbound_queue import BULK_CHUNKS, LANE_BULK, LANE_CONTROL, LANE_INTERACTIVE, ROOM, OutboundQueue
+
+
+class RecordingWriter:
+    def __init__(self):
+        self.lines = []
+
+    def write(self, text):
+        self.lines.extend(line for line in text.split("\r\n") if line)
+
+    async def drain(self):
+        pass
+
+
+def send_all(queue_lines):
+    """Queue everything up front, then let a fast writer drain it; return the lines in send order."""
+    async def run():
+        queue = OutboundQueue(asyncio.get_running_loop(), lambda: writer, rate=1000, burst=1)
+        for lines, lane, key in queue_lines:
+            queue.put_many([f"{line}\r\n" for line in lines], lane, key)
+        task = asyncio.create_task(queue.run())
+        await queue.flush(timeout=5)
+        task.cancel()
+        return queue
+
+    writer = RecordingWriter()
+    queue = asyncio.run(run())
+    return writer.lines, queue
+
+
+class OutboundQueueOrderTests(unittest.TestCase):
+    def test_short_reply_waits_behind_long_reply_to_same_user(self):
+        long_reply = [f"alice long {i}" for i in range(BULK_CHUNKS + 3)]
+        lines, queue = send_all([(long_reply, None, "alice"), (["alice short"], None, "alice")])
+        self.assertEqual(lines, long_reply + ["alice short"])
+        self.assertEqual(queue.waiting, {})
+
+    def test_other_users_short_replies_still_go_first(self):
+        long_reply = [f"alice long {i}" for i in range(BULK_CHUNKS + 3)]
+        lines, _ = send_all([(long_reply, None, "alice"), (["bob short"], None, "bob")])
+        self.assertEqual(lines[0], "bob short")
+        self.assertEqual([line for line in lines if line.startswith("alice")], long_reply)
+
+    def test_room_output_keeps_its_order(self):
+        dump = [f"help {i}" for i in range(BULK_CHUNKS + 2)]
+        lines, _ = send_all([(dump, None, ROOM), (["public answer"], None, ROOM), (["to carol"], None, "carol")])
+        self.assertEqual(lines[0], "to carol")
+        self.assertEqual(lines[1:], dump + ["public answer"])
+
+    def test_control_lines_still_jump_the_queue(self):
+        lines, _ = send_all([
+            ([f"bulk {i}" for i in range(5)], LANE_BULK, None),
+            (["chat"], LANE_INTERACTIVE, None),
+            (["ENTER"], LANE_CONTROL, None),
+        ])
+        self.assertEqual(lines[0], "ENTER")
+        self.assertEqual(lines[1], "chat")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+import response_cache
+from response_cache import ResponseCache
+
+
+class SingleFlightTests(unittest.TestCase):
+    def start_leader(self, cache, command="trump", result="post"):
+        """Run a slow leader on a thread; returns (release event, thread)."""
+        release = threading.Event()
+        started = threading.Event()
+
+        def slow():
+            started.set()
+            release.wait(5)
+            return result
+
+        thread = threading.Thread(target=cache.get_or_compute, args=(command, "", slow))
+        thread.start()
+        started.wait(5)
+        return release, thread
+
+    def test_duplicate_with_deliver_does_not_wait(self):
+        cache = ResponseCache()
+        release, leader = self.start_leader(cache)
+        delivered = []
+        started = time.monotonic()
+        self.assertIsNone(cache.get_or_compute("trump", "", lambda: "unused", deliver=delivered.append))
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertEqual(delivered, [])
+        release.set()
+        leader.join(5)
+        self.assertEqual(delivered, ["post"])
+        self.assertEqual(cache.stats()["coalesced"], 1)
+
+    def test_blocking_duplicate_computes_after_timeout(self):
+        cache = ResponseCache()
+        release, leader = self.start_leader(cache)
+        with mock.patch.object(response_cache, "FOLLOWER_TIMEOUT", 0.1):
+            self.assertEqual(cache.get_or_compute("trump", "", lambda: "own answer"), "own answer")
+        release.set()
+        leader.join(5)
+
+    def test_base_exception_releases_inflight_slot(self):
+        cache = ResponseCache()
+
+        def interrupted():
+            raise KeyboardInterrupt
+
+        with self.assertRaises(KeyboardInterrupt):
+            cache.get_or_compute("crypto", "btc", interrupted)
+        self.assertEqual(cache.inflight, {})
+        self.assertEqual(cache.get_or_compute("crypto", "btc", lambda: "BTC: $1"), "BTC: $1")
+
+    def test_failed_leader_is_not_delivered(self):
+        cache = ResponseCache()
+        release = threading.Event()
+
+        def failing():
+            release.wait(5)
+            raise ValueError("upstream down")
+
+        def run_leader():
+            with self.assertRaises(ValueError):
+                cache.get_or_compute("crypto", "btc", failing)
+
+        leader = threading.Thread(target=run_leader)
+        leader.start()
+        while not cache.inflight:
+            time.sleep(0.01)
+        delivered = []
+        cache.get_or_compute("crypto", "btc", lambda: "unused", deliver=delivered.append)
+        release.set()
+        leader.join(5)
+        self.assertEqual(delivered, [])
+        self.assertEqual(cache.inflight, {})
+
+    def test_cached_responses_respect_ttl(self):
+        cache = ResponseCache(ttls={"weather": 600})
+        calls = []
+        compute = lambda: calls.append(1) or "Sunny"
+        self.assertEqual(cache.get_or_compute("weather", "Chicago  IL", compute), "Sunny")
+        self.assertEqual(cache.get_or_compute("weather", "chicago il", compute), "Sunny")
+        self.assertEqual(len(calls), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
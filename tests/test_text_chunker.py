@@ -0,0 +1,47 @@
+import unittest
+
+from text_chunker import ENCODING, SentenceBuffer, chunk_text
+
+
+def encoded_width(text):
+    """Bytes text occupies once the writer encodes it for the BBS."""
+    return len(text.encode(ENCODING, 'replace'))
+
+
+class ChunkTextTests(unittest.TestCase):
+    def assert_fits(self, chunks, chunk_size):
+        for chunk in chunks:
+            self.assertLessEqual(encoded_width(chunk), chunk_size, chunk)
+
+    def test_cp437_width_matches_code_points(self):
+        # In the code page, out of it (one '?' each), astral and combining characters
+        for text in ["café naïve", "£ ¥ ½ ░▒▓ │┤", "日本語テキスト", "emoji 🙂🚀", "é combining", "Ωmega ß"]:
+            self.assertEqual(encoded_width(text), len(text), text)
+
+    def test_non_ascii_chunks_stay_within_limit(self):
+        message = " ".join(["café", "日本語", "🙂🚀🙂", "░▒▓█", "naïveté"] * 40)
+        chunks = chunk_text(message, 20)
+        self.assert_fits(chunks, 20)
+        self.assertEqual(" ".join(chunks).split(), message.split())
+
+    def test_long_non_ascii_word_is_hard_split_by_bytes(self):
+        word = "日本語🙂é" * 30
+        chunks = chunk_text(word, 25)
+        self.assert_fits(chunks, 25)
+        self.assertEqual("".join(chunks), word)
+        self.assertTrue(all(encoded_width(chunk) == 25 for chunk in chunks[:-1]))
+
+    def test_blank_paragraphs_are_kept(self):
+        self.assertEqual(chunk_text("one\n\ntwo", 10), ["one", "", "two"])
+
+
+class SentenceBufferTests(unittest.TestCase):
+    def test_sentences_are_released_as_they_complete(self):
+        buffer = SentenceBuffer(max_chars=200)
+        self.assertEqual(buffer.feed("Hello there. How"), ["Hello there."])
+        self.assertEqual(buffer.feed(" are you?"), [])
+        self.assertEqual(buffer.flush(), "How are you?")
+
+
+if __name__ == "__main__":
+    unittest.main()
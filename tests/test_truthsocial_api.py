@@ -0,0 +1,264 @@
+import asyncio
+import json
+import os
+import sys
+import threading
+import types
+import unittest
+from contextlib import contextmanager
+
+import httpx
+
+import scraper_service
+from post_extract import ScrapedPost
+from truthsocial_api import (TRUMP_ACCOUNT_ID, TruthSocialClient, TruthSocialError, format_post_time,
+                             parse_statuses)
+
+FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                       "fixtures", "truthsocial_statuses.json")
+
+
+def status(content, created_at="2025-01-20T17:05:00.000Z", **extra):
+    return {"content": content, "created_at": created_at, **extra}
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, payload=None, headers=None, text=None):
+        self.status_code = status_code
+        self.payload = payload
+        self.headers = headers or {}
+        self.text = text
+
+    def json(self):
+        if self.text is not None:
+            return json.loads(self.text)  # Raises ValueError like httpx does for non-JSON bodies
+        return self.payload
+
+
+class StubHttp:
+    """Stands in for AsyncHttpPool: replays queued responses and records each request."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+        self.client_loop = None
+
+    async def aclose(self):
+        pass
+
+    async def get(self, url, **kwargs):
+        self.requests.append((url, kwargs))
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def statuses_response(statuses, etag='"v1"', last_modified="Mon, 20 Jan 2025 17:05:00 GMT"):
+    return FakeResponse(200, statuses, {"ETag": etag, "Last-Modified": last_modified})
+
+
+def lookup_response(account_id=TRUMP_ACCOUNT_ID):
+    return FakeResponse(200, {"id": account_id})
+
+
+def latest(client):
+    return asyncio.run(client.latest_post())
+
+
+class ParseStatusesTests(unittest.TestCase):
+    def test_fixture(self):
+        with open(FIXTURE, "r", encoding="utf-8") as f:
+            fixture = json.load(f)
+        statuses = fixture.get("statuses") if isinstance(fixture, dict) else fixture
+        text, _ = parse_statuses(statuses)
+        self.assertIsNotNone(text)
+        if isinstance(fixture, dict) and "text" in fixture.get("expect", {}):
+            self.assertEqual(text, fixture["expect"]["text"])
+
+    def test_skips_reblogs_pinned_and_url_only_posts(self):
+        statuses = [
+            status("<p>pinned</p>", "2025-01-22T00:00:00.000Z", pinned=True),
+            status("", "2025-01-21T00:00:00.000Z", reblog={"id": "1"}),
+            status("<p>https://example.com/x</p>", "2025-01-21T12:00:00.000Z"),
+            status("<p>Older &amp; real</p>", "2025-01-20T17:05:00.000Z"),
+        ]
+        self.assertEqual(parse_statuses(statuses), ("Older & real", format_post_time("2025-01-20T17:05:00.000Z")))
+
+    def test_no_text_posts(self):
+        self.assertEqual(parse_statuses([status("<p>https://t.co/x</p>")]), (None, None))
+
+    def test_unexpected_payload_raises(self):
+        with self.assertRaises(TruthSocialError):
+            parse_statuses({"error": "Record not found"})
+
+
+class TruthSocialClientTests(unittest.TestCase):
+    def test_conditional_request_reuses_result_on_304(self):
+        http = StubHttp(lookup_response(), statuses_response([status("<p>First post</p>")]), FakeResponse(304))
+        client = TruthSocialClient(http)
+        first = latest(client)
+        self.assertEqual(first[0], "First post")
+        self.assertIs(latest(client), first)
+        headers = http.requests[-1][1]["headers"]
+        self.assertEqual(headers["If-None-Match"], '"v1"')
+        self.assertEqual(headers["If-Modified-Since"], "Mon, 20 Jan 2025 17:05:00 GMT")
+        # The account lookup is only done once
+        self.assertEqual(sum("/accounts/lookup" in url for url, _ in http.requests), 1)
+
+    def test_first_request_is_unconditional(self):
+        http = StubHttp(lookup_response(), statuses_response([status("<p>Post</p>")]))
+        latest(TruthSocialClient(http))
+        self.assertNotIn("If-None-Match", http.requests[-1][1]["headers"])
+
+    def test_304_without_previous_result_raises(self):
+        client = TruthSocialClient(StubHttp(lookup_response(), FakeResponse(304)))
+        with self.assertRaises(TruthSocialError):
+            latest(client)
+
+    def test_new_content_replaces_validators_and_result(self):
+        http = StubHttp(
+            lookup_response(),
+            statuses_response([status("<p>Old</p>")], etag='"v1"'),
+            statuses_response([status("<p>New</p>")], etag='"v2"'),
+            FakeResponse(304),
+        )
+        client = TruthSocialClient(http)
+        latest(client)
+        self.assertEqual(latest(client)[0], "New")
+        self.assertEqual(latest(client)[0], "New")
+        self.assertEqual(http.requests[-1][1]["headers"]["If-None-Match"], '"v2"')
+
+    def test_errors_raise_truthsocial_error(self):
+        failures = {
+            "rate limited": FakeResponse(429),
+            "bot check page": FakeResponse(200, text="<html>Just a moment...</html>"),
+            "network error": httpx.ConnectError("connection refused"),
+            "no text posts": statuses_response([status("<p>https://t.co/x</p>")]),
+        }
+        for name, failure in failures.items():
+            with self.subTest(name):
+                client = TruthSocialClient(StubHttp(lookup_response(), failure))
+                with self.assertRaises(TruthSocialError):
+                    latest(client)
+                self.assertIsNone(client.last_result)
+
+    def test_failed_lookup_keeps_builtin_account_id(self):
+        http = StubHttp(FakeResponse(404), statuses_response([status("<p>Post</p>")]))
+        latest(TruthSocialClient(http))
+        self.assertIn(f"/accounts/{TRUMP_ACCOUNT_ID}/statuses", http.requests[-1][0])
+
+    def test_304_answers_with_the_result_its_validators_belong_to(self):
+        # Another caller stores a newer result while this request is in flight
+        client = TruthSocialClient(None)
+        client.lookup_done = True
+        client.etag, client.last_result = '"v1"', ("Old", "t1")
+
+        class RacingHttp:
+            async def get(self, url, **kwargs):
+                with client.lock:
+                    client.etag, client.last_result = '"v2"', ("New", "t2")
+                return FakeResponse(304)
+
+        client.http = RacingHttp()
+        self.assertEqual(latest(client), ("Old", "t1"))
+
+
+class BrowserFallbackTests(unittest.TestCase):
+    def setUp(self):
+        self.http = StubHttp()
+        self.service = scraper_service.ScraperService(self.http, lambda: None)
+        self.browser_calls = []
+        fake_scraper = types.ModuleType("TrumpsLatestPostScraper")
+
+        def scrape_latest_post(driver):
+            self.browser_calls.append(driver)
+            return ScrapedPost('trump', "From the browser", "Jan 20, 2025", method='browser')
+
+        fake_scraper.scrape_latest_post = scrape_latest_post
+
+        @contextmanager
+        def session(timeout=None):
+            yield types.SimpleNamespace(driver="driver")
+
+        self.service.trump_pool.session = session
+        self.saved_module = sys.modules.get("TrumpsLatestPostScraper")
+        sys.modules["TrumpsLatestPostScraper"] = fake_scraper
+
+    def tearDown(self):
+        if self.saved_module is None:
+            sys.modules.pop("TrumpsLatestPostScraper", None)
+        else:
+            sys.modules["TrumpsLatestPostScraper"] = self.saved_module
+
+    def test_json_post_skips_the_browser(self):
+        self.http.responses = [lookup_response(), statuses_response([status("<p>From JSON</p>")])]
+        post = self.service.trump_post()
+        self.assertEqual((post.text, post.method), ("From JSON", "json"))
+        self.assertEqual(self.browser_calls, [])
+
+    def test_json_failure_falls_back_to_the_browser(self):
+        self.http.responses = [lookup_response(), FakeResponse(403)]
+        post = self.service.trump_post()
+        self.assertEqual((post.text, post.method), ("From the browser", "browser"))
+        self.assertEqual(self.browser_calls, ["driver"])
+
+    def test_runs_on_the_bot_loop_when_it_is_running(self):
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        try:
+            self.service.loop_getter = lambda: loop
+            seen = []
+
+            async def which_loop():
+                seen.append(asyncio.get_running_loop())
+                return "done"
+
+            self.assertEqual(self.service.run_async(which_loop()), "done")
+            self.assertEqual(seen, [loop])
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(5)
+            loop.close()
+
+
+class PollingTests(unittest.TestCase):
+    def setUp(self):
+        self.service = scraper_service.ScraperService(StubHttp(), lambda: None)
+        self.service._warm_pools = lambda: None
+        self.refreshed = threading.Semaphore(0)
+        self.release = threading.Event()
+
+        def fetch():
+            self.refreshed.release()
+            self.release.wait(5)
+            return None
+
+        self.service.fetchers = {source: fetch for source in scraper_service.SOURCES}
+
+    def tearDown(self):
+        self.release.set()
+        self.service.stop_polling()
+
+    def test_restart_while_the_old_poller_is_still_scraping(self):
+        self.service.start_polling()
+        self.assertTrue(self.refreshed.acquire(timeout=5))
+        old_thread = self.service.poll_thread
+        self.service.stop_polling()
+        self.service.start_polling()
+        self.assertIsNot(self.service.poll_thread, old_thread)
+        self.release.set()
+        old_thread.join(5)
+        self.assertFalse(old_thread.is_alive())
+        self.assertTrue(self.service.poll_thread.is_alive())
+
+    def test_start_while_polling_is_a_no_op(self):
+        self.service.start_polling()
+        thread = self.service.poll_thread
+        self.service.start_polling()
+        self.assertIs(self.service.poll_thread, thread)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,165 @@
+"""
+Word-boundary chunking of outbound BBS messages.
+
+chunk_text() walks each paragraph once, keeping a running width instead of
+re-joining the current line for every word, so it stays linear in the
+message length even for long !doc output.  Width is measured in bytes of the
+connection's code page (CP437), which is what the BBS line limit actually
+counts; CP437 is single-byte and the writer replaces unencodable characters
+with one '?', so a word's encoded width is simply its length in code points
+and nothing has to be encoded while chunking.  Words wider than a whole chunk
+(long URLs) are hard-split.
+
+SentenceBuffer cuts a streamed reply into sentence-sized pieces as tokens
+arrive, so the first sentence can be sent while the rest is still generating.
+
+Run this module directly for a micro-benchmark against the old chunker.
+"""
+import re
+
+ENCODING = 'cp437'
+
+# End of a sentence: terminal punctuation (plus closing quotes/brackets) then whitespace, or a newline
+_SENTENCE_END_RE = re.compile(r'[.!?]+["\')\]]*\s+|\n+')
+
+
+def _hard_split(word, chunk_size):
+    """Split a word that is wider than chunk_size into chunk_size-wide pieces."""
+    # One code point is one CP437 byte, so slicing by characters slices by bytes
+    return [word[i:i + chunk_size] for i in range(0, len(word), chunk_size)]
+
+
+def chunk_text(message, chunk_size):
+    """
+    Break a message into chunks of at most chunk_size encoded bytes without
+    splitting words, except words that cannot fit in a chunk on their own.
+    Newlines are paragraph boundaries; blank paragraphs become '' chunks.
+    """
+    final_chunks = []
+
+    for para in message.split('\n'):
+        # If paragraph is totally empty, keep it as a blank line
+        if not para.strip():
+            final_chunks.append('')
+            continue
+
+        line_words = []
+        line_width = 0
+        for word in para.split():
+            width = len(word)  # Encoded CP437 width, see the module docstring
+            if width > chunk_size:
+                # Flush the current line, emit full slices, keep the tail to build on
+                if line_words:
+                    final_chunks.append(' '.join(line_words))
+                pieces = _hard_split(word, chunk_size)
+                final_chunks.extend(pieces[:-1])
+                line_words = [pieces[-1]]
+                line_width = len(pieces[-1])
+            elif not line_words:
+                line_words = [word]
+                line_width = width
+            elif line_width + 1 + width <= chunk_size:
+                line_words.append(word)
+                line_width += 1 + width
+            else:
+                final_chunks.append(' '.join(line_words))
+                line_words = [word]
+                line_width = width
+
+        if line_words:
+            final_chunks.append(' '.join(line_words))
+
+    return final_chunks
+
+
+class SentenceBuffer:
+    """Accumulate streamed text and hand back complete sentences (or max_chars runs)."""
+
+    def __init__(self, max_chars=200):
+        self.max_chars = max_chars
+        self.buffer = ""
+
+    def feed(self, text):
+        """Add streamed text; return the pieces that are now ready to send."""
+        self.buffer += text
+        pieces = []
+        while True:
+            # Send as many whole sentences as fit in one piece
+            end = None
+            for match in _SENTENCE_END_RE.finditer(self.buffer):
+                if match.end() > self.max_chars:
+                    break
+                end = match.end()
+            if end is None:
+                if len(self.buffer) < self.max_chars:
+                    break
+                # No sentence end within reach: cut at the last space, or hard at max_chars
+                end = self.buffer.rfind(' ', 0, self.max_chars) + 1 or self.max_chars
+            piece = self.buffer[:end].strip()
+            self.buffer = self.buffer[end:]
+            if piece:
+                pieces.append(piece)
+        return pieces
+
+    def flush(self):
+        """Return whatever is left once the stream has ended."""
+        piece = self.buffer.strip()
+        self.buffer = ""
+        return piece
+
+
+if __name__ == "__main__":
+    import random
+    import string
+    import timeit
+
+    def chunk_text_quadratic(message, chunk_size):
+        """The previous chunker, which re-joined the line for every word."""
+        final_chunks = []
+        for para in message.split('\n'):
+            if not para.strip():
+                final_chunks.append('')
+                continue
+            current_line_words = []
+            for word in para.split():
+                if not current_line_words:
+                    current_line_words.append(word)
+                elif len(' '.join(current_line_words + [word])) <= chunk_size:
+                    current_line_words.append(word)
+                else:
+                    final_chunks.append(' '.join(current_line_words))
+                    current_line_words = [word]
+            if current_line_words:
+                final_chunks.append(' '.join(current_line_words))
+        return final_chunks
+
+    random.seed(42)
+
+    def make_document(size, paragraph_words):
+        """Random prose with the occasional long URL, roughly size characters long."""
+        words = []
+        length = 0
+        while length < size:
+            if random.random() < 0.01:
+                word = "https://example.com/" + "".join(random.choices(string.ascii_letters, k=300))
+            else:
+                word = "".join(random.choices(string.ascii_lowercase, k=random.randint(2, 10)))
+            if len(words) % paragraph_words == paragraph_words - 1:
+                word += "\n"
+            words.append(word)
+            length += len(word) + 1
+        return " ".join(words)
+
+    # Chat reply, news/email body, and a max-length !doc answer (10000 tokens ~ 40 KB),
+    # the last also as one unbroken paragraph
+    cases = [
+        ("reply 250 B", make_document(250, 1000)),
+        ("email 4 KB", make_document(4_000, 80)),
+        ("!doc 40 KB", make_document(40_000, 150)),
+        ("!doc 40 KB, 1 paragraph", make_document(40_000, 10 ** 9)),
+    ]
+    for name, doc in cases:
+        runs = 20
+        new = timeit.timeit(lambda: chunk_text(doc, 250), number=runs) / runs
+        old = timeit.timeit(lambda: chunk_text_quadratic(doc, 250), number=runs) / runs
+        print(f"{name:<26} linear {new * 1000:8.3f} ms   quadratic {old * 1000:8.3f} ms   ({old / new:5.1f}x)")
@@ -0,0 +1,224 @@
+"""
+Fast path for !trump: read the public statuses timeline JSON directly.
+
+Truth Social runs a Mastodon-compatible API, so the latest posts are one
+GET away; no browser, no rendering, no scrolling.  TruthSocialClient sends
+its requests through the bot's shared AsyncHttpPool (http_client), remembers
+the account id after the first lookup, and makes conditional requests
+(If-None-Match / If-Modified-Since) so an unchanged timeline costs a 304
+with no body.  The validators and the result they belong to are read and
+replaced together under a lock, because the poller thread and command
+workers share one client.  Any failure (blocked, rate limited, unexpected
+payload) raises TruthSocialError and the caller falls back to the Selenium
+scraper.
+
+parse_statuses() is a pure function over the decoded JSON, so it can be
+checked offline against saved responses:
+
+    python truthsocial_api.py --record fixtures/    # save a live response
+    python truthsocial_api.py --replay fixtures/truthsocial_statuses.json
+"""
+import html
+import json
+import re
+import threading
+from datetime import datetime, timezone
+
+from http_client import HTTPError
+
+BASE_URL = "https://truthsocial.com/api/v1"
+TRUMP_ACCT = "realDonaldTrump"
+TRUMP_ACCOUNT_ID = "107780257626128497"  # Used if the lookup endpoint is unavailable
+DEFAULT_TIMEOUT = 10
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/133.0.0.0 Safari/537.36"
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_BREAK_RE = re.compile(r'<br\s*/?>|</p>\s*<p[^>]*>', re.IGNORECASE)
+
+
+class TruthSocialError(Exception):
+    """The JSON path could not produce a post; use the browser scraper instead."""
+
+
+def status_text(content):
+    """Plain text of a status' HTML content."""
+    text = _BREAK_RE.sub(' ', content or '')
+    return ' '.join(html.unescape(_TAG_RE.sub('', text)).split())
+
+
+def format_post_time(created_at):
+    """'2025-01-20T17:05:00.000Z' -> 'Jan 20, 2025, 05:05 PM UTC' (falls back to the raw value)."""
+    try:
+        when = datetime.fromisoformat(created_at.replace('Z', '+00:00')).astimezone(timezone.utc)
+    except (AttributeError, ValueError):
+        return created_at
+    return when.strftime('%b %d, %Y, %I:%M %p UTC')
+
+
+def parse_statuses(statuses):
+    """
+    Pick the latest original text post from a statuses timeline payload.
+    Skips reblogs, pinned posts, and posts that are empty or only a URL,
+    like the browser scraper does. Returns (post_text, post_time) or (None, None).
+    """
+    if not isinstance(statuses, list):
+        raise TruthSocialError(f"Unexpected statuses payload: {type(statuses).__name__}")
+    posts = []
+    for status in statuses:
+        if not isinstance(status, dict) or status.get('reblog') or status.get('pinned'):
+            continue
+        text = status_text(status.get('content'))
+        if not text or (text.startswith('http') and ' ' not in text):
+            continue
+        posts.append((status.get('created_at') or '', text))
+    if not posts:
+        return None, None
+    created_at, text = max(posts)
+    return text, format_post_time(created_at)
+
+
+class TruthSocialClient:
+    """Conditional-request client for one account's statuses timeline, on a shared AsyncHttpPool."""
+
+    def __init__(self, http, acct=TRUMP_ACCT, timeout=DEFAULT_TIMEOUT):
+        self.http = http
+        self.acct = acct
+        self.timeout = timeout
+        self.headers = {'User-Agent': USER_AGENT, 'Accept': 'application/json'}
+        self.lock = threading.Lock()  # Guards everything below
+        self.account_id = TRUMP_ACCOUNT_ID if acct == TRUMP_ACCT else None
+        self.lookup_done = False
+        self.etag = None
+        self.last_modified = None
+        self.last_result = None  # Parsed result for the current validators, reused on 304
+
+    async def _get(self, url, headers=None, **kwargs):
+        try:
+            return await self.http.get(url, headers={**self.headers, **(headers or {})},
+                                       timeout=self.timeout, **kwargs)
+        except HTTPError as e:
+            raise TruthSocialError(f"Request to {url} failed: {e}") from e
+
+    async def _lookup_account_id(self):
+        """Resolve acct to an account id once; keep the built-in id if the lookup fails."""
+        with self.lock:
+            if self.lookup_done:
+                return self.account_id
+        response = await self._get(f"{BASE_URL}/accounts/lookup", params={'acct': self.acct})
+        account_id = None
+        if response.status_code == 200:
+            try:
+                account_id = response.json()['id']
+            except (ValueError, KeyError, TypeError):
+                pass
+        with self.lock:
+            self.account_id = account_id or self.account_id
+            self.lookup_done = True
+            if not self.account_id:
+                raise TruthSocialError(f"Could not resolve account id for {self.acct}")
+            return self.account_id
+
+    async def _fetch(self, headers=None):
+        account_id = await self._lookup_account_id()
+        return await self._get(
+            f"{BASE_URL}/accounts/{account_id}/statuses",
+            params={'exclude_replies': 'true', 'limit': 20},
+            headers=headers
+        )
+
+    @staticmethod
+    def _statuses(response):
+        if response.status_code != 200:
+            raise TruthSocialError(f"Statuses request returned HTTP {response.status_code}")
+        try:
+            return response.json()
+        except ValueError as e:
+            # Usually a bot-check HTML page instead of JSON
+            raise TruthSocialError(f"Statuses response is not JSON: {e}") from e
+
+    async def fetch_statuses(self):
+        """GET the timeline unconditionally and return the decoded JSON."""
+        return self._statuses(await self._fetch())
+
+    async def latest_post(self):
+        """Return (post_text, post_time) for the latest original post."""
+        # Snapshot the validators with the result they belong to, so a 304 is
+        # always answered with the result of the response that set them
+        with self.lock:
+            etag, last_modified, cached = self.etag, self.last_modified, self.last_result
+        headers = {}
+        if cached is not None:
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+        response = await self._fetch(headers)
+        if response.status_code == 304:
+            if cached is None:
+                raise TruthSocialError("Got 304 without a previous result")
+            return cached
+        result = parse_statuses(self._statuses(response))
+        if result[0] is None:
+            raise TruthSocialError("No text posts in the statuses timeline")
+        with self.lock:
+            self.etag = response.headers.get('ETag')
+            self.last_modified = response.headers.get('Last-Modified')
+            self.last_result = result
+        return result
+
+
+if __name__ == "__main__":
+    import argparse
+    import asyncio
+    import os
+    import time
+
+    parser = argparse.ArgumentParser(description="Truth Social JSON fetcher and offline fixture harness")
+    parser.add_argument("--record", metavar="DIR", help="Fetch live and save the statuses response to DIR")
+    parser.add_argument("--replay", metavar="FILE", nargs="+", help="Parse saved statuses responses offline")
+    args = parser.parse_args()
+
+    if args.replay:
+        failures = 0
+        for path in args.replay:
+            with open(path, "r", encoding="utf-8") as f:
+                fixture = json.load(f)
+            # A fixture is either a bare statuses list or {"statuses": [...], "expect": {...}}
+            statuses = fixture.get("statuses") if isinstance(fixture, dict) else fixture
+            expect = fixture.get("expect", {}) if isinstance(fixture, dict) else {}
+            text, post_time = parse_statuses(statuses)
+            ok = all([
+                text is not None,
+                "text" not in expect or text == expect["text"],
+                "time" not in expect or post_time == expect["time"],
+            ])
+            failures += not ok
+            print(f"{'ok  ' if ok else 'FAIL'} {path}: {text!r} ({post_time})")
+            if not ok and expect:
+                print(f"     expected: {expect.get('text')!r} ({expect.get('time')})")
+        raise SystemExit(1 if failures else 0)
+
+    from http_client import AsyncHttpPool
+
+    async def fetch_live():
+        http = AsyncHttpPool()
+        client = TruthSocialClient(http)
+        try:
+            started = time.monotonic()
+            statuses = await client.fetch_statuses()
+            print(f"Fetched {len(statuses)} statuses in {time.monotonic() - started:.2f}s")
+            print("Latest: %r (%s)" % await client.latest_post())
+            started = time.monotonic()
+            await client.latest_post()
+            print(f"Conditional re-fetch (ETag {client.etag}) in {time.monotonic() - started:.2f}s")
+            return statuses
+        finally:
+            await http.aclose()
+
+    statuses = asyncio.run(fetch_live())
+    if args.record:
+        os.makedirs(args.record, exist_ok=True)
+        path = os.path.join(args.record, f"truthsocial_statuses_{int(time.time())}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(statuses, f, indent=2)
+        print(f"Saved response to {path}")
@@ -0,0 +1,148 @@
+"""
+Encrypted persistence of the X login session.
+
+Logging in to X takes 20-60 s of page loads and waits, and doing it on every
+!musk gets the account challenged.  After a successful login the cookies and
+localStorage of the browser are saved here, encrypted with Fernet, and
+restored into the next browser before its first page load; the profile page
+request that follows doubles as the validity check, and the full login flow
+only runs when that shows the session has expired.
+
+The key comes from the X_SESSION_KEY environment variable, or from a key
+file created next to the session file on first save (readable only by its
+owner).  Without the optional cryptography package nothing is persisted and
+every browser logs in as before.
+"""
+import json
+import os
+import time
+from urllib.parse import urlsplit
+
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+    CRYPTO_AVAILABLE = True
+except ImportError:
+    CRYPTO_AVAILABLE = False
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SESSION_FILE = os.path.join(SCRIPT_DIR, "x_session.enc")
+DEFAULT_KEY_FILE = os.path.join(SCRIPT_DIR, "x_session.key")
+AUTH_COOKIE = "auth_token"
+X_ORIGIN = "https://x.com"
+X_COOKIE_DOMAINS = ("x.com", "twitter.com")  # And their subdomains, e.g. api.x.com
+
+# Keys Selenium's add_cookie() accepts
+_COOKIE_KEYS = ('name', 'value', 'domain', 'path', 'secure', 'httpOnly', 'expiry', 'sameSite')
+
+
+def _is_x_domain(domain):
+    domain = domain.lstrip('.')
+    return any(domain == name or domain.endswith(f".{name}") for name in X_COOKIE_DOMAINS)
+
+
+def _write_private(path, data):
+    """Write bytes to path atomically with owner-only permissions."""
+    tmp_path = f"{path}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class XSessionStore:
+    """Save and restore an X browser session in an encrypted file."""
+
+    def __init__(self, path=DEFAULT_SESSION_FILE, key_path=DEFAULT_KEY_FILE):
+        self.path = path
+        self.key_path = key_path
+        self.fernet = None
+
+    def _cipher(self, create=False):
+        """Fernet for the configured key, creating a key file if asked; None if unavailable."""
+        if not CRYPTO_AVAILABLE:
+            return None
+        if self.fernet is None:
+            key = os.environ.get("X_SESSION_KEY")
+            if not key and os.path.exists(self.key_path):
+                with open(self.key_path, "rb") as f:
+                    key = f.read().strip()
+            if not key and create:
+                key = Fernet.generate_key()
+                _write_private(self.key_path, key)
+            if not key:
+                return None
+            self.fernet = Fernet(key)
+        return self.fernet
+
+    def save(self, driver):
+        """Store the driver's cookies (and localStorage for the current origin)."""
+        cipher = self._cipher(create=True)
+        if cipher is None:
+            print("[DEBUG] cryptography not installed, X session not saved")
+            return False
+        try:
+            if driver.get_cookie(AUTH_COOKIE) is None:
+                print("[DEBUG] No X login cookie in this browser, session not saved")
+                return False
+            url = urlsplit(driver.current_url)
+            local_storage = driver.execute_script("return Object.assign({}, window.localStorage);") or {}
+            session = {
+                'saved_at': time.time(),
+                'origin': f"{url.scheme}://{url.netloc}",
+                'cookies': driver.get_cookies(),
+                'local_storage': local_storage,
+            }
+            _write_private(self.path, cipher.encrypt(json.dumps(session).encode("utf-8")))
+            print(f"Saved X session ({len(session['cookies'])} cookies)")
+            return True
+        except Exception as e:
+            print(f"Failed to save X session: {e}")
+            return False
+
+    def load(self):
+        """Decrypted session dict, or None if missing, unreadable or already expired."""
+        cipher = self._cipher()
+        if cipher is None or not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, "rb") as f:
+                session = json.loads(cipher.decrypt(f.read()))
+        except (InvalidToken, ValueError, OSError) as e:
+            print(f"Ignoring unreadable X session file: {e}")
+            return None
+        auth = next((c for c in session.get('cookies', []) if c.get('name') == AUTH_COOKIE), None)
+        if auth is None or auth.get('expiry', float('inf')) <= time.time():
+            print("Saved X session has no live auth cookie")
+            return None
+        return session
+
+    def restore(self, driver):
+        """Load the saved session into driver before it visits X. Returns True if restored."""
+        session = self.load()
+        if session is None:
+            return False
+        try:
+            # Cookies can only be set for the domain currently loaded, so one cheap page on x.com
+            # takes them all; twitter.com and api.x.com cookies are rescoped to .x.com
+            driver.get(f"{X_ORIGIN}/robots.txt")
+            cookies = [c for c in session['cookies'] if _is_x_domain(c.get('domain', ''))]
+            # On a name clash the x.com cookie wins over its legacy twitter.com twin
+            cookies.sort(key=lambda c: not c['domain'].endswith('twitter.com'))
+            for cookie in cookies:
+                cookie = {key: cookie[key] for key in _COOKIE_KEYS if key in cookie}
+                cookie['domain'] = '.x.com'
+                try:
+                    driver.add_cookie(cookie)
+                except Exception as e:
+                    print(f"Skipping cookie {cookie.get('name')}: {e}")
+            if session.get('local_storage') and session.get('origin') == X_ORIGIN:
+                driver.execute_script(
+                    "for (const [k, v] of Object.entries(arguments[0])) { window.localStorage.setItem(k, v); }",
+                    session['local_storage']
+                )
+            age_hours = (time.time() - session.get('saved_at', time.time())) / 3600
+            print(f"Restored X session saved {age_hours:.1f}h ago")
+            return True
+        except Exception as e:
+            print(f"Failed to restore X session: {e}")
+            return False